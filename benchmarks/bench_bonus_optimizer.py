@@ -0,0 +1,72 @@
+"""
+Mide el optimizador de combinaciones de bonificaciones con catálogos grandes.
+
+Uso:
+    python -m benchmarks.bench_bonus_optimizer [número de productos]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from mortgage_calculator.bonus_optimizer import BonusCatalog, BonusProduct, optimize_bonuses
+from mortgage_calculator.models import MortgageData
+
+
+def mixed_catalog(n_products: int, rng: np.random.Generator) -> BonusCatalog:
+    """Costes cercanos al ahorro que aporta cada producto, con grupos excluyentes."""
+    bonus = rng.uniform(0.05, 0.30, n_products).round(2)
+    cost = (bonus * 370 * rng.uniform(0.1, 0.6, n_products)).round(1)
+    return BonusCatalog(
+        [
+            BonusProduct(
+                name=f"producto_{i}",
+                bonus=float(bonus[i]),
+                cost_monthly=float(cost[i]),
+                group=f"grupo_{i % 5}" if i < n_products // 3 else None,
+            )
+            for i in range(n_products)
+        ]
+    )
+
+
+def near_tie_catalog(n_products: int, rng: np.random.Generator) -> BonusCatalog:
+    """Mismo coste por punto de bonificación: muchas combinaciones casi empatadas."""
+    bonus = rng.uniform(0.02, 0.10, n_products)
+    return BonusCatalog(
+        [
+            BonusProduct(
+                name=f"producto_{i}", bonus=float(bonus[i]), cost_monthly=float(bonus[i] * 130)
+            )
+            for i in range(n_products)
+        ]
+    )
+
+
+def main():
+    n_products = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    mortgage_data = MortgageData(capital=250_000, interest_rate=3.2, years=30)
+
+    for label, make_catalog in (("mixto", mixed_catalog), ("casi empates", near_tie_catalog)):
+        catalog = make_catalog(n_products, np.random.default_rng(0))
+        for top_k in (1, 10):
+            tracemalloc.start()
+            start = time.perf_counter()
+            combinations = optimize_bonuses(mortgage_data, catalog, top_k=top_k)
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            best = combinations[0]
+            print(
+                f"{label:>12}  productos: {n_products}  top_k: {top_k:>2}  {seconds:7.3f} s  "
+                f"{peak:6.1f} MB  mejor: {len(best.products)} productos, "
+                f"{best.real_savings:,.2f} €"
+            )
+
+    print(f"Combinaciones posibles: {2**n_products:,}")
+
+
+if __name__ == "__main__":
+    main()
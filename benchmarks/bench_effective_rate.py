@@ -0,0 +1,57 @@
+"""
+Compara el rendimiento del cálculo de la TAE escalar y vectorizado.
+
+Uso:
+    python -m benchmarks.bench_effective_rate [número de préstamos]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from mortgage_calculator.annuity import annuity_payment
+from mortgage_calculator.effective_rate import (
+    effective_annual_rate,
+    effective_annual_rate_batch,
+)
+
+
+def main():
+    n_loans = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+
+    capital = rng.uniform(50_000, 600_000, n_loans)
+    n_payments = rng.integers(5, 41, n_loans) * 12
+    payment = annuity_payment(capital, rng.uniform(0.5, 6.0, n_loans), n_payments)
+    monthly_costs = rng.uniform(0, 120, n_loans)
+    annual_fee = rng.choice([0.0, 30.0, 60.0], n_loans)
+
+    start = time.perf_counter()
+    batch = effective_annual_rate_batch(capital, payment, n_payments, monthly_costs, annual_fee)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = [
+        effective_annual_rate(*args)
+        for args in zip(
+            capital.tolist(),
+            payment.tolist(),
+            n_payments.tolist(),
+            monthly_costs.tolist(),
+            annual_fee.tolist(),
+        )
+    ]
+    scalar_seconds = time.perf_counter() - start
+
+    max_difference = float(np.nanmax(np.abs(batch - np.array(scalar))))
+
+    print(f"Préstamos: {n_loans:,}")
+    print(f"Escalar:      {scalar_seconds:8.3f} s  ({n_loans / scalar_seconds:12,.0f} préstamos/s)")
+    print(f"Vectorizado:  {batch_seconds:8.3f} s  ({n_loans / batch_seconds:12,.0f} préstamos/s)")
+    print(f"Aceleración:  {scalar_seconds / batch_seconds:8.1f}x")
+    print(f"Diferencia máxima de TAE: {max_difference:.2e} puntos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Mide el tiempo y el pico de memoria de generar un reporte Excel.
+
+Compara el flujo actual (un único guardado) con el anterior, que guardaba el
+libro, lo recargaba para darle formato, lo guardaba, y lo volvía a recargar
+y guardar para añadir las fórmulas, y con el motor en streaming (write_only).
+
+Uso:
+    python -m benchmarks.bench_excel_report [repeticiones] [años]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from mortgage_calculator.excel_generator import ExcelGenerator, ExcelReportWriter
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.report_model import ReportBuilder
+
+
+def single_pass(generator: ExcelGenerator, path: str):
+    generator.generate_report(path)
+
+
+def write_only(generator: ExcelGenerator, path: str):
+    generator.generate_report(path, backend="write_only")
+
+
+def round_trips(generator: ExcelGenerator, path: str):
+    model = ReportBuilder(generator.data, generator.calculator).build()
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet_name, df in model.sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    excel_writer = ExcelReportWriter()
+    wb = load_workbook(path)
+    excel_writer._apply_formatting(wb, model.sheets)
+    wb.save(path)
+
+    wb = load_workbook(path)
+    excel_writer._add_formulas_to_sheets(wb, model.formulas)
+    wb.save(path)
+
+
+def measure(pipeline, generator: ExcelGenerator, path: str, repetitions: int):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        pipeline(generator, path)
+    seconds = (time.perf_counter() - start) / repetitions
+
+    tracemalloc.start()
+    pipeline(generator, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return seconds, peak / 2**20
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    mortgage_data = MortgageData(
+        capital=250_000,
+        interest_rate=3.2,
+        years=years,
+        payroll_bonus=0.3,
+        life_insurance_bonus=0.25,
+        home_insurance_bonus=0.15,
+        life_insurance_cost_monthly=25,
+        home_insurance_cost_monthly=18,
+    )
+    generator = ExcelGenerator(mortgage_data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "reporte.xlsx")
+        pipelines = (
+            ("Recarga y guarda", round_trips),
+            ("Un solo guardado", single_pass),
+            ("Solo escritura", write_only),
+        )
+        baseline = None
+        for name, pipeline in pipelines:
+            seconds, peak = measure(pipeline, generator, path, repetitions)
+            baseline = baseline or (seconds, peak)
+            print(
+                f"{name:<18} {seconds * 1000:8.1f} ms/reporte  pico {peak:6.1f} MiB  "
+                f"(-{1 - seconds / baseline[0]:.0%} tiempo, -{1 - peak / baseline[1]:.0%} memoria)"
+            )
+
+
+if __name__ == "__main__":
+    main()
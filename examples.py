@@ -3,8 +3,8 @@ Ejemplo de uso avanzado de la calculadora de hipotecas.
 """
 
 from mortgage_calculator.calculator import MortgageCalculator
-from mortgage_calculator.excel_generator import ExcelGenerator
 from mortgage_calculator.models import MortgageData
+from mortgage_calculator.reports import generate_reports
 
 
 def ejemplo_basico():
@@ -113,10 +113,11 @@ def generar_multiples_reportes():
         },
     ]
 
-    for escenario in escenarios:
-        generator = ExcelGenerator(escenario["data"])
-        output = generator.generate_report(f'{escenario["nombre"]}.xlsx')
-        print(f"✓ Generado: {output}")
+    for resultado in generate_reports(escenarios, ".", workers=len(escenarios)):
+        if resultado.ok:
+            print(f"✓ Generado: {resultado.path} ({resultado.seconds:.2f} s)")
+        else:
+            print(f"✗ Error en {resultado.name}: {resultado.error}")
 
     print()
 
@@ -0,0 +1,84 @@
+"""
+Fórmulas cerradas del sistema de amortización francés vectorizadas con NumPy.
+"""
+
+import numpy as np
+
+
+def monthly_rate(annual_rate) -> np.ndarray:
+    """Convierte una tasa anual en porcentaje a tasa mensual decimal."""
+    return np.asarray(annual_rate, dtype=float) / 100 / 12
+
+
+def annuity_payment(capital, annual_rate, n_payments) -> np.ndarray:
+    """
+    Calcula la cuota mensual de uno o varios préstamos.
+
+    Aplica la misma fórmula que MortgageCalculator.calculate_monthly_payment
+    con broadcasting sobre todos los argumentos.
+
+    Args:
+        capital: Capital prestado
+        annual_rate: Tasa de interés anual en porcentaje
+        n_payments: Número de cuotas mensuales
+
+    Returns:
+        Array con la cuota mensual
+    """
+    capital = np.asarray(capital, dtype=float)
+    rate = monthly_rate(annual_rate)
+    n_payments = np.asarray(n_payments, dtype=float)
+
+    growth = np.power(1 + rate, n_payments)
+    # Sin cuotas pendientes (n_payments == 0) el resultado no se usa
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = capital * (rate * growth) / (growth - 1)
+        return np.where(rate == 0, capital / n_payments, payment)
+
+
+def remaining_balance(capital, annual_rate, payment, months) -> np.ndarray:
+    """
+    Calcula el capital pendiente tras un número de cuotas.
+
+    Args:
+        capital: Capital prestado
+        annual_rate: Tasa de interés anual en porcentaje
+        payment: Cuota mensual
+        months: Número de cuotas ya pagadas
+
+    Returns:
+        Array con el capital pendiente (sin truncar en cero)
+    """
+    capital = np.asarray(capital, dtype=float)
+    rate = monthly_rate(annual_rate)
+    payment = np.asarray(payment, dtype=float)
+    months = np.asarray(months, dtype=float)
+
+    growth = np.power(1 + rate, months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = capital * growth - payment * (growth - 1) / rate
+
+    return np.where(rate == 0, capital - payment * months, balance)
+
+
+def payments_to_amortize(balance, annual_rate, payment) -> np.ndarray:
+    """
+    Calcula cuántas cuotas (no necesariamente enteras) amortizan un saldo.
+
+    Args:
+        balance: Capital pendiente
+        annual_rate: Tasa de interés anual en porcentaje
+        payment: Cuota mensual
+
+    Returns:
+        Array con el número de cuotas (inf si la cuota no cubre los intereses)
+    """
+    balance = np.asarray(balance, dtype=float)
+    rate = monthly_rate(annual_rate)
+    payment = np.asarray(payment, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        periods = -np.log1p(-balance * rate / payment) / np.log1p(rate)
+        periods = np.where(balance * rate >= payment, np.inf, periods)
+
+    return np.where(rate == 0, balance / payment, periods)
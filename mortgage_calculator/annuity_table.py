@@ -0,0 +1,242 @@
+"""
+Tabla precalculada de factores de anualidad para tipos y plazos estándar.
+
+El factor de una celda es la cuota mensual por euro de capital, de modo que
+cuota = capital * factor. La tabla se guarda en un archivo binario versionado
+y se carga con np.memmap para no leerla entera al arrancar.
+
+Uso:
+    python -m mortgage_calculator.annuity_table build factores.bin
+    python -m mortgage_calculator.annuity_table report factores.bin
+"""
+
+import argparse
+import math
+import os
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from .annuity import annuity_payment
+
+MAGIC = b"MBAF"
+FORMAT_VERSION = 1
+
+# magic, versión, tipo mínimo (pb), paso (pb), nº de tipos, plazo mínimo, nº de plazos
+HEADER = struct.Struct("<4sH2xIIIII4x")
+
+# Variable de entorno con la ruta de la tabla a cargar al arrancar
+TABLE_PATH_ENV = "MORTGAGE_ANNUITY_TABLE"
+
+# Distancia máxima (en puntos básicos) para considerar que un tipo está en la rejilla
+GRID_TOLERANCE_BP = 1e-7
+
+
+class AnnuityFactorTable:
+    """Factores de anualidad sobre una rejilla de tipos en puntos básicos y plazos en años."""
+
+    def __init__(self, factors: np.ndarray, rate_min_bp: int, rate_step_bp: int, min_years: int):
+        self.factors = factors
+        self.rate_min_bp = rate_min_bp
+        self.rate_step_bp = rate_step_bp
+        self.min_years = min_years
+
+    @classmethod
+    def build(
+        cls,
+        min_rate: float = 0.0,
+        max_rate: float = 15.0,
+        step_bp: int = 1,
+        min_years: int = 5,
+        max_years: int = 40,
+    ) -> "AnnuityFactorTable":
+        """
+        Calcula la tabla completa.
+
+        Args:
+            min_rate: Tipo anual mínimo en porcentaje
+            max_rate: Tipo anual máximo en porcentaje
+            step_bp: Paso entre tipos en puntos básicos
+            min_years: Plazo mínimo en años
+            max_years: Plazo máximo en años
+
+        Returns:
+            AnnuityFactorTable en memoria
+        """
+        rate_min_bp = round(min_rate * 100)
+        n_rates = (round(max_rate * 100) - rate_min_bp) // step_bp + 1
+        rates_bp = rate_min_bp + step_bp * np.arange(n_rates)
+        years = np.arange(min_years, max_years + 1)
+
+        factors = annuity_payment(1.0, rates_bp[:, None] / 100, years[None, :] * 12)
+        return cls(np.ascontiguousarray(factors), rate_min_bp, step_bp, min_years)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "AnnuityFactorTable":
+        """
+        Carga una tabla guardada con save().
+
+        Args:
+            path: Ruta del archivo
+            mmap: Si mapear el archivo en memoria en lugar de leerlo
+
+        Returns:
+            AnnuityFactorTable
+
+        Raises:
+            ValueError: Si el archivo no es una tabla o su versión no es compatible
+        """
+        with open(path, "rb") as handle:
+            header = handle.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} no es una tabla de factores de anualidad")
+
+        magic, version, rate_min_bp, rate_step_bp, n_rates, min_years, n_years = HEADER.unpack(
+            header
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es una tabla de factores de anualidad")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Versión de tabla {version} no soportada (se esperaba {FORMAT_VERSION})"
+            )
+
+        shape = (n_rates, n_years)
+        if mmap:
+            factors = np.memmap(path, dtype="<f8", mode="r", offset=HEADER.size, shape=shape)
+        else:
+            factors = np.fromfile(path, dtype="<f8", offset=HEADER.size).reshape(shape)
+
+        return cls(factors, rate_min_bp, rate_step_bp, min_years)
+
+    def save(self, path: str) -> str:
+        """Guarda la tabla en el formato binario versionado."""
+        n_rates, n_years = self.factors.shape
+        with open(path, "wb") as handle:
+            handle.write(
+                HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    self.rate_min_bp,
+                    self.rate_step_bp,
+                    n_rates,
+                    self.min_years,
+                    n_years,
+                )
+            )
+            handle.write(np.ascontiguousarray(self.factors, dtype="<f8").tobytes())
+
+        return path
+
+    def factor(self, annual_rate: float, years: int) -> Optional[float]:
+        """
+        Busca el factor de anualidad de un tipo y un plazo.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            years: Plazo en años
+
+        Returns:
+            Factor de la rejilla, o None si el tipo o el plazo quedan fuera de ella
+        """
+        rate_bp = annual_rate * 100
+        offset = (rate_bp - self.rate_min_bp) / self.rate_step_bp
+        row = round(offset)
+        column = years - self.min_years
+        n_rates, n_years = self.factors.shape
+
+        if abs(offset - row) * self.rate_step_bp > GRID_TOLERANCE_BP:
+            return None
+        if not (0 <= row < n_rates and 0 <= column < n_years):
+            return None
+
+        return float(self.factors[row, column])
+
+    def accuracy_report(self) -> Dict[str, float]:
+        """
+        Compara cada factor con la fórmula exacta evaluada con math.pow.
+
+        Returns:
+            Diccionario con el número de celdas y los errores máximos absoluto y relativo
+        """
+        n_rates, n_years = self.factors.shape
+        max_abs_error = 0.0
+        max_rel_error = 0.0
+
+        for row in range(n_rates):
+            monthly_rate = (self.rate_min_bp + row * self.rate_step_bp) / 100 / 100 / 12
+            for column in range(n_years):
+                n_payments = (self.min_years + column) * 12
+                if monthly_rate == 0:
+                    exact = 1 / n_payments
+                else:
+                    growth = math.pow(1 + monthly_rate, n_payments)
+                    exact = monthly_rate * growth / (growth - 1)
+
+                error = abs(float(self.factors[row, column]) - exact)
+                max_abs_error = max(max_abs_error, error)
+                max_rel_error = max(max_rel_error, error / exact)
+
+        return {
+            "celdas": n_rates * n_years,
+            "error_absoluto_maximo": max_abs_error,
+            "error_relativo_maximo": max_rel_error,
+        }
+
+
+_default_table: Optional[AnnuityFactorTable] = None
+_default_table_loaded = False
+
+
+def set_default_table(table: Optional[AnnuityFactorTable]):
+    """Instala la tabla que usarán las calculadoras que no indiquen otra."""
+    global _default_table, _default_table_loaded
+    _default_table = table
+    _default_table_loaded = True
+
+
+def get_default_table() -> Optional[AnnuityFactorTable]:
+    """Devuelve la tabla por defecto, mapeando la indicada en MORTGAGE_ANNUITY_TABLE si existe."""
+    global _default_table, _default_table_loaded
+    if not _default_table_loaded:
+        path = os.environ.get(TABLE_PATH_ENV)
+        _default_table = AnnuityFactorTable.load(path) if path else None
+        _default_table_loaded = True
+
+    return _default_table
+
+
+def main(argv=None):
+    """Línea de comandos para construir la tabla y revisar su precisión."""
+    parser = argparse.ArgumentParser(description="Tabla de factores de anualidad")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Construye y guarda la tabla")
+    build_parser.add_argument("path")
+    build_parser.add_argument("--min-rate", type=float, default=0.0)
+    build_parser.add_argument("--max-rate", type=float, default=15.0)
+    build_parser.add_argument("--step-bp", type=int, default=1)
+    build_parser.add_argument("--min-years", type=int, default=5)
+    build_parser.add_argument("--max-years", type=int, default=40)
+
+    report_parser = subparsers.add_parser("report", help="Informe de precisión de una tabla")
+    report_parser.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        table = AnnuityFactorTable.build(
+            args.min_rate, args.max_rate, args.step_bp, args.min_years, args.max_years
+        )
+        table.save(args.path)
+        print(f"✓ Tabla guardada en: {args.path} ({table.factors.size} factores)")
+    else:
+        table = AnnuityFactorTable.load(args.path)
+
+    for name, value in table.accuracy_report().items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
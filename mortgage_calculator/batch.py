@@ -0,0 +1,205 @@
+"""
+Cálculo vectorizado de carteras completas de hipotecas.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .annuity import annuity_payment
+from .effective_rate import effective_annual_rate_batch
+from .models import FrozenMortgageData, MortgageData, MortgageResults
+
+# Registro binario de FrozenMortgageData.STRUCT ("<2di9d") como dtype de NumPy
+RECORD_DTYPE = np.dtype(
+    [(name, "<i4" if name == "years" else "<f8") for name in FrozenMortgageData.__match_args__]
+)
+
+
+@dataclass
+class MortgageBatchResults:
+    """Resultados de un lote de hipotecas, un array por campo de MortgageResults."""
+
+    monthly_payment_without_bonus: np.ndarray
+    total_interest_without_bonus: np.ndarray
+    total_paid_without_bonus: np.ndarray
+
+    monthly_payment_with_bonus: np.ndarray
+    total_interest_with_bonus: np.ndarray
+    total_paid_with_bonus: np.ndarray
+
+    total_bonus_costs: np.ndarray
+
+    real_savings: np.ndarray
+    savings_percentage: np.ndarray
+    is_worth_it: np.ndarray
+    effective_rate_without_bonus: np.ndarray
+    effective_rate_with_bonus: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.real_savings)
+
+    def row(self, index: int) -> MortgageResults:
+        """Devuelve los resultados de una hipoteca del lote como MortgageResults."""
+        values = {f.name: getattr(self, f.name)[index].item() for f in fields(self)}
+        return MortgageResults(**values)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convierte los resultados en un DataFrame con una fila por hipoteca."""
+        return pd.DataFrame({f.name: getattr(self, f.name) for f in fields(self)})
+
+
+class MortgageBatch:
+    """Calculadora de hipotecas que opera sobre columnas de datos."""
+
+    FIELDS = tuple(f.name for f in fields(MortgageData))
+
+    def __init__(
+        self,
+        capital,
+        interest_rate,
+        years,
+        payroll_bonus=0.0,
+        life_insurance_bonus=0.0,
+        home_insurance_bonus=0.0,
+        card_bonus=0.0,
+        other_bonus=0.0,
+        life_insurance_cost_monthly=0.0,
+        home_insurance_cost_monthly=0.0,
+        card_annual_fee=0.0,
+        other_costs_monthly=0.0,
+    ):
+        columns = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(capital, dtype=float)),
+            np.atleast_1d(np.asarray(interest_rate, dtype=float)),
+            np.atleast_1d(np.asarray(years, dtype=np.int64)),
+            np.atleast_1d(np.asarray(payroll_bonus, dtype=float)),
+            np.atleast_1d(np.asarray(life_insurance_bonus, dtype=float)),
+            np.atleast_1d(np.asarray(home_insurance_bonus, dtype=float)),
+            np.atleast_1d(np.asarray(card_bonus, dtype=float)),
+            np.atleast_1d(np.asarray(other_bonus, dtype=float)),
+            np.atleast_1d(np.asarray(life_insurance_cost_monthly, dtype=float)),
+            np.atleast_1d(np.asarray(home_insurance_cost_monthly, dtype=float)),
+            np.atleast_1d(np.asarray(card_annual_fee, dtype=float)),
+            np.atleast_1d(np.asarray(other_costs_monthly, dtype=float)),
+        )
+        if columns[0].ndim != 1:
+            raise ValueError("MortgageBatch solo admite columnas unidimensionales")
+
+        for name, column in zip(self.FIELDS, columns):
+            setattr(self, name, column)
+
+    @classmethod
+    def from_mortgage_data(cls, items: Iterable[MortgageData]) -> "MortgageBatch":
+        """Construye un lote a partir de instancias de MortgageData."""
+        items = list(items)
+        return cls(**{name: [getattr(item, name) for item in items] for name in cls.FIELDS})
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> "MortgageBatch":
+        """Construye un lote a partir de FrozenMortgageData.pack_many, sin crear objetos."""
+        records = np.frombuffer(buffer, dtype=RECORD_DTYPE)
+        return cls(**{name: records[name] for name in cls.FIELDS})
+
+    def __len__(self) -> int:
+        return len(self.capital)
+
+    def calculate_monthly_payment(self, annual_rate) -> np.ndarray:
+        """
+        Calcula la cuota mensual de cada hipoteca del lote.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje (escalar o array)
+
+        Returns:
+            Array con la cuota mensual
+        """
+        return annuity_payment(self.capital, annual_rate, self.years * 12)
+
+    def calculate_total_bonus(self) -> np.ndarray:
+        """Calcula la bonificación total acumulada de cada hipoteca."""
+        return (
+            self.payroll_bonus
+            + self.life_insurance_bonus
+            + self.home_insurance_bonus
+            + self.card_bonus
+            + self.other_bonus
+        )
+
+    def calculate_total_bonus_costs(self) -> np.ndarray:
+        """Calcula el coste total de las bonificaciones de cada hipoteca."""
+        months = self.years * 12
+        monthly_costs = (
+            self.life_insurance_cost_monthly
+            + self.home_insurance_cost_monthly
+            + self.other_costs_monthly
+        )
+
+        return (monthly_costs * months) + (self.card_annual_fee * self.years)
+
+    def calculate(self, effective_rates: bool = True) -> MortgageBatchResults:
+        """
+        Realiza todos los cálculos del lote en una única pasada vectorizada.
+
+        Args:
+            effective_rates: Si calcular las TAE (la parte más costosa); si es
+                False se devuelven como NaN
+
+        Returns:
+            MortgageBatchResults con un valor por hipoteca
+        """
+        n_payments = self.years * 12
+
+        # Cálculos sin bonificaciones
+        monthly_without = self.calculate_monthly_payment(self.interest_rate)
+        total_interest_without = monthly_without * n_payments - self.capital
+        total_paid_without = self.capital + total_interest_without
+
+        # Cálculos con bonificaciones
+        rate_with_bonus = np.maximum(0, self.interest_rate - self.calculate_total_bonus())
+        monthly_with = self.calculate_monthly_payment(rate_with_bonus)
+        total_interest_with = monthly_with * n_payments - self.capital
+        total_paid_with = self.capital + total_interest_with
+
+        # Costes de bonificaciones
+        total_bonus_costs = self.calculate_total_bonus_costs()
+
+        # Análisis
+        nominal_savings = total_paid_without - total_paid_with
+        real_savings = nominal_savings - total_bonus_costs
+        savings_percentage = (real_savings / total_paid_without) * 100
+        is_worth_it = real_savings > 0
+
+        # Tasas efectivas (TAE, considerando costes)
+        if effective_rates:
+            effective_rate_without = effective_annual_rate_batch(
+                self.capital, monthly_without, n_payments
+            )
+            effective_rate_with = effective_annual_rate_batch(
+                self.capital,
+                monthly_with,
+                n_payments,
+                self.life_insurance_cost_monthly
+                + self.home_insurance_cost_monthly
+                + self.other_costs_monthly,
+                self.card_annual_fee,
+            )
+        else:
+            effective_rate_without = effective_rate_with = np.full(len(self), np.nan)
+
+        return MortgageBatchResults(
+            monthly_payment_without_bonus=monthly_without,
+            total_interest_without_bonus=total_interest_without,
+            total_paid_without_bonus=total_paid_without,
+            monthly_payment_with_bonus=monthly_with,
+            total_interest_with_bonus=total_interest_with,
+            total_paid_with_bonus=total_paid_with,
+            total_bonus_costs=total_bonus_costs,
+            real_savings=real_savings,
+            savings_percentage=savings_percentage,
+            is_worth_it=is_worth_it,
+            effective_rate_without_bonus=effective_rate_without,
+            effective_rate_with_bonus=effective_rate_with,
+        )
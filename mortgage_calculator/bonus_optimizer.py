@@ -0,0 +1,411 @@
+"""
+Búsqueda de las mejores combinaciones de productos bonificados.
+
+El ahorro en intereses f(B) de una bonificación total B es cóncavo en B (los
+intereses totales son convexos en el tipo). Eso da cotas del ahorro real de
+cualquier ampliación de una combinación (ver _upper_bounds) que permiten podar
+la búsqueda: el árbol de inclusión/exclusión se recorre en profundidad, por
+bloques de nodos evaluados a la vez en NumPy, y se descartan los nodos cuya
+cota no supera al k-ésimo mejor. La memoria queda acotada por el tamaño de
+bloque y el número de productos.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .annuity import annuity_payment
+from .models import MortgageData
+
+# Número máximo de productos (cada combinación es una máscara de bits en un int64)
+MAX_PRODUCTS = 62
+
+# Nodos que se evalúan a la vez en la búsqueda (acota la memoria)
+CHUNK_SIZE = 4096
+
+# Iteraciones de la bisección que busca el máximo de cada tramo de la cota
+BISECTION_STEPS = 60
+
+
+@dataclass(frozen=True)
+class BonusProduct:
+    """Producto bancario que bonifica el tipo de interés."""
+
+    name: str
+    bonus: float  # Bonificación sobre el tipo (%)
+    cost_monthly: float = 0.0  # Coste mensual (€)
+    cost_annual: float = 0.0  # Coste anual (€)
+    group: Optional[str] = None  # Productos del mismo grupo son mutuamente excluyentes
+    excludes: Tuple[str, ...] = ()  # Productos incompatibles (p. ej. los incluidos en un pack)
+    requires: Tuple[str, ...] = ()  # Productos que hay que contratar también
+
+
+@dataclass(frozen=True)
+class BonusCombination:
+    """Combinación de productos y su resultado."""
+
+    products: Tuple[str, ...]
+    total_bonus: float  # Bonificación total (%)
+    interest_savings: float  # Ahorro en intereses (€)
+    total_cost: float  # Coste de los productos durante el préstamo (€)
+
+    @property
+    def real_savings(self) -> float:
+        """Ahorro en intereses menos el coste de los productos."""
+        return self.interest_savings - self.total_cost
+
+
+class BonusCatalog:
+    """
+    Catálogo de productos bonificados con sus incompatibilidades y requisitos.
+
+    Los productos se ordenan de forma que cada uno aparezca después de los
+    que requiere; cada combinación se representa como una máscara de bits
+    sobre ese orden.
+    """
+
+    def __init__(self, products: Sequence[BonusProduct]):
+        names = [product.name for product in products]
+        if len(set(names)) != len(names):
+            raise ValueError("Los nombres de los productos deben ser únicos")
+        if len(products) > MAX_PRODUCTS:
+            raise ValueError(f"Como máximo {MAX_PRODUCTS} productos")
+        for product in products:
+            unknown = set(product.excludes + product.requires) - set(names)
+            if unknown:
+                raise ValueError(f"{product.name} hace referencia a {', '.join(sorted(unknown))}")
+
+        self.products = self._requirements_first(products)
+        self._positions = {name: position for position, name in enumerate(names)}
+        index = {product.name: i for i, product in enumerate(self.products)}
+
+        self.conflicts = np.zeros(len(self.products), dtype=np.int64)
+        self.requirements = np.zeros(len(self.products), dtype=np.int64)
+        for i, product in enumerate(self.products):
+            for j, other in enumerate(self.products):
+                same_group = product.group is not None and product.group == other.group
+                if i != j and (
+                    same_group or other.name in product.excludes or product.name in other.excludes
+                ):
+                    self.conflicts[i] |= 1 << j
+            for name in product.requires:
+                self.requirements[i] |= 1 << index[name]
+
+    @staticmethod
+    def _requirements_first(products: Sequence[BonusProduct]) -> List[BonusProduct]:
+        """Ordena los productos (mayor bonificación primero) respetando los requisitos."""
+        pending = sorted(products, key=lambda product: -product.bonus)
+        ordered: List[BonusProduct] = []
+        placed = set()
+        while pending:
+            ready = [product for product in pending if set(product.requires) <= placed]
+            if not ready:
+                raise ValueError("Los requisitos entre productos forman un ciclo")
+            ordered.append(ready[0])
+            placed.add(ready[0].name)
+            pending.remove(ready[0])
+
+        return ordered
+
+    @classmethod
+    def from_dict(cls, bonuses: Dict[str, Dict[str, object]]) -> "BonusCatalog":
+        """
+        Crea el catálogo a partir de un diccionario nombre -> características.
+
+        Formato: {"nomina": {"bonus": 0.30, "cost_monthly": 0.0, "group": None,
+        "excludes": [...], "requires": [...], "cost_annual": 0.0}}
+        """
+        return cls(
+            [
+                BonusProduct(
+                    name=name,
+                    bonus=float(spec["bonus"]),
+                    cost_monthly=float(spec.get("cost_monthly", 0.0)),
+                    cost_annual=float(spec.get("cost_annual", 0.0)),
+                    group=spec.get("group"),
+                    excludes=tuple(spec.get("excludes", ())),
+                    requires=tuple(spec.get("requires", ())),
+                )
+                for name, spec in bonuses.items()
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def names(self, mask: int) -> Tuple[str, ...]:
+        """Nombres de los productos de una máscara, en el orden en que se definieron."""
+        names = [product.name for i, product in enumerate(self.products) if mask >> i & 1]
+        return tuple(sorted(names, key=self._positions.__getitem__))
+
+
+def _interest_savings(mortgage_data: MortgageData, total_bonus: np.ndarray) -> np.ndarray:
+    """Ahorro en intereses f(B) para cada bonificación total B."""
+    n_payments = mortgage_data.years * 12
+    # Redondeo para que una bonificación igual al tipo dé exactamente tipo cero
+    rate_with_bonus = np.maximum(0.0, np.round(mortgage_data.interest_rate - total_bonus, 10))
+    payment_without = annuity_payment(
+        mortgage_data.capital, mortgage_data.interest_rate, n_payments
+    )
+    payment_with = annuity_payment(mortgage_data.capital, rate_with_bonus, n_payments)
+
+    return (payment_without - payment_with) * n_payments
+
+
+def _search_order(catalog: BonusCatalog, priority: np.ndarray) -> List[int]:
+    """Orden de búsqueda: mayor prioridad primero, cada producto después de los que requiere."""
+    index = {product.name: i for i, product in enumerate(catalog.products)}
+    pending = sorted(range(len(catalog)), key=lambda i: -priority[i])
+    ordered: List[int] = []
+    placed = set()
+    while pending:
+        # El catálogo ya está ordenado por requisitos: siempre hay alguno listo
+        ready = next(
+            i
+            for i in pending
+            if all(index[name] in placed for name in catalog.products[i].requires)
+        )
+        ordered.append(ready)
+        placed.add(ready)
+        pending.remove(ready)
+
+    return ordered
+
+
+def _remap(masks: np.ndarray, order: Sequence[int]) -> np.ndarray:
+    """Pasa máscaras de bits sobre el catálogo a máscaras sobre el orden de búsqueda."""
+    remapped = np.zeros_like(masks)
+    for position, i in enumerate(order):
+        remapped |= ((masks >> i) & 1) << position
+    return remapped
+
+
+def _savings_slope(mortgage_data: MortgageData, total_bonus: np.ndarray) -> np.ndarray:
+    """Derivada f'(B) del ahorro en intereses (€ por punto de bonificación)."""
+    n_payments = mortgage_data.years * 12
+    annual_rate = mortgage_data.interest_rate - total_bonus
+    rate = np.maximum(0.0, annual_rate) / 100 / 12
+    growth = np.power(1 + rate, n_payments)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derivative = (growth * (growth - 1) - rate * n_payments * growth / (1 + rate)) / np.square(
+            growth - 1
+        )
+    # Límite con tipo cero: (n + 1) / (2n) por unidad de capital
+    derivative = np.where(rate < 1e-9, (n_payments + 1) / (2 * n_payments), derivative)
+    slope = mortgage_data.capital * derivative / 1200 * n_payments
+
+    # Con la bonificación por encima del tipo, el ahorro ya no crece
+    return np.where(annual_rate > 0, slope, 0.0)
+
+
+def _best_total_bonus(mortgage_data: MortgageData, ratio: np.ndarray) -> np.ndarray:
+    """
+    Bonificación total B que maximiza f(B) - ratio * B para cada ratio.
+
+    Como f es cóncava, es donde f'(B) = ratio; se busca por bisección entre 0
+    y el tipo (con ratio 0 no hay máximo finito: se devuelve infinito).
+    """
+    low = np.zeros(len(ratio))
+    high = np.full(len(ratio), float(mortgage_data.interest_rate))
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        rising = _savings_slope(mortgage_data, middle) > ratio
+        low = np.where(rising, middle, low)
+        high = np.where(rising, high, middle)
+
+    best = (low + high) / 2
+    best = np.where(_savings_slope(mortgage_data, np.zeros(1)) <= ratio, 0.0, best)
+    return np.where(ratio > 0, best, np.inf)
+
+
+def _upper_bounds(
+    mortgage_data: MortgageData,
+    masks: np.ndarray,
+    totals: np.ndarray,
+    costs: np.ndarray,
+    bonus: np.ndarray,
+    cost: np.ndarray,
+    conflicts: np.ndarray,
+) -> np.ndarray:
+    """
+    Cota superior del ahorro real de cualquier ampliación de cada nodo.
+
+    Se toma la menor de dos cotas válidas:
+
+    - Fraccionaria: ningún conjunto de productos compatibles que sume una
+      bonificación x cuesta menos que g(x), el coste de llenar x con los
+      productos más baratos por punto de bonificación (admitiendo fracciones).
+      En cada tramo de g, f(B + x) - g(x) es cóncava y su máximo está donde
+      f' iguala el coste por punto del tramo (o en un extremo). Se evalúa ahí
+      y se suma la tangente hasta el extremo más lejano, que la mantiene como
+      cota aunque el punto no sea exacto. Es la que poda con productos de
+      coste parecido por punto de bonificación.
+    - Por productos: la suma de lo que añadiría cada producto por separado
+      (f es cóncava). Poda los nodos cerca del óptimo, donde cualquier
+      producto entero ya se pasa.
+
+    Args:
+        mortgage_data: Datos de la hipoteca
+        masks, totals, costs: Productos, bonificación y coste de cada nodo
+        bonus, cost, conflicts: Bonificación, coste e incompatibilidades de
+            los productos pendientes de decidir
+
+    Returns:
+        Cota de cada nodo
+    """
+    # Productos por coste por punto de bonificación, del más barato al más caro
+    ratio = np.divide(cost, bonus, out=np.full(len(bonus), np.inf), where=bonus > 0)
+    order = np.argsort(ratio, kind="stable")
+    ratio = ratio[order]
+    compatible = (masks[:, None] & conflicts[order]) == 0
+    fill_bonus = np.where(compatible, bonus[order], 0.0)
+    fill_cost = np.where(compatible, cost[order], 0.0)
+
+    zeros = np.zeros((len(masks), 1))
+    reached = totals[:, None] + np.hstack([zeros, np.cumsum(fill_bonus, axis=1)])
+    filled = np.hstack([zeros, np.cumsum(fill_cost, axis=1)])
+    savings = _interest_savings(mortgage_data, reached)
+    ends = savings - filled
+
+    # Máximo dentro de cada tramo (sin productos pendientes no hay tramos)
+    fractional = ends.max(axis=1)
+    if len(bonus):
+        start, end = reached[:, :-1], reached[:, 1:]
+        point = np.clip(_best_total_bonus(mortgage_data, ratio), start, end)
+        # Los productos sin bonificación no forman tramo
+        step = np.where(end > start, ratio, 0.0)
+        value = _interest_savings(mortgage_data, point) - filled[:, :-1] - step * (point - start)
+        slope = _savings_slope(mortgage_data, point) - step
+        within = value + np.maximum(slope, 0.0) * (end - point)
+        within -= np.minimum(slope, 0.0) * (point - start)
+        fractional = np.maximum(fractional, within.max(axis=1))
+
+    # Cota por productos enteros: la suma de lo que añade cada uno por separado
+    gains = _interest_savings(mortgage_data, totals[:, None] + fill_bonus) - savings[:, :1]
+    standalone = savings[:, 0] + np.maximum(gains - fill_cost, 0.0).sum(axis=1)
+
+    return np.minimum(fractional, standalone) - costs
+
+
+def optimize_bonuses(
+    mortgage_data: MortgageData,
+    catalog: BonusCatalog,
+    top_k: int = 5,
+    tolerance: float = 0.01,
+) -> List[BonusCombination]:
+    """
+    Busca las combinaciones de productos con mayor ahorro real.
+
+    Se usan el capital, el tipo y el plazo de mortgage_data; sus campos de
+    bonificaciones y costes se ignoran (los define el catálogo).
+
+    Args:
+        mortgage_data: Datos de la hipoteca
+        catalog: Productos disponibles
+        top_k: Número de combinaciones a devolver
+        tolerance: Margen (€) con el que se poda: se descartan los nodos que no
+            mejorarían al k-ésimo mejor en más de este importe. Con catálogos de
+            combinaciones casi empatadas evita explorarlas todas; el resultado
+            puede diferir del exacto en menos de este importe (0 para el exacto)
+
+    Returns:
+        Hasta top_k combinaciones no vacías y válidas, de mayor a menor ahorro real
+    """
+    if top_k <= 0:
+        raise ValueError("top_k debe ser positivo")
+    if not len(catalog):
+        return []
+
+    years = mortgage_data.years
+    catalog_bonus = np.array([product.bonus for product in catalog.products])
+    catalog_cost = np.array(
+        [
+            product.cost_monthly * 12 * years + product.cost_annual * years
+            for product in catalog.products
+        ]
+    )
+
+    # Se decide primero lo que más bonifica: las combinaciones que se acercan
+    # al óptimo aparecen pronto y suben el umbral de poda
+    order = _search_order(catalog, catalog_bonus)
+    bonus, cost = catalog_bonus[order], catalog_cost[order]
+    conflicts = _remap(catalog.conflicts[order], order)
+    requirements = _remap(catalog.requirements[order], order)
+
+    best = {
+        "masks": np.zeros(0, dtype=np.int64),
+        "totals": np.zeros(0),
+        "costs": np.zeros(0),
+        "values": np.zeros(0),
+    }
+
+    # Pila de bloques de nodos con los productos 0..j-1 ya decididos. Se
+    # recorre en profundidad, así que guarda como mucho dos bloques por nivel
+    zero = np.zeros(1)
+    stack = [(0, np.zeros(1, dtype=np.int64), zero, zero, np.full(1, np.inf))]
+    while stack:
+        j, masks, totals, costs, bounds = stack.pop()
+        threshold = best["values"].min() if len(best["values"]) == top_k else -np.inf
+        alive = bounds > threshold + tolerance
+        masks, totals, costs = masks[alive], totals[alive], costs[alive]
+        if not masks.size:
+            continue
+
+        bit = np.int64(1) << j
+        can_add = ((masks & conflicts[j]) == 0) & ((masks & requirements[j]) == requirements[j])
+
+        # Cada combinación nueva aparece una sola vez: al añadir su último producto
+        new_masks = masks[can_add] | bit
+        new_totals = totals[can_add] + bonus[j]
+        new_costs = costs[can_add] + cost[j]
+        new_values = _interest_savings(mortgage_data, new_totals) - new_costs
+
+        candidates = {
+            "masks": new_masks,
+            "totals": new_totals,
+            "costs": new_costs,
+            "values": new_values,
+        }
+        best = {key: np.concatenate([best[key], candidates[key]]) for key in best}
+        if len(best["values"]) > top_k:
+            keep = np.argpartition(-best["values"], top_k - 1)[:top_k]
+            best = {key: values[keep] for key, values in best.items()}
+
+        if j + 1 == len(catalog):
+            continue
+
+        masks = np.concatenate([new_masks, masks])
+        totals = np.concatenate([new_totals, totals])
+        costs = np.concatenate([new_costs, costs])
+        bounds = _upper_bounds(
+            mortgage_data,
+            masks,
+            totals,
+            costs,
+            bonus[j + 1 :],
+            cost[j + 1 :],
+            conflicts[j + 1 :],
+        )
+
+        # Los bloques con mejor cota se apilan los últimos para explorarlos antes
+        ranked = np.argsort(-bounds, kind="stable")
+        for start in range(0, len(ranked), CHUNK_SIZE)[::-1]:
+            chunk = ranked[start : start + CHUNK_SIZE]
+            stack.append((j + 1, masks[chunk], totals[chunk], costs[chunk], bounds[chunk]))
+
+    values_order = np.argsort(-best["values"], kind="stable")
+    return [
+        BonusCombination(
+            products=catalog.names(_catalog_mask(int(best["masks"][i]), order)),
+            total_bonus=float(best["totals"][i]),
+            interest_savings=float(best["values"][i] + best["costs"][i]),
+            total_cost=float(best["costs"][i]),
+        )
+        for i in values_order
+    ]
+
+
+def _catalog_mask(mask: int, order: Sequence[int]) -> int:
+    """Pasa una máscara sobre el orden de búsqueda a una máscara sobre el catálogo."""
+    return sum(1 << i for position, i in enumerate(order) if mask >> position & 1)
@@ -0,0 +1,176 @@
+"""
+Coste máximo asumible de las bonificaciones (punto de equilibrio).
+
+Con costes mensuales constantes el ahorro real es lineal en el coste, así que
+el punto de equilibrio es directamente el ahorro dividido entre el número de
+cuotas. Para costes que varían en el tiempo se busca por bisección el importe
+inicial que anula el ahorro.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from .batch import MortgageBatch
+from .calculator import MortgageCalculator
+from .cost_schedules import CostProfile
+from .models import MortgageData
+
+# Precisión (€) de la búsqueda por bisección
+AMOUNT_TOLERANCE = 1e-6
+MAX_ITERATIONS = 200
+
+
+@dataclass
+class BreakEven:
+    """Coste adicional con el que el ahorro real de las bonificaciones es cero."""
+
+    monthly_cost: float  # Coste mensual de equilibrio (€)
+    annual_cost: float  # Coste anual de equilibrio (€)
+    total_cost: float  # Coste total durante el préstamo (€)
+
+    @property
+    def max_monthly_cost(self) -> float:
+        """Mayor coste mensual, en céntimos enteros, con el que aún hay ahorro (mínimo 0)."""
+        return _floor_cents(self.monthly_cost)
+
+
+def _floor_cents(value):
+    """Mayor importe en céntimos estrictamente menor que value, sin bajar de cero."""
+    cents = (np.ceil(np.asarray(value) * 100 - 1e-6) - 1) / 100
+    cents = np.maximum(cents, 0.0)
+    return float(cents) if np.ndim(cents) == 0 else cents
+
+
+def _break_even(real_savings, n_payments) -> BreakEven:
+    monthly_cost = real_savings / n_payments
+    return BreakEven(
+        monthly_cost=monthly_cost,
+        annual_cost=monthly_cost * 12,
+        total_cost=real_savings,
+    )
+
+
+def break_even_cost(mortgage_data: MortgageData) -> BreakEven:
+    """
+    Calcula el coste mensual adicional que anula el ahorro real.
+
+    Los costes ya presentes en mortgage_data se mantienen; el resultado es lo
+    que se puede añadir encima (negativo si ya no compensa).
+
+    Args:
+        mortgage_data: Datos de la hipoteca
+
+    Returns:
+        BreakEven exacto
+    """
+    batch = MortgageBatch.from_mortgage_data([mortgage_data])
+    real_savings = float(batch.calculate(effective_rates=False).real_savings[0])
+    return _break_even(real_savings, mortgage_data.years * 12)
+
+
+def break_even_batch(batch: MortgageBatch) -> BreakEven:
+    """
+    Versión vectorizada de break_even_cost para un lote de hipotecas.
+
+    Args:
+        batch: Lote de hipotecas
+
+    Returns:
+        BreakEven con un array por campo
+    """
+    real_savings = batch.calculate(effective_rates=False).real_savings
+    return _break_even(real_savings, batch.years * 12)
+
+
+def bonus_break_evens(
+    mortgage_data: MortgageData, bonuses: Optional[Sequence[str]] = None
+) -> Dict[str, BreakEven]:
+    """
+    Calcula el coste máximo de cada bonificación por separado.
+
+    Cada bonificación se evalúa sola, sin el resto ni costes, como en el
+    análisis de seguros del informe Excel. Todas se calculan en un único lote.
+
+    Args:
+        mortgage_data: Datos de la hipoteca
+        bonuses: Campos de bonificación a evaluar (por defecto los que no son cero)
+
+    Returns:
+        Diccionario campo -> BreakEven
+    """
+    if bonuses is None:
+        bonuses = [name for name in MortgageCalculator.BONUS_FIELDS if getattr(mortgage_data, name)]
+    if not bonuses:
+        return {}
+
+    columns = {name: np.zeros(len(bonuses)) for name in MortgageCalculator.BONUS_FIELDS}
+    for row, name in enumerate(bonuses):
+        columns[name][row] = getattr(mortgage_data, name)
+
+    batch = MortgageBatch(
+        mortgage_data.capital, mortgage_data.interest_rate, mortgage_data.years, **columns
+    )
+    results = break_even_batch(batch)
+
+    return {
+        name: BreakEven(
+            monthly_cost=float(results.monthly_cost[row]),
+            annual_cost=float(results.annual_cost[row]),
+            total_cost=float(results.total_cost[row]),
+        )
+        for row, name in enumerate(bonuses)
+    }
+
+
+def break_even_profile_amount(
+    mortgage_data: MortgageData,
+    profile_for: Callable[[float], CostProfile],
+    tolerance: float = AMOUNT_TOLERANCE,
+) -> float:
+    """
+    Busca por bisección el importe inicial de unos costes variables que anula el ahorro.
+
+    Args:
+        mortgage_data: Datos de la hipoteca (los costes sin calendario se mantienen)
+        profile_for: Construye el CostProfile para un importe inicial, p. ej.
+            lambda amount: CostProfile(life_insurance=EscalatingCost(amount, 3.0))
+        tolerance: Precisión del importe (€)
+
+    Returns:
+        Importe inicial de equilibrio (0 si no compensa ni sin coste)
+    """
+    calculator = MortgageCalculator(mortgage_data)
+    rate_with_bonus = max(0, mortgage_data.interest_rate - calculator.calculate_total_bonus())
+    nominal_savings = calculator.calculate_total_interest(
+        mortgage_data.interest_rate
+    ) - calculator.calculate_total_interest(rate_with_bonus)
+
+    def real_savings(amount: float) -> float:
+        calculator.cost_profile = profile_for(amount)
+        return nominal_savings - calculator.calculate_total_bonus_costs()
+
+    if real_savings(0.0) <= 0:
+        return 0.0
+
+    # Primera estimación: la de costes constantes; se duplica hasta encerrar la raíz
+    low = 0.0
+    high = max(real_savings(0.0) / (mortgage_data.years * 12), tolerance)
+    for _ in range(MAX_ITERATIONS):
+        if real_savings(high) <= 0:
+            break
+        low, high = high, high * 2
+    else:
+        raise ValueError("Los costes no crecen con el importe: no hay punto de equilibrio")
+
+    for _ in range(MAX_ITERATIONS):
+        if high - low < tolerance:
+            break
+        middle = (low + high) / 2
+        if real_savings(middle) > 0:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
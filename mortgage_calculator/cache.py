@@ -0,0 +1,125 @@
+"""
+Caché LRU acotada para cuotas y tablas de amortización.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Tuple
+
+# Decimales con los que se normaliza la tasa para formar la clave
+RATE_DECIMALS = 10
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Contadores de uso de una caché."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporción de consultas resueltas desde la caché."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """Caché con expulsión del elemento menos usado, segura entre hilos."""
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 0:
+            raise ValueError("El tamaño máximo de la caché no puede ser negativo")
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def maxsize(self) -> int:
+        """Número máximo de entradas."""
+        return self._maxsize
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor asociado a la clave, calculándolo si no está en caché.
+
+        Args:
+            key: Clave normalizada
+            compute: Función sin argumentos que produce el valor
+
+        Returns:
+            Valor cacheado o recién calculado
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+
+        # El cálculo se hace fuera del bloqueo para no serializar a otros hilos
+        value = compute()
+
+        with self._lock:
+            if self._maxsize:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._evict()
+
+        return value
+
+    def resize(self, maxsize: int):
+        """Cambia el tamaño máximo, expulsando entradas si es necesario."""
+        if maxsize < 0:
+            raise ValueError("El tamaño máximo de la caché no puede ser negativo")
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Devuelve una instantánea de los contadores."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self._maxsize,
+            )
+
+    def _evict(self):
+        """Expulsa las entradas más antiguas hasta respetar el tamaño máximo."""
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+def loan_key(kind: str, capital: float, annual_rate: float, n_payments: int) -> Tuple:
+    """Normaliza los parámetros de un préstamo para usarlos como clave de caché."""
+    return (kind, float(capital), round(float(annual_rate), RATE_DECIMALS), int(n_payments))
+
+
+# Caché compartida por defecto por todas las calculadoras
+DEFAULT_CACHE = LRUCache()
@@ -3,16 +3,108 @@ Módulo de cálculo de hipotecas y bonificaciones.
 """
 
 import math
-from typing import List, Tuple
+from dataclasses import fields
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-from .models import MortgageData, MortgageResults
+import numpy as np
+
+from . import annuity
+from .annuity_table import AnnuityFactorTable, get_default_table
+from .cache import DEFAULT_CACHE, LRUCache, loan_key
+from .cost_schedules import CostProfile
+from .effective_rate import effective_annual_rate, effective_annual_rate_flows
+from .models import (
+    MortgageData,
+    MortgageResults,
+    PrepaymentEvent,
+    PrepaymentGrid,
+    PrepaymentResults,
+)
+from .schedule import AmortizationSchedule
+
+# Diferencia relativa al capital admitida entre los totales analíticos y los iterativos
+CLOSED_FORM_TOLERANCE = 1e-9
+
+# Margen al redondear hacia arriba el número de cuotas tras reducir plazo
+PERIODS_TOLERANCE = 1e-9
 
 
 class MortgageCalculator:
     """Calculadora de hipotecas con análisis de bonificaciones."""
 
-    def __init__(self, mortgage_data: MortgageData):
+    BONUS_FIELDS = (
+        "payroll_bonus",
+        "life_insurance_bonus",
+        "home_insurance_bonus",
+        "card_bonus",
+        "other_bonus",
+    )
+    COST_FIELDS = (
+        "life_insurance_cost_monthly",
+        "home_insurance_cost_monthly",
+        "card_annual_fee",
+        "other_costs_monthly",
+    )
+
+    # Campos de MortgageData que lee directamente cada etapa de calculate()
+    STAGE_FIELDS: Dict[str, Tuple[str, ...]] = {
+        "bonus": ("interest_rate",) + BONUS_FIELDS,
+        "without_bonus": ("capital", "interest_rate", "years"),
+        "with_bonus": ("capital", "years"),
+        "costs": ("capital", "years") + COST_FIELDS,
+        "savings": (),
+        "effective_rate_without_bonus": ("capital", "interest_rate", "years"),
+        "effective_rate_with_bonus": ("capital", "years") + COST_FIELDS,
+    }
+
+    # Atributos de la calculadora que lee cada etapa (se comparan por identidad:
+    # hay que asignar un objeto nuevo, no modificar el existente)
+    STAGE_SETTINGS: Dict[str, Tuple[str, ...]] = {
+        "without_bonus": ("annuity_table",),
+        "with_bonus": ("annuity_table",),
+        "costs": ("annuity_table", "cost_profile"),
+        "effective_rate_without_bonus": ("annuity_table",),
+        "effective_rate_with_bonus": ("annuity_table", "cost_profile"),
+    }
+
+    # Etapas de las que depende cada etapa, en orden de ejecución
+    STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+        "bonus": (),
+        "without_bonus": (),
+        "with_bonus": ("bonus",),
+        "costs": ("bonus",),
+        "savings": ("without_bonus", "with_bonus", "costs"),
+        "effective_rate_without_bonus": (),
+        "effective_rate_with_bonus": ("bonus",),
+    }
+
+    def __init__(
+        self,
+        mortgage_data: MortgageData,
+        cache: Optional[LRUCache] = DEFAULT_CACHE,
+        annuity_table: Optional[AnnuityFactorTable] = None,
+        cost_profile: Optional[CostProfile] = None,
+    ):
+        """
+        Args:
+            mortgage_data: Datos de la hipoteca
+            cache: Caché de cuotas y tablas compartida (None para desactivarla)
+            annuity_table: Tabla de factores de anualidad (por defecto la instalada
+                con set_default_table o MORTGAGE_ANNUITY_TABLE, si existe)
+            cost_profile: Calendarios de costes variables de las bonificaciones
+                (None para costes mensuales constantes)
+        """
         self.data = mortgage_data
+        self.cache = cache
+        self.annuity_table = annuity_table
+        self.cost_profile = cost_profile
+
+        # Estado para recalcular solo las etapas afectadas por los cambios
+        self._snapshot: Optional[Dict[str, object]] = None
+        self._settings: Dict[str, object] = {}
+        self._use_schedule = False
+        self._stage_values: Dict[str, Dict[str, float]] = {}
+        self.last_recomputed_stages: Tuple[str, ...] = ()
 
     def calculate_monthly_payment(self, annual_rate: float) -> float:
         """
@@ -24,6 +116,20 @@ class MortgageCalculator:
         Returns:
             Cuota mensual
         """
+        if self.cache is None:
+            return self._compute_monthly_payment(annual_rate)
+
+        key = loan_key("payment", self.data.capital, annual_rate, self.data.years * 12)
+        return self.cache.get_or_compute(key, lambda: self._compute_monthly_payment(annual_rate))
+
+    def _compute_monthly_payment(self, annual_rate: float) -> float:
+        """Obtiene la cuota de la tabla de factores o, fuera de la rejilla, de la fórmula."""
+        table = self.annuity_table or get_default_table()
+        if table is not None:
+            factor = table.factor(annual_rate, self.data.years)
+            if factor is not None:
+                return self.data.capital * factor
+
         monthly_rate = annual_rate / 100 / 12
         n_payments = self.data.years * 12
 
@@ -38,39 +144,224 @@ class MortgageCalculator:
 
         return payment
 
-    def calculate_amortization_schedule(
-        self, annual_rate: float
-    ) -> List[Tuple[int, float, float, float, float]]:
+    def calculate_amortization_schedule(self, annual_rate: float) -> AmortizationSchedule:
         """
         Calcula la tabla de amortización completa.
 
+        Las tablas son inmutables, por lo que se comparten desde la caché.
+
         Args:
             annual_rate: Tasa de interés anual en porcentaje
 
         Returns:
-            Lista de tuplas (mes, cuota, intereses, amortización, pendiente)
+            AmortizationSchedule con las columnas (mes, cuota, intereses,
+            amortización, pendiente); iterarla devuelve tuplas por mes
         """
-        monthly_rate = annual_rate / 100 / 12
-        monthly_payment = self.calculate_monthly_payment(annual_rate)
+        if self.cache is None:
+            return self._build_amortization_schedule(annual_rate)
+
+        key = loan_key("schedule", self.data.capital, annual_rate, self.data.years * 12)
+        return self.cache.get_or_compute(
+            key, lambda: self._build_amortization_schedule(annual_rate)
+        )
+
+    def _build_amortization_schedule(self, annual_rate: float) -> AmortizationSchedule:
+        """Construye la tabla de amortización sin pasar por la caché."""
+        return AmortizationSchedule.build(
+            self.data.capital,
+            annual_rate,
+            self.data.years * 12,
+            self.calculate_monthly_payment(annual_rate),
+        )
+
+    def iter_amortization(
+        self, annual_rate: float, start: int = 1, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, float, float, float, float]]:
+        """
+        Genera las filas de la tabla de amortización de forma perezosa.
+
+        El saldo inicial del mes start se obtiene con la fórmula cerrada, por lo
+        que saltar al principio del rango no recorre los meses anteriores y la
+        memoria usada es constante.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            start: Primer mes a generar (desde 1)
+            stop: Último mes a generar, incluido (por defecto el último del préstamo)
+
+        Returns:
+            Iterador de tuplas (mes, cuota, intereses, amortización, pendiente)
+
+        Raises:
+            ValueError: Si start es menor que 1
+        """
+        if start < 1:
+            raise ValueError("El primer mes de la tabla de amortización es el 1")
+
         n_payments = self.data.years * 12
+        stop = n_payments if stop is None else min(stop, n_payments)
+        return self._generate_amortization(annual_rate, start, stop)
 
-        schedule = []
-        remaining_balance = self.data.capital
+    def _generate_amortization(
+        self, annual_rate: float, start: int, stop: int
+    ) -> Iterator[Tuple[int, float, float, float, float]]:
+        """Recorre la recurrencia del sistema francés entre los meses start y stop."""
+        n_payments = self.data.years * 12
+        monthly_rate = annual_rate / 100 / 12
+        monthly_payment = self.calculate_monthly_payment(annual_rate)
+        remaining_balance = float(
+            annuity.remaining_balance(self.data.capital, annual_rate, monthly_payment, start - 1)
+        )
 
-        for month in range(1, n_payments + 1):
+        for month in range(start, stop + 1):
             interest = remaining_balance * monthly_rate
             principal = monthly_payment - interest
             remaining_balance -= principal
 
             # Ajuste para el último pago (por redondeos)
             if month == n_payments:
-                remaining_balance = 0
+                remaining_balance = 0.0
+
+            yield (month, monthly_payment, interest, principal, max(0.0, remaining_balance))
+
+    def balance_at(self, annual_rate: float, month):
+        """
+        Calcula el capital pendiente tras pagar la cuota de un mes.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            month: Mes (0 = antes del primer pago) o array de meses
+
+        Returns:
+            Capital pendiente; float si month es escalar, array si es un array
+        """
+        months = self._validate_months(month, first=0)
+        n_payments = self.data.years * 12
+        monthly_payment = self.calculate_monthly_payment(annual_rate)
+
+        if not np.ndim(month):
+            if months == n_payments:
+                return 0.0
+            monthly_rate = annual_rate / 100 / 12
+            if monthly_rate == 0:
+                return max(0.0, self.data.capital - monthly_payment * months)
+            growth = math.pow(1 + monthly_rate, months)
+            balance = self.data.capital * growth - monthly_payment * (growth - 1) / monthly_rate
+            return max(0.0, balance)
+
+        balance = annuity.remaining_balance(self.data.capital, annual_rate, monthly_payment, months)
+        return np.where(months == n_payments, 0.0, np.maximum(0.0, balance))
+
+    def cumulative_principal(self, annual_rate: float, month):
+        """
+        Calcula el capital amortizado desde el primer mes hasta month incluido.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            month: Mes o array de meses
+
+        Returns:
+            Capital amortizado acumulado
+        """
+        return self.data.capital - self.balance_at(annual_rate, month)
+
+    def cumulative_interest(self, annual_rate: float, month):
+        """
+        Calcula los intereses pagados desde el primer mes hasta month incluido.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            month: Mes o array de meses
+
+        Returns:
+            Intereses acumulados
+        """
+        months = self._validate_months(month, first=0)
+        paid = self.calculate_monthly_payment(annual_rate) * months
+
+        return paid - self.cumulative_principal(annual_rate, months)
+
+    def interest_between(self, annual_rate: float, first_month, last_month):
+        """
+        Calcula los intereses pagados entre dos meses, ambos incluidos.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            first_month: Primer mes del intervalo (o array)
+            last_month: Último mes del intervalo (o array)
+
+        Returns:
+            Intereses pagados en el intervalo
+        """
+        first = self._validate_months(first_month, first=1)
+        last = self._validate_months(last_month, first=0)
+        if np.any(last < first - 1):
+            raise ValueError("El último mes del intervalo no puede ser anterior al primero")
+
+        return self.cumulative_interest(annual_rate, last) - self.cumulative_interest(
+            annual_rate, first - 1
+        )
+
+    def _validate_months(self, month, first: int):
+        """Comprueba que los meses están dentro del préstamo (int si es escalar, si no array)."""
+        n_payments = self.data.years * 12
+        if not np.ndim(month):
+            month = int(month)
+            if not first <= month <= n_payments:
+                raise ValueError(f"Los meses deben estar entre {first} y {n_payments}")
+            return month
+
+        months = np.asarray(month, dtype=np.int64)
+        if np.any(months < first) or np.any(months > n_payments):
+            raise ValueError(f"Los meses deben estar entre {first} y {n_payments}")
+
+        return months
+
+    def calculate_total_interest(self, annual_rate: float, use_schedule: bool = False) -> float:
+        """
+        Calcula los intereses totales del préstamo.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            use_schedule: Si sumar la tabla de amortización en lugar de usar la
+                fórmula cerrada cuota * meses - capital
+
+        Returns:
+            Intereses totales pagados
+        """
+        if use_schedule:
+            return self.calculate_amortization_schedule(annual_rate).total_interest
 
-            schedule.append(
-                (month, monthly_payment, interest, principal, max(0, remaining_balance))
+        n_payments = self.data.years * 12
+        return self.calculate_monthly_payment(annual_rate) * n_payments - self.data.capital
+
+    def verify_closed_form(
+        self, annual_rate: float, tolerance: float = CLOSED_FORM_TOLERANCE
+    ) -> float:
+        """
+        Comprueba que los intereses analíticos coinciden con la recurrencia mes a mes.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            tolerance: Diferencia máxima admitida, relativa al capital
+
+        Returns:
+            Diferencia absoluta entre ambos métodos
+
+        Raises:
+            ValueError: Si la diferencia supera la tolerancia
+        """
+        closed_form = self.calculate_total_interest(annual_rate)
+        iterative = sum(row[2] for row in self.iter_amortization(annual_rate))
+        difference = abs(closed_form - iterative)
+
+        if difference > tolerance * max(1.0, abs(self.data.capital)):
+            raise ValueError(
+                f"Los intereses analíticos ({closed_form:.6f}) difieren de los "
+                f"iterativos ({iterative:.6f}) al {annual_rate}%"
             )
 
-        return schedule
+        return difference
 
     def calculate_total_bonus(self) -> float:
         """Calcula la bonificación total acumulada."""
@@ -84,6 +375,10 @@ class MortgageCalculator:
 
     def calculate_total_bonus_costs(self) -> float:
         """Calcula el coste total de las bonificaciones durante la vida del préstamo."""
+        if self.cost_profile is not None:
+            monthly_costs = self.calculate_monthly_costs()
+            return float(monthly_costs.sum()) + self.data.card_annual_fee * self.data.years
+
         months = self.data.years * 12
         monthly_costs = (
             self.data.life_insurance_cost_monthly
@@ -94,69 +389,423 @@ class MortgageCalculator:
 
         return (monthly_costs * months) + (annual_costs * self.data.years)
 
-    def calculate(self) -> MortgageResults:
+    def calculate_monthly_costs(self, annual_rate: Optional[float] = None) -> np.ndarray:
+        """
+        Calcula el coste mensual de las bonificaciones de cada mes del préstamo.
+
+        Los costes ligados al pendiente usan el capital pendiente al inicio de
+        cada mes, obtenido en bloque con la fórmula cerrada.
+
+        Args:
+            annual_rate: Tipo del préstamo para el pendiente (por defecto el bonificado)
+
+        Returns:
+            Array con el coste de cada mes, sin la cuota anual de la tarjeta
+        """
+        if annual_rate is None:
+            annual_rate = max(0, self.data.interest_rate - self.calculate_total_bonus())
+
+        n_payments = self.data.years * 12
+        profile = self.cost_profile or CostProfile()
+        balance = self.balance_at(annual_rate, np.arange(n_payments))
+
+        return profile.monthly_costs(self.data, balance)
+
+    def calculate(self, use_schedule: bool = False, verify: bool = False) -> MortgageResults:
         """
         Realiza todos los cálculos y devuelve los resultados.
 
+        Los totales se obtienen de forma analítica; las tablas de amortización
+        solo se construyen si se piden con use_schedule. Entre dos llamadas solo
+        se recalculan las etapas afectadas por los campos de self.data o los
+        atributos cost_profile y annuity_table que han cambiado (ver
+        STAGE_FIELDS, STAGE_SETTINGS y STAGE_DEPENDENCIES); las etapas
+        ejecutadas quedan en last_recomputed_stages.
+
+        Args:
+            use_schedule: Si obtener los intereses sumando las tablas de amortización
+            verify: Si contrastar los totales analíticos con la recurrencia mes a mes
+
         Returns:
             MortgageResults con todos los cálculos
         """
-        # Cálculos sin bonificaciones
-        monthly_without = self.calculate_monthly_payment(self.data.interest_rate)
-        schedule_without = self.calculate_amortization_schedule(self.data.interest_rate)
-        total_interest_without = sum(payment[2] for payment in schedule_without)
-        total_paid_without = self.data.capital + total_interest_without
+        snapshot = {field.name: getattr(self.data, field.name) for field in fields(self.data)}
+        settings = {name: getattr(self, name) for name in ("annuity_table", "cost_profile")}
+        if self._snapshot is None or use_schedule != self._use_schedule:
+            stages = list(self.STAGE_DEPENDENCIES)
+        else:
+            changed = {name for name, value in snapshot.items() if self._snapshot[name] != value}
+            changed |= {
+                name for name, value in settings.items() if self._settings[name] is not value
+            }
+            stages = self.dependent_stages(changed)
+
+        for stage in stages:
+            self._stage_values[stage] = getattr(self, f"_stage_{stage}")(use_schedule)
+        self._snapshot = snapshot
+        self._settings = settings
+        self._use_schedule = use_schedule
+        self.last_recomputed_stages = tuple(stages)
+
+        if verify:
+            self.verify_closed_form(self.data.interest_rate)
+            self.verify_closed_form(self._stage_values["bonus"]["rate_with_bonus"])
+
+        values = self._stage_values
+        return MortgageResults(
+            monthly_payment_without_bonus=values["without_bonus"]["monthly_payment"],
+            total_interest_without_bonus=values["without_bonus"]["total_interest"],
+            total_paid_without_bonus=values["without_bonus"]["total_paid"],
+            monthly_payment_with_bonus=values["with_bonus"]["monthly_payment"],
+            total_interest_with_bonus=values["with_bonus"]["total_interest"],
+            total_paid_with_bonus=values["with_bonus"]["total_paid"],
+            total_bonus_costs=values["costs"]["total_bonus_costs"],
+            real_savings=values["savings"]["real_savings"],
+            savings_percentage=values["savings"]["savings_percentage"],
+            is_worth_it=values["savings"]["is_worth_it"],
+            effective_rate_without_bonus=values["effective_rate_without_bonus"]["rate"],
+            effective_rate_with_bonus=values["effective_rate_with_bonus"]["rate"],
+        )
 
-        # Cálculos con bonificaciones
+    @classmethod
+    def dependent_stages(cls, changed_fields) -> List[str]:
+        """
+        Etapas de calculate() que hay que repetir cuando cambian unos campos.
+
+        Args:
+            changed_fields: Nombres de campos de MortgageData (o de atributos de
+                STAGE_SETTINGS) modificados
+
+        Returns:
+            Etapas afectadas, directa o indirectamente, en orden de ejecución
+        """
+        changed_fields = set(changed_fields)
+        dirty: List[str] = []
+        for stage, dependencies in cls.STAGE_DEPENDENCIES.items():
+            read = set(cls.STAGE_FIELDS[stage]) | set(cls.STAGE_SETTINGS.get(stage, ()))
+            if changed_fields & read or any(dependency in dirty for dependency in dependencies):
+                dirty.append(stage)
+
+        return dirty
+
+    def _stage_bonus(self, use_schedule: bool) -> Dict[str, float]:
+        """Bonificación total y tipo resultante."""
         total_bonus = self.calculate_total_bonus()
-        rate_with_bonus = max(0, self.data.interest_rate - total_bonus)
+        return {
+            "total_bonus": total_bonus,
+            "rate_with_bonus": max(0, self.data.interest_rate - total_bonus),
+        }
+
+    def _stage_without_bonus(self, use_schedule: bool) -> Dict[str, float]:
+        """Cuota e intereses sin bonificaciones."""
+        return self._loan_totals(self.data.interest_rate, use_schedule)
+
+    def _stage_with_bonus(self, use_schedule: bool) -> Dict[str, float]:
+        """Cuota e intereses con bonificaciones."""
+        return self._loan_totals(self._stage_values["bonus"]["rate_with_bonus"], use_schedule)
+
+    def _stage_costs(self, use_schedule: bool) -> Dict[str, float]:
+        """Costes de las bonificaciones."""
+        return {"total_bonus_costs": self.calculate_total_bonus_costs()}
+
+    def _stage_savings(self, use_schedule: bool) -> Dict[str, float]:
+        """Ahorro real de las bonificaciones."""
+        total_paid_without = self._stage_values["without_bonus"]["total_paid"]
+        nominal_savings = total_paid_without - self._stage_values["with_bonus"]["total_paid"]
+        real_savings = nominal_savings - self._stage_values["costs"]["total_bonus_costs"]
+        return {
+            "real_savings": real_savings,
+            "savings_percentage": (real_savings / total_paid_without) * 100,
+            "is_worth_it": real_savings > 0,
+        }
+
+    def _stage_effective_rate_without_bonus(self, use_schedule: bool) -> Dict[str, float]:
+        """TAE sin bonificaciones."""
+        return {"rate": self.calculate_effective_rate(self.data.interest_rate)}
+
+    def _stage_effective_rate_with_bonus(self, use_schedule: bool) -> Dict[str, float]:
+        """TAE con bonificaciones, incluyendo sus costes."""
+        rate_with_bonus = self._stage_values["bonus"]["rate_with_bonus"]
+        return {"rate": self.calculate_effective_rate(rate_with_bonus, include_bonus_costs=True)}
+
+    def _loan_totals(self, annual_rate: float, use_schedule: bool) -> Dict[str, float]:
+        """Cuota, intereses y total pagado a un tipo dado."""
+        total_interest = self.calculate_total_interest(annual_rate, use_schedule)
+        return {
+            "monthly_payment": self.calculate_monthly_payment(annual_rate),
+            "total_interest": total_interest,
+            "total_paid": self.data.capital + total_interest,
+        }
+
+    def calculate_effective_rate(
+        self, annual_rate: float, include_bonus_costs: bool = False
+    ) -> float:
+        """
+        Calcula la TAE resolviendo la TIR de los flujos mensuales del préstamo.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            include_bonus_costs: Si sumar a cada cuota los costes de las bonificaciones
+
+        Returns:
+            Tasa efectiva anual en porcentaje
+        """
+        if include_bonus_costs and self.cost_profile is not None:
+            flows = self.calculate_monthly_payment(annual_rate) + self.calculate_monthly_costs(
+                annual_rate
+            )
+            flows[11::12] += self.data.card_annual_fee
+            return effective_annual_rate_flows(self.data.capital, flows)
+
+        monthly_costs = 0.0
+        annual_fee = 0.0
+        if include_bonus_costs:
+            monthly_costs = (
+                self.data.life_insurance_cost_monthly
+                + self.data.home_insurance_cost_monthly
+                + self.data.other_costs_monthly
+            )
+            annual_fee = self.data.card_annual_fee
+
+        return effective_annual_rate(
+            self.data.capital,
+            self.calculate_monthly_payment(annual_rate),
+            self.data.years * 12,
+            monthly_costs,
+            annual_fee,
+        )
 
-        monthly_with = self.calculate_monthly_payment(rate_with_bonus)
-        schedule_with = self.calculate_amortization_schedule(rate_with_bonus)
-        total_interest_with = sum(payment[2] for payment in schedule_with)
-        total_paid_with = self.data.capital + total_interest_with
+    def calculate_with_prepayments(
+        self, annual_rate: float, events: Sequence[PrepaymentEvent]
+    ) -> PrepaymentResults:
+        """
+        Calcula el préstamo con amortizaciones anticipadas parciales.
 
-        # Costes de bonificaciones
-        total_bonus_costs = self.calculate_total_bonus_costs()
+        Entre dos amortizaciones el préstamo es una anualidad, así que cada
+        tramo se resuelve con la fórmula cerrada a partir del pendiente en el
+        mes del evento. Los eventos posteriores a la cancelación se ignoran.
 
-        # Análisis
-        nominal_savings = total_paid_without - total_paid_with
-        real_savings = nominal_savings - total_bonus_costs
-        savings_percentage = (real_savings / total_paid_without) * 100
-        is_worth_it = real_savings > 0
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            events: Amortizaciones anticipadas
 
-        # Tasas efectivas (considerando costes)
-        effective_rate_without = self.data.interest_rate
-        effective_cost_with = total_paid_with + total_bonus_costs
-        effective_rate_with = self._calculate_effective_rate(effective_cost_with)
+        Returns:
+            PrepaymentResults con intereses, comisiones y ahorro
+        """
+        monthly_rate = annual_rate / 100 / 12
+        balance = self.data.capital
+        payment = self.calculate_monthly_payment(annual_rate)
+        paid_months = 0
+        last_month = self.data.years * 12
+        total_interest = 0.0
+        total_fees = 0.0
+
+        for event in self._validate_prepayments(events):
+            if event.month >= last_month:
+                break
+
+            # Tramo hasta el mes del evento
+            elapsed = event.month - paid_months
+            balance_at_event = float(
+                annuity.remaining_balance(balance, annual_rate, payment, elapsed)
+            )
+            total_interest += payment * elapsed - (balance - balance_at_event)
+
+            amount = min(event.amount, balance_at_event)
+            total_fees += amount * event.fee_percentage / 100
+            balance = balance_at_event - amount
+            paid_months = event.month
+
+            if balance <= 0:
+                last_month = event.month
+                break
+            if event.reduce_term:
+                periods = float(annuity.payments_to_amortize(balance, annual_rate, payment))
+                last_month = event.month + math.ceil(periods - PERIODS_TOLERANCE)
+            else:
+                payment = self._annuity(balance, annual_rate, last_month - event.month)
+
+        # Tramo final: la última cuota cancela exactamente el pendiente
+        remaining = last_month - paid_months
+        if remaining > 0 and balance > 0:
+            before_last = float(
+                annuity.remaining_balance(balance, annual_rate, payment, remaining - 1)
+            )
+            total_interest += payment * (remaining - 1) + before_last * (1 + monthly_rate) - balance
 
-        return MortgageResults(
-            monthly_payment_without_bonus=monthly_without,
-            total_interest_without_bonus=total_interest_without,
-            total_paid_without_bonus=total_paid_without,
-            monthly_payment_with_bonus=monthly_with,
-            total_interest_with_bonus=total_interest_with,
-            total_paid_with_bonus=total_paid_with,
-            total_bonus_costs=total_bonus_costs,
-            real_savings=real_savings,
-            savings_percentage=savings_percentage,
-            is_worth_it=is_worth_it,
-            effective_rate_without_bonus=effective_rate_without,
-            effective_rate_with_bonus=effective_rate_with,
+        interest_savings = self.calculate_total_interest(annual_rate) - total_interest
+
+        return PrepaymentResults(
+            total_interest=total_interest,
+            total_fees=total_fees,
+            interest_savings=interest_savings,
+            net_savings=interest_savings - total_fees,
+            last_month=last_month,
+            monthly_payment=payment,
         )
 
-    def _calculate_effective_rate(self, total_cost: float) -> float:
+    def calculate_prepayment_schedule(
+        self, annual_rate: float, events: Sequence[PrepaymentEvent]
+    ) -> AmortizationSchedule:
         """
-        Calcula la tasa efectiva basada en el coste total.
+        Construye la tabla de amortización con amortizaciones anticipadas.
+
+        Los meses anteriores al primer evento se toman de la tabla original
+        (cacheada); solo se construye la cola a partir de cada evento.
 
         Args:
-            total_cost: Coste total pagado
+            annual_rate: Tasa de interés anual en porcentaje
+            events: Amortizaciones anticipadas
 
         Returns:
-            Tasa efectiva anual en porcentaje
+            AmortizationSchedule; en el mes de cada evento la amortización y el
+            pendiente incluyen el importe anticipado
+        """
+        events = [
+            event
+            for event in self._validate_prepayments(events)
+            if event.month < self.data.years * 12
+        ]
+        if not events:
+            return self.calculate_amortization_schedule(annual_rate)
+
+        payment = self.calculate_monthly_payment(annual_rate)
+        last_month = self.data.years * 12
+        pieces = [self.calculate_amortization_schedule(annual_rate)[: events[0].month]]
+        balance = float(pieces[0].balance[-1])
+        prepaid = {}
+
+        for index, event in enumerate(events):
+            if event.month >= last_month or balance <= 0:
+                break
+            # Varios eventos en el mismo mes comparten tramo: solo se suma el importe
+            if index and event.month > pieces[-1].month[-1]:
+                piece = AmortizationSchedule.build(
+                    balance,
+                    annual_rate,
+                    last_month - pieces[-1].month[-1],
+                    payment,
+                    first_month=pieces[-1].month[-1] + 1,
+                    rows=event.month - pieces[-1].month[-1],
+                )
+                pieces.append(piece)
+                balance = float(piece.balance[-1])
+
+            amount = min(event.amount, balance)
+            prepaid[event.month] = prepaid.get(event.month, 0.0) + amount
+            balance -= amount
+            if balance <= 0:
+                last_month = event.month
+            elif event.reduce_term:
+                periods = float(annuity.payments_to_amortize(balance, annual_rate, payment))
+                last_month = event.month + math.ceil(periods - PERIODS_TOLERANCE)
+            else:
+                payment = self._annuity(balance, annual_rate, last_month - event.month)
+
+        paid_months = int(pieces[-1].month[-1])
+        if last_month > paid_months and balance > 0:
+            pieces.append(
+                AmortizationSchedule.build(
+                    balance,
+                    annual_rate,
+                    last_month - paid_months,
+                    payment,
+                    first_month=paid_months + 1,
+                    settle_last=True,
+                )
+            )
+
+        schedule = AmortizationSchedule.concatenate(pieces)
+        principal = schedule.principal.copy()
+        balance_column = schedule.balance.copy()
+        for month, amount in prepaid.items():
+            principal[month - 1] += amount
+            balance_column[month - 1] = max(0.0, balance_column[month - 1] - amount)
+
+        return AmortizationSchedule(
+            schedule.month, schedule.payment, schedule.interest, principal, balance_column
+        )
+
+    def evaluate_prepayment_grid(
+        self,
+        annual_rate: float,
+        months,
+        amounts,
+        reduce_term: bool = True,
+        fee_percentage: float = 0.0,
+    ) -> PrepaymentGrid:
         """
-        total_interest = total_cost - self.data.capital
-        # TIR aproximada usando el método simple
-        annual_interest = total_interest / self.data.years
-        effective_rate = (annual_interest / self.data.capital) * 100
-        return effective_rate
+        Evalúa de una vez una amortización anticipada para cada mes e importe.
+
+        Args:
+            annual_rate: Tasa de interés anual en porcentaje
+            months: Meses en los que amortizar (filas)
+            amounts: Importes a amortizar (columnas)
+            reduce_term: True para reducir plazo, False para reducir cuota
+            fee_percentage: Comisión del banco sobre el importe (%)
+
+        Returns:
+            PrepaymentGrid con arrays (meses, importes)
+        """
+        months = np.asarray(self._validate_months(np.atleast_1d(months), first=1))
+        amounts = np.atleast_1d(np.asarray(amounts, dtype=float))
+        n_payments = self.data.years * 12
+        monthly_rate = annual_rate / 100 / 12
+        payment = self.calculate_monthly_payment(annual_rate)
+
+        balance_at_event = self.balance_at(annual_rate, months)[:, None]
+        remaining = (n_payments - months)[:, None]
+        prepaid = np.minimum(amounts[None, :], balance_at_event)
+        balance = balance_at_event - prepaid
+        base_interest = payment * remaining - balance_at_event
+
+        if reduce_term:
+            periods = np.ceil(
+                annuity.payments_to_amortize(balance, annual_rate, payment) - PERIODS_TOLERANCE
+            )
+            periods = np.where(balance > 0, np.minimum(periods, remaining), 0)
+            before_last = annuity.remaining_balance(
+                balance, annual_rate, payment, np.maximum(periods - 1, 0)
+            )
+            new_interest = np.where(
+                periods > 0,
+                payment * (periods - 1) + before_last * (1 + monthly_rate) - balance,
+                0.0,
+            )
+            new_payment = np.where(periods > 0, payment, 0.0)
+        else:
+            periods = np.where(balance > 0, remaining, 0)
+            new_payment = np.where(
+                balance > 0, annuity.annuity_payment(balance, annual_rate, remaining), 0.0
+            )
+            new_interest = new_payment * periods - balance
+
+        interest_savings = base_interest - new_interest
+        fees = prepaid * fee_percentage / 100
+
+        return PrepaymentGrid(
+            months=months,
+            amounts=amounts,
+            interest_savings=interest_savings,
+            fees=fees,
+            net_savings=interest_savings - fees,
+            monthly_payment=new_payment,
+            last_month=(months[:, None] + periods).astype(np.int64),
+            reduce_term=reduce_term,
+            fee_percentage=fee_percentage,
+        )
+
+    def _annuity(self, capital: float, annual_rate: float, n_payments: int) -> float:
+        """Cuota que amortiza un capital en n_payments meses."""
+        return float(annuity.annuity_payment(capital, annual_rate, n_payments))
+
+    def _validate_prepayments(self, events: Sequence[PrepaymentEvent]) -> List[PrepaymentEvent]:
+        """Ordena las amortizaciones anticipadas y comprueba que son válidas."""
+        n_payments = self.data.years * 12
+        for event in events:
+            if not 1 <= event.month <= n_payments:
+                raise ValueError(f"El mes de amortización debe estar entre 1 y {n_payments}")
+            if event.amount <= 0:
+                raise ValueError("El importe amortizado debe ser positivo")
+
+        return sorted(events, key=lambda event: event.month)
@@ -0,0 +1,147 @@
+"""
+Costes de las bonificaciones que varían a lo largo del préstamo.
+
+Cada calendario de costes devuelve un vector con el coste de cada mes del
+préstamo, alineado con la tabla de amortización (posición 0 = mes 1).
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class CostSchedule(ABC):
+    """Calendario de costes mensuales de una bonificación."""
+
+    @abstractmethod
+    def monthly(self, n_months: int, balance: np.ndarray) -> np.ndarray:
+        """
+        Calcula el coste de cada mes.
+
+        Args:
+            n_months: Número de meses del préstamo
+            balance: Pendiente al inicio de cada mes (n_months valores)
+
+        Returns:
+            Array con el coste de cada mes (€)
+        """
+
+
+@dataclass(frozen=True)
+class FlatCost(CostSchedule):
+    """Coste mensual constante."""
+
+    amount: float  # Coste mensual (€)
+
+    def monthly(self, n_months: int, balance: np.ndarray) -> np.ndarray:
+        return np.full(n_months, float(self.amount))
+
+
+@dataclass(frozen=True)
+class EscalatingCost(CostSchedule):
+    """Coste que se revaloriza un porcentaje fijo cada cierto número de meses (p. ej. IPC)."""
+
+    amount: float  # Coste mensual inicial (€)
+    annual_increase: float  # Subida en cada revisión (%)
+    every_months: int = 12  # Meses entre revisiones
+
+    def monthly(self, n_months: int, balance: np.ndarray) -> np.ndarray:
+        steps = np.arange(n_months) // self.every_months
+        return self.amount * np.power(1 + self.annual_increase / 100, steps)
+
+
+@dataclass(frozen=True)
+class StepCost(CostSchedule):
+    """
+    Coste por tramos, como las primas de vida por edad.
+
+    El tramo i se aplica desde el mes i * months_per_step + 1; después del último
+    tramo se mantiene su importe.
+    """
+
+    amounts: Sequence[float]  # Coste mensual de cada tramo (€)
+    months_per_step: int = 12  # Meses de cada tramo
+
+    def monthly(self, n_months: int, balance: np.ndarray) -> np.ndarray:
+        amounts = np.asarray(self.amounts, dtype=float)
+        steps = np.minimum(np.arange(n_months) // self.months_per_step, len(amounts) - 1)
+        return amounts[steps]
+
+
+@dataclass(frozen=True)
+class ArrayCost(CostSchedule):
+    """Coste explícito de cada mes."""
+
+    amounts: Sequence[float]  # Coste de cada mes (€), al menos uno por mes del préstamo
+
+    def monthly(self, n_months: int, balance: np.ndarray) -> np.ndarray:
+        amounts = np.asarray(self.amounts, dtype=float)
+        if len(amounts) < n_months:
+            raise ValueError(
+                f"El calendario de costes tiene {len(amounts)} meses y el préstamo {n_months}"
+            )
+        return amounts[:n_months]
+
+
+@dataclass(frozen=True)
+class BalanceLinkedCost(CostSchedule):
+    """
+    Seguro cuyo capital asegurado sigue al pendiente del préstamo.
+
+    El coste de cada mes es el del calendario base (calculado para el capital
+    inicial) multiplicado por la fracción del capital que queda pendiente.
+    """
+
+    base: CostSchedule  # Coste para el capital inicial asegurado
+
+    def monthly(self, n_months: int, balance: np.ndarray) -> np.ndarray:
+        return self.base.monthly(n_months, balance) * (balance / balance[0])
+
+
+@dataclass(frozen=True)
+class CostProfile:
+    """
+    Calendarios de costes de las bonificaciones.
+
+    Los costes sin calendario (None) se toman como constantes a partir de los
+    importes mensuales de MortgageData. La cuota anual de la tarjeta se sigue
+    pagando al final de cada año.
+    """
+
+    life_insurance: Optional[CostSchedule] = None
+    home_insurance: Optional[CostSchedule] = None
+    other: Optional[CostSchedule] = None
+
+    @property
+    def schedules(self) -> Tuple[Optional[CostSchedule], ...]:
+        """Calendarios de seguro de vida, seguro de hogar y otros costes."""
+        return (self.life_insurance, self.home_insurance, self.other)
+
+    def monthly_costs(self, mortgage_data, balance: np.ndarray) -> np.ndarray:
+        """
+        Calcula la suma de los costes mensuales de cada mes.
+
+        Args:
+            mortgage_data: Datos de la hipoteca (importes de los costes constantes)
+            balance: Pendiente al inicio de cada mes del préstamo
+
+        Returns:
+            Array con el coste mensual total de cada mes (€)
+        """
+        n_months = len(balance)
+        flat_amounts = (
+            mortgage_data.life_insurance_cost_monthly,
+            mortgage_data.home_insurance_cost_monthly,
+            mortgage_data.other_costs_monthly,
+        )
+
+        costs = np.zeros(n_months)
+        for schedule, flat_amount in zip(self.schedules, flat_amounts):
+            if schedule is None:
+                costs += flat_amount
+            else:
+                costs += schedule.monthly(n_months, balance)
+
+        return costs
@@ -0,0 +1,292 @@
+"""
+Cálculo de la TAE a partir de los flujos mensuales del préstamo.
+
+El prestatario recibe el capital en el mes 0 y paga cada mes la cuota más los
+costes mensuales de las bonificaciones, y al final de cada año la cuota anual
+de la tarjeta. La TIR mensual r de esos flujos se obtiene con un método híbrido
+Newton/bisección y la TAE es ((1 + r) ** 12 - 1) * 100.
+"""
+
+import math
+
+import numpy as np
+
+# Intervalo inicial de búsqueda de la TIR mensual
+MIN_MONTHLY_RATE = -0.05
+MAX_MONTHLY_RATE = 1.0
+
+# Precisión en la TIR mensual y número máximo de iteraciones
+RATE_TOLERANCE = 1e-13
+MAX_ITERATIONS = 100
+
+# Por debajo de este tipo mensual se usa el desarrollo en serie de la anualidad
+SMALL_RATE = 1e-9
+
+
+def _annuity_factor(rate: float, periods: int):
+    """Valor actual de una renta unitaria y su derivada respecto al tipo."""
+    if abs(rate) < SMALL_RATE:
+        return periods - periods * (periods + 1) / 2 * rate, -periods * (periods + 1) / 2
+
+    log_growth = math.log1p(rate)
+    discounted = math.exp(-periods * log_growth)
+    factor = -math.expm1(-periods * log_growth) / rate
+    derivative = (periods * discounted / (1 + rate) - factor) / rate
+
+    return factor, derivative
+
+
+def _npv(rate, capital, monthly_flow, n_payments, annual_fee):
+    """Valor actual neto de los flujos y su derivada para un tipo mensual."""
+    factor, derivative = _annuity_factor(rate, n_payments)
+    value = monthly_flow * factor - capital
+    slope = monthly_flow * derivative
+
+    if annual_fee:
+        annual_rate = math.expm1(12 * math.log1p(rate))
+        annual_factor, annual_derivative = _annuity_factor(annual_rate, n_payments // 12)
+        value += annual_fee * annual_factor
+        slope += annual_fee * annual_derivative * 12 * math.pow(1 + rate, 11)
+
+    return value, slope
+
+
+def solve_monthly_irr(
+    capital: float, monthly_flow: float, n_payments: int, annual_fee: float = 0.0
+) -> float:
+    """
+    Calcula la TIR mensual de un préstamo.
+
+    Args:
+        capital: Capital recibido
+        monthly_flow: Pago mensual total (cuota más costes mensuales)
+        n_payments: Número de pagos mensuales
+        annual_fee: Pago adicional al final de cada año
+
+    Returns:
+        TIR mensual en tanto por uno (NaN si no hay solución en el intervalo)
+    """
+    low, high = MIN_MONTHLY_RATE, MAX_MONTHLY_RATE
+    if _npv(low, capital, monthly_flow, n_payments, annual_fee)[0] < 0:
+        return math.nan
+    if _npv(high, capital, monthly_flow, n_payments, annual_fee)[0] > 0:
+        return math.nan
+
+    rate = monthly_flow / capital - 1 / n_payments
+    for _ in range(MAX_ITERATIONS):
+        value, slope = _npv(rate, capital, monthly_flow, n_payments, annual_fee)
+
+        # El VAN decrece con el tipo: se estrecha el intervalo que contiene la raíz
+        if value > 0:
+            low = rate
+        else:
+            high = rate
+
+        candidate = rate - value / slope if slope else math.nan
+        if not low < candidate < high:
+            candidate = (low + high) / 2
+
+        if abs(candidate - rate) < RATE_TOLERANCE:
+            return candidate
+        rate = candidate
+
+    return rate
+
+
+def effective_annual_rate(
+    capital: float,
+    payment: float,
+    n_payments: int,
+    monthly_costs: float = 0.0,
+    annual_fee: float = 0.0,
+) -> float:
+    """
+    Calcula la TAE de un préstamo con costes asociados.
+
+    Args:
+        capital: Capital prestado
+        payment: Cuota mensual
+        n_payments: Número de cuotas mensuales
+        monthly_costs: Costes mensuales adicionales
+        annual_fee: Cuota anual adicional
+
+    Returns:
+        TAE en porcentaje
+    """
+    monthly_irr = solve_monthly_irr(capital, payment + monthly_costs, n_payments, annual_fee)
+    return math.expm1(12 * math.log1p(monthly_irr)) * 100
+
+
+def _annuity_factor_batch(rate: np.ndarray, periods: np.ndarray):
+    """Versión vectorizada de _annuity_factor."""
+    small = np.abs(rate) < SMALL_RATE
+    safe_rate = np.where(small, 1.0, rate)
+
+    log_growth = np.log1p(safe_rate)
+    discounted = np.exp(-periods * log_growth)
+    factor = -np.expm1(-periods * log_growth) / safe_rate
+    derivative = (periods * discounted / (1 + safe_rate) - factor) / safe_rate
+
+    series = periods * (periods + 1) / 2
+    factor = np.where(small, periods - series * rate, factor)
+    derivative = np.where(small, -series, derivative)
+
+    return factor, derivative
+
+
+def _npv_batch(rate, capital, monthly_flow, n_payments, annual_fee):
+    """Versión vectorizada de _npv."""
+    factor, derivative = _annuity_factor_batch(rate, n_payments)
+    value = monthly_flow * factor - capital
+    slope = monthly_flow * derivative
+
+    annual_rate = np.expm1(12 * np.log1p(rate))
+    annual_factor, annual_derivative = _annuity_factor_batch(annual_rate, n_payments // 12)
+    value = value + annual_fee * annual_factor
+    slope = slope + annual_fee * annual_derivative * 12 * np.power(1 + rate, 11)
+
+    return value, slope
+
+
+def solve_monthly_irr_batch(capital, monthly_flow, n_payments, annual_fee=0.0) -> np.ndarray:
+    """
+    Calcula la TIR mensual de muchos préstamos a la vez.
+
+    Cada iteración se aplica solo a los préstamos que aún no han convergido y
+    el proceso termina como máximo tras MAX_ITERATIONS pasos.
+
+    Args:
+        capital: Capital recibido
+        monthly_flow: Pago mensual total (cuota más costes mensuales)
+        n_payments: Número de pagos mensuales
+        annual_fee: Pago adicional al final de cada año
+
+    Returns:
+        Array con la TIR mensual en tanto por uno (NaN si no hay solución)
+    """
+    capital, monthly_flow, n_payments, annual_fee = np.broadcast_arrays(
+        np.asarray(capital, dtype=float),
+        np.asarray(monthly_flow, dtype=float),
+        np.asarray(n_payments, dtype=np.int64),
+        np.asarray(annual_fee, dtype=float),
+    )
+    shape = capital.shape
+    capital, monthly_flow, n_payments, annual_fee = (
+        column.ravel() for column in (capital, monthly_flow, n_payments, annual_fee)
+    )
+    periods = n_payments.astype(float)
+    args = (capital, monthly_flow, periods, annual_fee)
+
+    low = np.full(capital.shape, MIN_MONTHLY_RATE)
+    high = np.full(capital.shape, MAX_MONTHLY_RATE)
+    solvable = (_npv_batch(low, *args)[0] >= 0) & (_npv_batch(high, *args)[0] <= 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.clip(monthly_flow / capital - 1 / periods, low, high)
+        rate[~solvable] = np.nan
+
+        # Solo se itera sobre los préstamos que aún no han convergido
+        active = np.flatnonzero(solvable)
+        for _ in range(MAX_ITERATIONS):
+            if not active.size:
+                break
+
+            current = rate[active]
+            value, slope = _npv_batch(current, *(arg[active] for arg in args))
+            positive = value > 0
+            low[active] = np.where(positive, current, low[active])
+            high[active] = np.where(positive, high[active], current)
+
+            candidate = current - value / slope
+            outside = ~((low[active] < candidate) & (candidate < high[active]))
+            candidate = np.where(outside, (low[active] + high[active]) / 2, candidate)
+
+            rate[active] = candidate
+            active = active[np.abs(candidate - current) >= RATE_TOLERANCE]
+
+    return rate.reshape(shape)
+
+
+def effective_annual_rate_batch(
+    capital, payment, n_payments, monthly_costs=0.0, annual_fee=0.0
+) -> np.ndarray:
+    """
+    Calcula la TAE de muchos préstamos a la vez.
+
+    Args:
+        capital: Capital prestado
+        payment: Cuota mensual
+        n_payments: Número de cuotas mensuales
+        monthly_costs: Costes mensuales adicionales
+        annual_fee: Cuota anual adicional
+
+    Returns:
+        Array con la TAE en porcentaje
+    """
+    monthly_flow = np.asarray(payment, dtype=float) + monthly_costs
+    monthly_irr = solve_monthly_irr_batch(capital, monthly_flow, n_payments, annual_fee)
+    return np.expm1(12 * np.log1p(monthly_irr)) * 100
+
+
+def _npv_flows(rate: float, capital: float, flows: np.ndarray, periods: np.ndarray):
+    """Valor actual neto de unos flujos mensuales arbitrarios y su derivada."""
+    discount = np.exp(-periods * math.log1p(rate))
+    value = float(flows @ discount) - capital
+    slope = -float((flows * periods) @ discount) / (1 + rate)
+
+    return value, slope
+
+
+def solve_monthly_irr_flows(capital: float, flows) -> float:
+    """
+    Calcula la TIR mensual de un préstamo con pagos mensuales variables.
+
+    Args:
+        capital: Capital recibido
+        flows: Pago total de cada mes (el primero, un mes después de recibir el capital)
+
+    Returns:
+        TIR mensual en tanto por uno (NaN si no hay solución en el intervalo)
+    """
+    flows = np.asarray(flows, dtype=float)
+    periods = np.arange(1, len(flows) + 1, dtype=float)
+
+    low, high = MIN_MONTHLY_RATE, MAX_MONTHLY_RATE
+    if _npv_flows(low, capital, flows, periods)[0] < 0:
+        return math.nan
+    if _npv_flows(high, capital, flows, periods)[0] > 0:
+        return math.nan
+
+    rate = flows.mean() / capital - 1 / len(flows)
+    for _ in range(MAX_ITERATIONS):
+        value, slope = _npv_flows(rate, capital, flows, periods)
+
+        if value > 0:
+            low = rate
+        else:
+            high = rate
+
+        candidate = rate - value / slope if slope else math.nan
+        if not low < candidate < high:
+            candidate = (low + high) / 2
+
+        if abs(candidate - rate) < RATE_TOLERANCE:
+            return candidate
+        rate = candidate
+
+    return rate
+
+
+def effective_annual_rate_flows(capital: float, flows) -> float:
+    """
+    Calcula la TAE de un préstamo con pagos mensuales variables.
+
+    Args:
+        capital: Capital prestado
+        flows: Pago total de cada mes (cuota más costes)
+
+    Returns:
+        TAE en porcentaje
+    """
+    monthly_irr = solve_monthly_irr_flows(capital, flows)
+    return math.expm1(12 * math.log1p(monthly_irr)) * 100
@@ -2,7 +2,12 @@
 Modelos de datos para la calculadora de hipotecas.
 """
 
+import dataclasses
+import struct
 from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
 
 
 @dataclass
@@ -50,3 +55,149 @@ class MortgageResults:
     is_worth_it: bool
     effective_rate_without_bonus: float
     effective_rate_with_bonus: float
+
+
+class _PackedRecord:
+    """Codificación binaria de tamaño fijo para las variantes congeladas."""
+
+    __slots__ = ()
+    STRUCT: struct.Struct
+
+    def replace(self, **changes):
+        """Devuelve una copia con los campos indicados cambiados."""
+        return dataclasses.replace(self, **changes)
+
+    def astuple(self) -> tuple:
+        """Valores de los campos en orden, sin la copia profunda de dataclasses.astuple."""
+        return tuple(getattr(self, name) for name in self.__match_args__)
+
+    def to_bytes(self) -> bytes:
+        """Empaqueta los campos en STRUCT.size bytes (little-endian)."""
+        return self.STRUCT.pack(*self.astuple())
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes):
+        """Reconstruye una instancia empaquetada con to_bytes."""
+        return cls(*cls.STRUCT.unpack(buffer))
+
+    @classmethod
+    def pack_many(cls, items: Iterable) -> bytes:
+        """Empaqueta muchas instancias en un único bloque de bytes."""
+        pack = cls.STRUCT.pack
+        return b"".join(pack(*item.astuple()) for item in items)
+
+    @classmethod
+    def unpack_many(cls, buffer: bytes) -> List:
+        """Reconstruye las instancias empaquetadas con pack_many."""
+        return [cls(*values) for values in cls.STRUCT.iter_unpack(buffer)]
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenMortgageData(_PackedRecord):
+    """
+    Variante inmutable y hashable de MortgageData.
+
+    Ocupa menos memoria (sin __dict__), puede usarse como clave de diccionario
+    y se codifica en 92 bytes con to_bytes.
+    """
+
+    STRUCT = struct.Struct("<2di9d")
+
+    capital: float
+    interest_rate: float
+    years: int
+    payroll_bonus: float = 0.0
+    life_insurance_bonus: float = 0.0
+    home_insurance_bonus: float = 0.0
+    card_bonus: float = 0.0
+    other_bonus: float = 0.0
+    life_insurance_cost_monthly: float = 0.0
+    home_insurance_cost_monthly: float = 0.0
+    card_annual_fee: float = 0.0
+    other_costs_monthly: float = 0.0
+
+    @classmethod
+    def from_mortgage_data(cls, data: MortgageData) -> "FrozenMortgageData":
+        """Crea la variante congelada de unos datos de hipoteca."""
+        return cls(*dataclasses.astuple(data))
+
+    def to_mortgage_data(self) -> MortgageData:
+        """Devuelve una copia mutable como MortgageData."""
+        return MortgageData(*self.astuple())
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenMortgageResults(_PackedRecord):
+    """Variante inmutable y hashable de MortgageResults (89 bytes con to_bytes)."""
+
+    STRUCT = struct.Struct("<9d?2d")
+
+    monthly_payment_without_bonus: float
+    total_interest_without_bonus: float
+    total_paid_without_bonus: float
+    monthly_payment_with_bonus: float
+    total_interest_with_bonus: float
+    total_paid_with_bonus: float
+    total_bonus_costs: float
+    real_savings: float
+    savings_percentage: float
+    is_worth_it: bool
+    effective_rate_without_bonus: float
+    effective_rate_with_bonus: float
+
+    @classmethod
+    def from_results(cls, results: MortgageResults) -> "FrozenMortgageResults":
+        """Crea la variante congelada de unos resultados."""
+        values = dataclasses.astuple(results)
+        return cls(*values[:9], bool(values[9]), *values[10:])
+
+    def to_results(self) -> MortgageResults:
+        """Devuelve una copia mutable como MortgageResults."""
+        return MortgageResults(*self.astuple())
+
+
+@dataclass
+class PrepaymentEvent:
+    """Amortización anticipada parcial del préstamo."""
+
+    month: int  # Mes tras cuya cuota se amortiza
+    amount: float  # Importe amortizado (€)
+    reduce_term: bool = True  # True: reduce el plazo; False: reduce la cuota
+    fee_percentage: float = 0.0  # Comisión del banco sobre el importe (%)
+
+
+@dataclass
+class PrepaymentResults:
+    """Resultados de un préstamo con amortizaciones anticipadas."""
+
+    total_interest: float  # Intereses totales pagados
+    total_fees: float  # Comisiones totales por amortización anticipada
+    interest_savings: float  # Intereses ahorrados frente a no amortizar
+    net_savings: float  # Ahorro en intereses menos comisiones
+    last_month: int  # Mes de la última cuota
+    monthly_payment: float  # Cuota mensual tras la última amortización
+
+
+@dataclass
+class PrepaymentGrid:
+    """Resultados de una amortización anticipada por cada combinación de mes e importe."""
+
+    months: np.ndarray  # Meses evaluados (filas)
+    amounts: np.ndarray  # Importes evaluados (columnas)
+    interest_savings: np.ndarray  # Intereses ahorrados
+    fees: np.ndarray  # Comisiones pagadas
+    net_savings: np.ndarray  # Ahorro neto
+    monthly_payment: np.ndarray  # Cuota tras la amortización
+    last_month: np.ndarray  # Mes de la última cuota
+    reduce_term: bool  # Modalidad evaluada
+    fee_percentage: float  # Comisión aplicada (%)
+
+    def best(self) -> PrepaymentEvent:
+        """Devuelve la combinación de mes e importe con mayor ahorro neto."""
+        row, column = np.unravel_index(np.argmax(self.net_savings), self.net_savings.shape)
+        return PrepaymentEvent(
+            month=int(self.months[row]),
+            amount=float(self.amounts[column]),
+            reduce_term=self.reduce_term,
+            fee_percentage=self.fee_percentage,
+        )
@@ -0,0 +1,166 @@
+"""
+Simulación Monte Carlo del Euríbor para evaluar si las bonificaciones compensan.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .models import MortgageData
+from .variable_rate import VariableRateCalculator
+
+
+@dataclass(frozen=True)
+class EuriborModel:
+    """Modelo de Vasicek (reversión a la media) para el índice, en porcentaje."""
+
+    initial: float = 2.5  # Valor actual del índice (%)
+    long_term_mean: float = 2.5  # Nivel al que revierte (%)
+    reversion_speed: float = 0.3  # Velocidad de reversión (por año)
+    volatility: float = 0.8  # Volatilidad (puntos porcentuales por raíz de año)
+
+    def simulate(
+        self, n_paths: int, n_steps: int, step_years: float, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Simula trayectorias con la discretización exacta del proceso.
+
+        Args:
+            n_paths: Número de trayectorias
+            n_steps: Número de observaciones por trayectoria (la primera es initial)
+            step_years: Años entre observaciones
+            rng: Generador de números aleatorios
+
+        Returns:
+            Array (n_paths, n_steps) con el índice en porcentaje
+        """
+        decay = math.exp(-self.reversion_speed * step_years)
+        if self.reversion_speed > 0:
+            shock = self.volatility * math.sqrt((1 - decay**2) / (2 * self.reversion_speed))
+        else:
+            shock = self.volatility * math.sqrt(step_years)
+
+        paths = np.empty((n_paths, n_steps))
+        if n_steps == 0:
+            return paths
+
+        paths[:, 0] = self.initial
+        noise = rng.standard_normal((n_paths, n_steps - 1))
+        for step in range(1, n_steps):
+            paths[:, step] = (
+                self.long_term_mean
+                + (paths[:, step - 1] - self.long_term_mean) * decay
+                + shock * noise[:, step - 1]
+            )
+
+        return paths
+
+
+@dataclass
+class MonteCarloResults:
+    """Distribución del ahorro real de las bonificaciones sobre las trayectorias."""
+
+    savings: np.ndarray  # Ahorro real (€) de cada trayectoria
+
+    @property
+    def probability_worth_it(self) -> float:
+        """Proporción de trayectorias en las que las bonificaciones compensan."""
+        return float(np.mean(self.savings > 0))
+
+    def percentiles(self, levels: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[float, float]:
+        """Percentiles del ahorro real."""
+        values = np.percentile(self.savings, levels)
+        return {level: float(value) for level, value in zip(levels, values)}
+
+    def summary(self) -> Dict[str, float]:
+        """Resumen de la distribución del ahorro real."""
+        summary = {
+            "trayectorias": len(self.savings),
+            "ahorro_medio": float(self.savings.mean()),
+            "desviacion_tipica": float(self.savings.std()),
+            "probabilidad_vale_la_pena": self.probability_worth_it,
+        }
+        for level, value in self.percentiles().items():
+            summary[f"percentil_{level:g}"] = value
+
+        return summary
+
+
+def _simulate_chunk(
+    mortgage_data: MortgageData,
+    spread: float,
+    model: EuriborModel,
+    reset_months: int,
+    fixed_months: int,
+    n_paths: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """Simula un bloque de trayectorias con su propio flujo de números aleatorios."""
+    engine = VariableRateCalculator(mortgage_data, spread, reset_months, fixed_months)
+    rng = np.random.default_rng(seed)
+    paths = model.simulate(n_paths, engine.n_resets, reset_months / 12, rng)
+
+    return engine.bonus_savings(paths)
+
+
+def run_monte_carlo(
+    mortgage_data: MortgageData,
+    spread: float,
+    model: EuriborModel = EuriborModel(),
+    n_paths: int = 100_000,
+    reset_months: int = 12,
+    fixed_months: int = 0,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 50_000,
+) -> MonteCarloResults:
+    """
+    Evalúa el ahorro real de las bonificaciones sobre trayectorias simuladas del índice.
+
+    Las trayectorias se reparten en bloques de chunk_size. Cada bloque recibe un
+    flujo aleatorio independiente derivado de seed, así que el resultado es el
+    mismo sea cual sea el número de procesos.
+
+    Args:
+        mortgage_data: Datos de la hipoteca (interest_rate es el tipo del periodo fijo)
+        spread: Diferencial sobre el índice (%)
+        model: Modelo del índice
+        n_paths: Número de trayectorias
+        reset_months: Meses entre revisiones del tipo
+        fixed_months: Meses iniciales a tipo fijo
+        seed: Semilla para reproducir la simulación
+        workers: Número de procesos (1 para no usar el pool; None para todos los núcleos)
+        chunk_size: Trayectorias por bloque
+
+    Returns:
+        MonteCarloResults con el ahorro real de cada trayectoria
+    """
+    if n_paths <= 0:
+        raise ValueError("El número de trayectorias debe ser positivo")
+    if chunk_size <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (mortgage_data, spread, model, reset_months, fixed_months)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sizes) == 1:
+        chunks = [
+            _simulate_chunk(*args, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            futures = [
+                pool.submit(_simulate_chunk, *args, size, chunk_seed)
+                for size, chunk_seed in zip(sizes, seeds)
+            ]
+            chunks = [future.result() for future in futures]
+
+    return MonteCarloResults(savings=np.concatenate(chunks))
@@ -0,0 +1,99 @@
+"""
+Calendario de pagos agregado por periodos a partir de la tabla de amortización.
+
+Las cuotas se asignan a periodos (años, semestres, trimestres o cualquier
+número de meses, opcionalmente alineados con un año fiscal) y cada columna se
+agrega con np.add.reduceat sobre los límites de los periodos.
+"""
+
+import datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .schedule import AmortizationSchedule
+
+FREQUENCIES = {"month": 1, "quarter": 3, "half": 6, "year": 12}
+PERIOD_LABELS = {1: "Mes", 3: "Trimestre", 6: "Semestre", 12: "Año"}
+
+
+def payment_dates(first_payment: datetime.date, n_payments: int) -> np.ndarray:
+    """
+    Fechas de las cuotas: el mismo día de cada mes (o el último si no existe).
+
+    Args:
+        first_payment: Fecha de la primera cuota
+        n_payments: Número de cuotas
+
+    Returns:
+        Array datetime64[D] con la fecha de cada cuota
+    """
+    month_start = np.datetime64(first_payment, "M") + np.arange(n_payments)
+    first_day = month_start.astype("datetime64[D]")
+    days_in_month = ((month_start + 1).astype("datetime64[D]") - first_day).astype(np.int64)
+    day = np.minimum(first_payment.day, days_in_month)
+
+    return first_day + (day - 1)
+
+
+def build_payment_calendar(
+    schedule: AmortizationSchedule,
+    frequency: Union[str, int] = "year",
+    start_date: Optional[datetime.date] = None,
+    fiscal_year_start: int = 1,
+) -> pd.DataFrame:
+    """
+    Agrega la tabla de amortización por periodos.
+
+    Sin start_date los periodos se cuentan desde la primera cuota (año 1 =
+    cuotas 1 a 12). Con start_date se usan fechas reales y los periodos se
+    alinean con el año fiscal que empieza en fiscal_year_start, así que el
+    primero y el último pueden ser incompletos.
+
+    Args:
+        schedule: Tabla de amortización
+        frequency: "year", "half", "quarter", "month" o número de meses por periodo
+        start_date: Fecha de la primera cuota
+        fiscal_year_start: Mes (1-12) en que empieza el año fiscal
+
+    Returns:
+        DataFrame con una fila por periodo, totales, pendiente final y acumulados
+    """
+    period_months = FREQUENCIES.get(frequency, frequency)
+    if not isinstance(period_months, int) or period_months <= 0:
+        raise ValueError(f"Frecuencia no válida: {frequency}")
+    if not 1 <= fiscal_year_start <= 12:
+        raise ValueError("El año fiscal debe empezar en un mes entre 1 y 12")
+
+    # Meses del primer periodo que caen antes de la primera cuota
+    offset = 0
+    if start_date is not None:
+        offset = (start_date.month - fiscal_year_start) % period_months
+
+    period = (schedule.month - schedule.month[0] + offset) // period_months
+    starts = np.flatnonzero(np.diff(period, prepend=-1))
+    ends = np.append(starts[1:], len(period)) - 1
+
+    payments = np.add.reduceat(schedule.payment, starts)
+    interest = np.add.reduceat(schedule.interest, starts)
+    principal = np.add.reduceat(schedule.principal, starts)
+
+    columns = {PERIOD_LABELS.get(period_months, "Periodo"): period[starts] + 1}
+    if start_date is not None:
+        dates = payment_dates(start_date, len(schedule))
+        columns["Desde"] = pd.to_datetime(dates[starts])
+        columns["Hasta"] = pd.to_datetime(dates[ends])
+    columns.update(
+        {
+            "Pagos Totales (€)": payments,
+            "Intereses (€)": interest,
+            "Amortización Capital (€)": principal,
+            "Pendiente (€)": schedule.balance[ends],
+            "Pagos Acumulados (€)": np.cumsum(payments),
+            "Intereses Acumulados (€)": np.cumsum(interest),
+            "Capital Amortizado Acumulado (€)": np.cumsum(principal),
+        }
+    )
+
+    return pd.DataFrame(columns)
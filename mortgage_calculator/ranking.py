@@ -0,0 +1,288 @@
+"""
+Frontera de Pareto y top-k en streaming para clasificar ofertas.
+
+Todos los criterios se minimizan (cuota, coste total, gastos iniciales...).
+Una oferta está dominada si otra es igual o mejor en todos los criterios y
+estrictamente mejor en alguno. rank_offers recorre los escenarios por bloques
+y solo conserva la frontera y las k mejores ofertas, no todos los resultados.
+"""
+
+import heapq
+from dataclasses import dataclass
+from itertools import count, islice
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+import numpy as np
+
+from .batch import MortgageBatch
+from .models import MortgageResults
+
+T = TypeVar("T")
+
+# pareto_front: puntos de cada bloque y comparaciones máximas por operación
+BLOCK_SIZE = 1024
+MAX_CELLS = 4_000_000
+
+
+def pareto_front_2d(x, y) -> np.ndarray:
+    """
+    Índices de los puntos no dominados en dos criterios, en O(n log n).
+
+    Tras ordenar por (x, y), un punto está dominado si algún punto distinto
+    anterior tiene y menor o igual: basta el mínimo acumulado de y.
+
+    Args:
+        x: Primer criterio
+        y: Segundo criterio
+
+    Returns:
+        Índices (en el orden original) de los puntos de la frontera
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if not len(x):
+        return np.zeros(0, dtype=np.int64)
+
+    order = np.lexsort((y, x))
+    xs, ys = x[order], y[order]
+
+    # Los puntos idénticos no se dominan entre sí: se comparan desde el primero del grupo
+    new_group = np.ones(len(xs), dtype=bool)
+    new_group[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(xs)), 0))
+
+    previous_min = np.concatenate([[np.inf], np.minimum.accumulate(ys)[:-1]])
+    dominated = previous_min[group_start] <= ys
+
+    return np.sort(order[~dominated])
+
+
+def pareto_front(points) -> np.ndarray:
+    """
+    Índices de los puntos no dominados con cualquier número de criterios.
+
+    Los puntos se ordenan de forma que solo puedan estar dominados por puntos
+    anteriores. Los no dominados del primer bloque pendiente son de la
+    frontera, y cada bloque elimina de golpe todo lo que domina, así que con
+    fronteras pequeñas casi todos los puntos se descartan en pocas pasadas. Con
+    dos criterios se usa pareto_front_2d.
+
+    Args:
+        points: Array (n, criterios)
+
+    Returns:
+        Índices (en el orden original) de los puntos de la frontera
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2:
+        raise ValueError("points debe ser un array (n, criterios)")
+    if points.shape[1] == 2:
+        return pareto_front_2d(points[:, 0], points[:, 1])
+
+    # Por suma y después lexicográfico: quien domina siempre va antes, y los
+    # puntos de suma pequeña (los que más descartan) se procesan primero
+    remaining = np.lexsort(np.vstack([points.T[::-1], points.sum(axis=1)]))
+    front = []
+
+    while remaining.size:
+        # Los no dominados dentro del primer bloque pendiente son de la frontera
+        block = remaining[:BLOCK_SIZE]
+        values = points[block]
+        within = _dominates(values[:, None, :], values[None, :, :])
+        new = block[~np.triu(within, k=1).any(axis=0)]
+        front.append(new)
+
+        # Se descarta del resto todo lo que dominan, en grupos de memoria acotada
+        rest = remaining[BLOCK_SIZE:]
+        done = 0
+        while done < len(new) and rest.size:
+            step = max(1, MAX_CELLS // len(rest))
+            group = points[new[done : done + step]]
+            rest = rest[~_dominates(group[:, None, :], points[rest][None, :, :]).any(axis=0)]
+            done += step
+        remaining = rest
+
+    return np.sort(np.concatenate(front)) if front else np.zeros(0, dtype=np.int64)
+
+
+def _dominates(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Si a domina a b (todos los criterios menores o iguales y alguno menor)."""
+    return (a <= b).all(axis=-1) & (a < b).any(axis=-1)
+
+
+class TopK(Generic[T]):
+    """
+    Los k elementos con mayor clave de un flujo, en memoria O(k).
+
+    Usa un montículo de mínimos: cada elemento nuevo solo entra si supera al
+    peor de los guardados. Con empates se conserva el que llegó antes.
+    """
+
+    def __init__(self, k: int, key: Callable[[T], float]):
+        if k <= 0:
+            raise ValueError("k debe ser positivo")
+        self.k = k
+        self.key = key
+        self._heap: List[Any] = []
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> float:
+        """Clave mínima para entrar (-inf mientras no haya k elementos)."""
+        return self._heap[0][0] if len(self._heap) == self.k else -np.inf
+
+    def push(self, item: T, key: Optional[float] = None) -> None:
+        """Añade un elemento (key evita recalcular la clave si ya se conoce)."""
+        key = self.key(item) if key is None else key
+        # El contador negativo hace que, a igual clave, se descarte antes el más reciente
+        entry = (key, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Añade varios elementos."""
+        for item in items:
+            self.push(item)
+
+    def items(self) -> List[T]:
+        """Elementos guardados de mayor a menor clave."""
+        return [entry[2] for entry in sorted(self._heap, reverse=True, key=lambda e: e[:2])]
+
+
+@dataclass(frozen=True)
+class RankedOffer:
+    """Oferta de la lista corta con sus criterios de clasificación."""
+
+    name: str
+    monthly_payment: float  # Cuota mensual (con bonificaciones si las tiene) (€)
+    total_real_cost: float  # Total a pagar más costes de bonificaciones (€)
+    upfront_costs: float  # Gastos iniciales (€)
+    real_savings: float  # Ahorro real de las bonificaciones (0 si no tiene) (€)
+    results: MortgageResults
+
+    @property
+    def criteria(self) -> tuple:
+        """Criterios que se minimizan en la frontera."""
+        return (self.monthly_payment, self.total_real_cost, self.upfront_costs)
+
+
+@dataclass
+class OfferShortlist:
+    """Resultado de rank_offers."""
+
+    frontier: List[RankedOffer]  # Ofertas no dominadas, de menor a mayor cuota
+    top: List[RankedOffer]  # Mejores ofertas por ahorro real, de mayor a menor
+    processed: int  # Escenarios evaluados
+
+
+def _ranked_offers(
+    names: List[str], upfront: np.ndarray, batch: MortgageBatch, indices: np.ndarray
+) -> List[RankedOffer]:
+    """Calcula los resultados completos (con TAE) solo de las filas seleccionadas."""
+    subset = MortgageBatch(**{name: getattr(batch, name)[indices] for name in batch.FIELDS})
+    results = subset.calculate()
+    has_bonus = subset.calculate_total_bonus() > 0
+
+    offers = []
+    for row, index in enumerate(indices):
+        mortgage_results = results.row(row)
+        with_bonus = bool(has_bonus[row])
+        total_paid = (
+            mortgage_results.total_paid_with_bonus
+            if with_bonus
+            else mortgage_results.total_paid_without_bonus
+        )
+        offers.append(
+            RankedOffer(
+                name=names[index],
+                monthly_payment=(
+                    mortgage_results.monthly_payment_with_bonus
+                    if with_bonus
+                    else mortgage_results.monthly_payment_without_bonus
+                ),
+                total_real_cost=total_paid + mortgage_results.total_bonus_costs,
+                upfront_costs=float(upfront[index]),
+                real_savings=mortgage_results.real_savings if with_bonus else 0.0,
+                results=mortgage_results,
+            )
+        )
+
+    return offers
+
+
+def rank_offers(
+    scenarios: Iterable[Dict[str, Any]], top_k: int = 10, chunk_size: int = 10_000
+) -> OfferShortlist:
+    """
+    Obtiene la frontera de Pareto y las top_k ofertas por ahorro real.
+
+    La frontera se calcula sobre (cuota mensual, coste real total, gastos
+    iniciales). Cada bloque se calcula con MortgageBatch sin TAE; solo las
+    filas que entran en la frontera o en el top-k se calculan completas.
+
+    Args:
+        scenarios: Iterable de diccionarios con 'nombre', 'data' (MortgageData) y
+            opcionalmente 'gastos_iniciales' (€, 0 por defecto)
+        top_k: Número de ofertas del ranking por ahorro real
+        chunk_size: Escenarios por bloque
+
+    Returns:
+        OfferShortlist con la frontera y el ranking
+    """
+    if chunk_size <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+
+    top: TopK[RankedOffer] = TopK(top_k, key=lambda offer: offer.real_savings)
+    frontier: List[RankedOffer] = []
+    processed = 0
+    iterator = iter(scenarios)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        processed += len(chunk)
+
+        names = [scenario["nombre"] for scenario in chunk]
+        upfront = np.array([float(scenario.get("gastos_iniciales", 0.0)) for scenario in chunk])
+        batch = MortgageBatch.from_mortgage_data(scenario["data"] for scenario in chunk)
+        results = batch.calculate(effective_rates=False)
+        has_bonus = batch.calculate_total_bonus() > 0
+
+        total_paid = np.where(
+            has_bonus, results.total_paid_with_bonus, results.total_paid_without_bonus
+        )
+        points = np.column_stack(
+            [
+                np.where(
+                    has_bonus,
+                    results.monthly_payment_with_bonus,
+                    results.monthly_payment_without_bonus,
+                ),
+                total_paid + results.total_bonus_costs,
+                upfront,
+            ]
+        )
+        savings = np.where(has_bonus, results.real_savings, 0.0)
+
+        # Candidatos del bloque: su propia frontera y sus k mejores por encima del umbral
+        chunk_front = pareto_front(points)
+        best = np.argsort(-savings, kind="stable")[:top_k]
+        best = best[savings[best] > top.threshold]
+        selected = np.union1d(chunk_front, best)
+        offers = dict(zip(selected.tolist(), _ranked_offers(names, upfront, batch, selected)))
+
+        merged = frontier + [offers[i] for i in chunk_front.tolist()]
+        keep = pareto_front([offer.criteria for offer in merged])
+        frontier = [merged[i] for i in keep]
+
+        for i in best.tolist():
+            top.push(offers[i], key=float(savings[i]))
+
+    frontier.sort(key=lambda offer: offer.criteria)
+    return OfferShortlist(frontier=frontier, top=top.items(), processed=processed)
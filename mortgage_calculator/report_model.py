@@ -0,0 +1,832 @@
+"""
+Modelo de reporte independiente del formato de salida.
+
+ReportBuilder construye el contenido de cada hoja del análisis como un
+DataFrame. El ReportModel resultante se puede escribir con cualquier
+ReportWriter: Excel (excel_generator.ExcelReportWriter), CSV, JSON o Parquet.
+Los formatos de datos no necesitan fórmulas, así que usan tables(), donde las
+celdas que en Excel se calculan con fórmulas llevan su valor ya calculado.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+
+from .breakeven import break_even_cost
+from .calculator import MortgageCalculator
+from .models import MortgageData, MortgageResults
+from .writers import ParquetRowWriter, RowWriter, open_row_writer
+
+AMORTIZATION_LABELS = {
+    "month": "Mes",
+    "payment": "Cuota (€)",
+    "interest": "Intereses (€)",
+    "principal": "Amortización (€)",
+    "balance": "Pendiente (€)",
+}
+
+# Celdas que en Excel se sustituyen: hoja -> celda -> (valor, formato numérico)
+FormulaCells = Dict[str, Dict[str, Tuple[Any, Optional[str]]]]
+
+
+def table_name(sheet_name: str) -> str:
+    """Clave ASCII de una hoja ("Amortización SIN Bonif." -> "amortizacion_sin_bonif")."""
+    ascii_name = unicodedata.normalize("NFKD", sheet_name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", ascii_name.lower()).strip("_")
+
+
+def _cell_position(coordinate: str) -> Tuple[int, int]:
+    """Posición (fila, columna) en el DataFrame de una celda de la hoja (fila 1 = encabezados)."""
+    letter, row = coordinate_from_string(coordinate)
+    return row - 2, column_index_from_string(letter) - 1
+
+
+@dataclass
+class ReportModel:
+    """Contenido completo de un reporte."""
+
+    sheets: Dict[str, pd.DataFrame]  # Contenido de cada hoja, en orden
+    formulas: FormulaCells  # Fórmulas y formatos que solo aplica Excel
+    values: Dict[str, Dict[str, Any]]  # Valor calculado de las celdas que en Excel son fórmulas
+    results: MortgageResults
+
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        """Hojas con los valores calculados en lugar de las fórmulas."""
+        tables = {}
+        for sheet_name, df in self.sheets.items():
+            cells = self.values.get(sheet_name)
+            if cells:
+                df = df.astype(object)
+                for coordinate, value in cells.items():
+                    df.iat[_cell_position(coordinate)] = value
+            tables[sheet_name] = df
+        return tables
+
+
+class ReportBuilder:
+    """Construye el contenido de un reporte a partir de los datos de la hipoteca."""
+
+    def __init__(
+        self, mortgage_data: MortgageData, calculator: Optional[MortgageCalculator] = None
+    ):
+        self.data = mortgage_data
+        self.calculator = calculator or MortgageCalculator(mortgage_data)
+        self.results: Optional[MortgageResults] = None
+
+    def build(self) -> ReportModel:
+        """Realiza los cálculos y construye el modelo del reporte."""
+        self.results = self.calculator.calculate()
+        sheets = self._create_sheets()
+
+        return ReportModel(
+            sheets=sheets,
+            formulas=self._formula_cells(sheets),
+            values=self._computed_values(sheets),
+            results=self.results,
+        )
+
+    def _create_sheets(self) -> Dict[str, pd.DataFrame]:
+        """Construye el contenido de todas las hojas del reporte, en orden."""
+        sheets = {
+            "Datos de Entrada": self._create_input_sheet(),
+            "Resumen": self._create_summary_sheet(),
+            "Comparación": self._create_comparison_sheet(),
+            "Amortización SIN Bonif.": self._create_amortization_sheet(with_bonus=False),
+            "Amortización CON Bonif.": self._create_amortization_sheet(with_bonus=True),
+            "Análisis Bonificaciones": self._create_bonus_analysis_sheet(),
+            "Análisis Individual Seguros": self._create_insurance_individual_analysis_sheet(),
+        }
+        return {name: df for name, df in sheets.items() if df is not None}
+
+    def _create_input_sheet(self) -> pd.DataFrame:
+        """Crea la hoja con los datos de entrada."""
+        data = {
+            "Concepto": [
+                "▼ DATOS DE LA HIPOTECA",
+                "Capital prestado (€)",
+                "Tasa de interés anual (%)",
+                "Plazo (años)",
+                "",
+                "▼ BONIFICACIONES",
+                "Bonificación por nómina (%)",
+                "Bonificación por seguro de vida (%)",
+                "Bonificación por seguro de hogar (%)",
+                "Bonificación por tarjeta (%)",
+                "Otras bonificaciones (%)",
+                "",
+                "▼ COSTES DE BONIFICACIONES",
+                "Coste mensual seguro de vida (€)",
+                "Coste mensual seguro de hogar (€)",
+                "Cuota anual de la tarjeta (€)",
+                "Otros costes mensuales (€)",
+            ],
+            "Valor": [
+                "",
+                self.data.capital,
+                self.data.interest_rate,
+                self.data.years,
+                "",
+                "",
+                self.data.payroll_bonus,
+                self.data.life_insurance_bonus,
+                self.data.home_insurance_bonus,
+                self.data.card_bonus,
+                self.data.other_bonus,
+                "",
+                "",
+                self.data.life_insurance_cost_monthly,
+                self.data.home_insurance_cost_monthly,
+                self.data.card_annual_fee,
+                self.data.other_costs_monthly,
+            ],
+        }
+
+        return pd.DataFrame(data)
+
+    def _create_summary_sheet(self) -> pd.DataFrame:
+        """Crea la hoja resumen con fórmulas dinámicas."""
+        # Esta hoja se llenará completamente con fórmulas en _formula_cells
+        data = {
+            "Concepto": [
+                "▼ CÁLCULOS AUTOMÁTICOS",
+                "Meses totales",
+                "Bonificación total (%)",
+                "Tipo efectivo sin bonif. (%)",
+                "Tipo efectivo con bonif. (%)",
+                "Cuota mensual SIN bonificaciones (€)",
+                "Cuota mensual CON bonificaciones (€)",
+                "Total a pagar SIN bonificaciones (€)",
+                "Total a pagar CON bonificaciones (€)",
+                "Intereses SIN bonificaciones (€)",
+                "Intereses CON bonificaciones (€)",
+                "Costes bonificaciones (€)",
+                "Ahorro en intereses (€)",
+                "Ahorro real (€)",
+                "¿Vale la pena?",
+                "Porcentaje de ahorro (%)",
+            ],
+            "Fórmula/Valor": [""] * 16,  # Se llenarán con fórmulas
+        }
+
+        return pd.DataFrame(data)
+
+    def _create_comparison_sheet(self) -> Optional[pd.DataFrame]:
+        """Crea una hoja de comparación detallada."""
+        if not self.results:
+            return None
+
+        data = {
+            "Concepto": [
+                "Capital prestado",
+                "Tasa de interés",
+                "Bonificaciones aplicadas",
+                "Tasa con bonificaciones",
+                "Plazo (meses)",
+                "",
+                "Cuota mensual",
+                "Total intereses",
+                "Total a pagar",
+                "Costes bonificaciones",
+                "Coste real total",
+            ],
+            "Sin Bonificaciones": [
+                f"{self.data.capital:,.2f} €",
+                f"{self.data.interest_rate:.2f}%",
+                "0.00%",
+                f"{self.data.interest_rate:.2f}%",
+                self.data.years * 12,
+                "",
+                f"{self.results.monthly_payment_without_bonus:,.2f} €",
+                f"{self.results.total_interest_without_bonus:,.2f} €",
+                f"{self.results.total_paid_without_bonus:,.2f} €",
+                "0.00 €",
+                f"{self.results.total_paid_without_bonus:,.2f} €",
+            ],
+            "Con Bonificaciones": [
+                f"{self.data.capital:,.2f} €",
+                f"{self.data.interest_rate:.2f}%",
+                f"{self.calculator.calculate_total_bonus():.2f}%",
+                f"{max(0, self.data.interest_rate - self.calculator.calculate_total_bonus()):.2f}%",
+                self.data.years * 12,
+                "",
+                f"{self.results.monthly_payment_with_bonus:,.2f} €",
+                f"{self.results.total_interest_with_bonus:,.2f} €",
+                f"{self.results.total_paid_with_bonus:,.2f} €",
+                f"{self.results.total_bonus_costs:,.2f} €",
+                f"{self.results.total_paid_with_bonus + self.results.total_bonus_costs:,.2f} €",
+            ],
+            "Diferencia": [
+                "0.00 €",
+                "0.00%",
+                f"{self.calculator.calculate_total_bonus():.2f}%",
+                f"{-self.calculator.calculate_total_bonus():.2f}%",
+                "0",
+                "",
+                f"{self.results.monthly_payment_without_bonus - self.results.monthly_payment_with_bonus:,.2f} €",
+                f"{self.results.total_interest_without_bonus - self.results.total_interest_with_bonus:,.2f} €",
+                f"{self.results.total_paid_without_bonus - self.results.total_paid_with_bonus:,.2f} €",
+                f"-{self.results.total_bonus_costs:,.2f} €",
+                f"{self.results.real_savings:,.2f} €",
+            ],
+        }
+
+        return pd.DataFrame(data)
+
+    def _create_amortization_sheet(self, with_bonus: bool = False) -> pd.DataFrame:
+        """Crea la hoja con la tabla de amortización."""
+        rate = self.data.interest_rate
+        if with_bonus:
+            rate = max(0, rate - self.calculator.calculate_total_bonus())
+
+        schedule = self.calculator.calculate_amortization_schedule(rate)
+
+        return schedule.to_frame(labels=AMORTIZATION_LABELS, decimals=2)
+
+    def _create_bonus_analysis_sheet(self) -> Optional[pd.DataFrame]:
+        """Crea una hoja con análisis detallado de bonificaciones."""
+        if not self.results:
+            return None
+
+        months = self.data.years * 12
+        yearly_card = self.data.card_annual_fee
+        monthly_other = self.data.other_costs_monthly
+
+        data = {
+            "Bonificación": [
+                "Domiciliación de nómina",
+                "Seguro de vida",
+                "Seguro de hogar",
+                "Uso de tarjeta",
+                "Otras bonificaciones",
+                "",
+                "TOTAL BONIFICACIONES",
+            ],
+            "Reducción de Tipo (%)": [
+                f"{self.data.payroll_bonus}%",
+                f"{self.data.life_insurance_bonus}%",
+                f"{self.data.home_insurance_bonus}%",
+                f"{self.data.card_bonus}%",
+                f"{self.data.other_bonus}%",
+                "",
+                f"{self.calculator.calculate_total_bonus()}%",
+            ],
+            "Coste Mensual (€)": [
+                0,
+                self.data.life_insurance_cost_monthly,
+                self.data.home_insurance_cost_monthly,
+                yearly_card / 12,
+                monthly_other,
+                "",
+                self.data.life_insurance_cost_monthly
+                + self.data.home_insurance_cost_monthly
+                + (yearly_card / 12)
+                + monthly_other,
+            ],
+            "Coste Total (€)": [
+                0,
+                self.data.life_insurance_cost_monthly * months,
+                self.data.home_insurance_cost_monthly * months,
+                yearly_card * self.data.years,
+                monthly_other * months,
+                "",
+                self.results.total_bonus_costs,
+            ],
+            "Ahorro en Intereses (€)": [
+                "-",
+                "-",
+                "-",
+                "-",
+                "-",
+                "",
+                self.results.total_interest_without_bonus - self.results.total_interest_with_bonus,
+            ],
+        }
+
+        return pd.DataFrame(data)
+
+    def _create_insurance_individual_analysis_sheet(self) -> Optional[pd.DataFrame]:
+        """Crea una hoja con análisis individual de cada seguro."""
+        if not self.results:
+            return None
+
+        # Análisis seguro de vida
+        life_analysis = self._analyze_individual_insurance(
+            bonus_rate=self.data.life_insurance_bonus,
+            monthly_cost=self.data.life_insurance_cost_monthly,
+            insurance_name="Seguro de Vida",
+        )
+
+        # Análisis seguro de hogar
+        home_analysis = self._analyze_individual_insurance(
+            bonus_rate=self.data.home_insurance_bonus,
+            monthly_cost=self.data.home_insurance_cost_monthly,
+            insurance_name="Seguro de Hogar",
+        )
+
+        # Calcular punto de equilibrio para cada seguro
+        life_breakeven = self._calculate_insurance_breakeven(self.data.life_insurance_bonus)
+        home_breakeven = self._calculate_insurance_breakeven(self.data.home_insurance_bonus)
+
+        data = {
+            "Concepto": [
+                "▼ SEGURO DE VIDA",
+                "Bonificación aplicada (%)",
+                "Coste mensual actual (€)",
+                "Coste total durante hipoteca (€)",
+                "Ahorro en intereses (€)",
+                "Ahorro neto (€)",
+                "¿Vale la pena?",
+                "",
+                "Análisis de rentabilidad:",
+                "Coste mensual máximo rentable (€)",
+                "Coste anual máximo rentable (€)",
+                "Coste total máximo rentable (€)",
+                "",
+                "▼ SEGURO DE HOGAR",
+                "Bonificación aplicada (%)",
+                "Coste mensual actual (€)",
+                "Coste total durante hipoteca (€)",
+                "Ahorro en intereses (€)",
+                "Ahorro neto (€)",
+                "¿Vale la pena?",
+                "",
+                "Análisis de rentabilidad:",
+                "Coste mensual máximo rentable (€)",
+                "Coste anual máximo rentable (€)",
+                "Coste total máximo rentable (€)",
+                "",
+                "▼ COMPARACIÓN",
+                "Mejor seguro por rentabilidad",
+                "Diferencia de ahorro (€)",
+                "",
+                "▼ RECOMENDACIONES",
+                "Seguro de vida",
+                "Seguro de hogar",
+            ],
+            "Valor": [
+                "",
+                f"{self.data.life_insurance_bonus}%",
+                self.data.life_insurance_cost_monthly,
+                life_analysis["total_cost"],
+                life_analysis["interest_savings"],
+                life_analysis["net_savings"],
+                "SÍ ✓" if life_analysis["is_worth_it"] else "NO ✗",
+                "",
+                "",
+                life_breakeven["max_monthly_cost"],
+                life_breakeven["max_annual_cost"],
+                life_breakeven["max_total_cost"],
+                "",
+                "",
+                f"{self.data.home_insurance_bonus}%",
+                self.data.home_insurance_cost_monthly,
+                home_analysis["total_cost"],
+                home_analysis["interest_savings"],
+                home_analysis["net_savings"],
+                "SÍ ✓" if home_analysis["is_worth_it"] else "NO ✗",
+                "",
+                "",
+                home_breakeven["max_monthly_cost"],
+                home_breakeven["max_annual_cost"],
+                home_breakeven["max_total_cost"],
+                "",
+                "",
+                self._get_best_insurance(life_analysis, home_analysis),
+                abs(life_analysis["net_savings"] - home_analysis["net_savings"]),
+                "",
+                "",
+                self._get_insurance_recommendation(
+                    life_analysis, self.data.life_insurance_cost_monthly, life_breakeven
+                ),
+                self._get_insurance_recommendation(
+                    home_analysis, self.data.home_insurance_cost_monthly, home_breakeven
+                ),
+            ],
+        }
+
+        return pd.DataFrame(data)
+
+    def _analyze_individual_insurance(
+        self, bonus_rate: float, monthly_cost: float, insurance_name: str
+    ) -> dict:
+        """Analiza la rentabilidad de un seguro individual."""
+        # Crear datos temporales solo con este seguro
+        temp_data = MortgageData(
+            capital=self.data.capital,
+            interest_rate=self.data.interest_rate,
+            years=self.data.years,
+            payroll_bonus=0.0,
+            life_insurance_bonus=bonus_rate if "Vida" in insurance_name else 0.0,
+            home_insurance_bonus=bonus_rate if "Hogar" in insurance_name else 0.0,
+            card_bonus=0.0,
+            other_bonus=0.0,
+            life_insurance_cost_monthly=monthly_cost if "Vida" in insurance_name else 0.0,
+            home_insurance_cost_monthly=monthly_cost if "Hogar" in insurance_name else 0.0,
+            card_annual_fee=0.0,
+            other_costs_monthly=0.0,
+        )
+
+        calculator = MortgageCalculator(temp_data)
+        results = calculator.calculate()
+
+        months = self.data.years * 12
+        total_cost = monthly_cost * months
+        interest_savings = results.total_interest_without_bonus - results.total_interest_with_bonus
+        net_savings = interest_savings - total_cost
+
+        return {
+            "total_cost": total_cost,
+            "interest_savings": interest_savings,
+            "net_savings": net_savings,
+            "is_worth_it": net_savings > 0,
+            "monthly_cost": monthly_cost,
+        }
+
+    def _calculate_insurance_breakeven(self, bonus_rate: float) -> dict:
+        """Calcula el coste máximo para que un seguro valga la pena."""
+        if bonus_rate == 0:
+            return {"max_monthly_cost": 0.0, "max_annual_cost": 0.0, "max_total_cost": 0.0}
+
+        # Ahorro en intereses con esta bonificación sola y sin costes
+        break_even = break_even_cost(
+            MortgageData(
+                capital=self.data.capital,
+                interest_rate=self.data.interest_rate,
+                years=self.data.years,
+                life_insurance_bonus=bonus_rate,
+            )
+        )
+        max_monthly_cost = break_even.monthly_cost
+        max_annual_cost = break_even.annual_cost
+        max_total_cost = break_even.total_cost
+
+        return {
+            "max_monthly_cost": round(max_monthly_cost, 2),
+            "max_annual_cost": round(max_annual_cost, 2),
+            "max_total_cost": round(max_total_cost, 2),
+        }
+
+    def _get_best_insurance(self, life_analysis: dict, home_analysis: dict) -> str:
+        """Determina cuál seguro es más rentable."""
+        if life_analysis["net_savings"] > home_analysis["net_savings"]:
+            if life_analysis["is_worth_it"]:
+                return "Seguro de Vida (más rentable)"
+            else:
+                return "Ninguno es rentable"
+        elif home_analysis["net_savings"] > life_analysis["net_savings"]:
+            if home_analysis["is_worth_it"]:
+                return "Seguro de Hogar (más rentable)"
+            else:
+                return "Ninguno es rentable"
+        else:
+            if life_analysis["is_worth_it"]:
+                return "Ambos igual de rentables"
+            else:
+                return "Ninguno es rentable"
+
+    def _get_insurance_recommendation(
+        self, analysis: dict, current_cost: float, breakeven: dict
+    ) -> str:
+        """Genera una recomendación para el seguro."""
+        if analysis["is_worth_it"]:
+            margin = breakeven["max_monthly_cost"] - current_cost
+            margin_pct = (margin / breakeven["max_monthly_cost"]) * 100
+            return f"✓ Contratar (margen: {margin:.2f}€/mes = {margin_pct:.1f}%)"
+        else:
+            excess = current_cost - breakeven["max_monthly_cost"]
+            return f"✗ No contratar (excede punto equilibrio en {excess:.2f}€/mes)"
+
+    def _formula_cells(self, sheets: Dict[str, pd.DataFrame]) -> FormulaCells:
+        """Fórmulas dinámicas para que las hojas se actualicen automáticamente."""
+        formulas: FormulaCells = {}
+
+        # Formatear porcentajes en la hoja de entrada
+        if "Datos de Entrada" in sheets:
+            values = sheets["Datos de Entrada"]["Valor"].tolist()
+            cells = formulas["Datos de Entrada"] = {}
+            # B3 = Interés, B7-B11 = Bonificaciones (dividir por 100 para formato %)
+            percentage_cells = ["B3", "B7", "B8", "B9", "B10", "B11"]
+            for cell_addr in percentage_cells:
+                # Fila 1 = encabezados: la celda Bn es el valor n - 2
+                value = values[int(cell_addr[1:]) - 2]
+                if value is not None and isinstance(value, (int, float)):
+                    cells[cell_addr] = (value / 100, "0.00%")  # Convertir a decimal
+
+        # Referencias a celdas de entrada (hoja "Datos de Entrada")
+        # B2 = Capital, B3 = Interés, B4 = Plazo
+        # B7-B11 = Bonificaciones, B14-B17 = Costes
+
+        # Hoja de Resumen
+        if "Resumen" in sheets:
+            cells = formulas["Resumen"] = {}
+
+            # Referencias a datos de entrada
+            input_sheet = "'Datos de Entrada'"
+
+            # Estructura de la hoja Resumen:
+            # A1="Concepto", B1="Fórmula/Valor" (ENCABEZADO)
+            # A2="▼ CÁLCULOS AUTOMÁTICOS", B2=vacío
+            # A3="Meses totales", B3=fórmula -> debe leer de 'Datos de Entrada'!B5 (Plazo)
+            # A4="Bonificación total (%)", B4=fórmula -> debe sumar B8:B12 de Datos de Entrada
+            # A5="Tipo efectivo sin bonif. (%)", B5=fórmula -> debe leer B4 de Datos de Entrada
+            # A6="Tipo efectivo con bonif. (%)", B6=fórmula -> B5-B4 (tipo - bonificaciones)
+            # A7="Cuota mensual SIN bonificaciones (€)", B7=fórmula -> usa B5 (tipo sin bonif)
+            # A8="Cuota mensual CON bonificaciones (€)", B8=fórmula -> usa B6 (tipo con bonif)
+            # A9="Total a pagar SIN bonificaciones (€)", B9=fórmula
+            # A10="Total a pagar CON bonificaciones (€)", B10=fórmula
+            # A11="Intereses SIN bonificaciones (€)", B11=fórmula
+            # A12="Intereses CON bonificaciones (€)", B12=fórmula
+            # A13="Costes bonificaciones (€)", B13=fórmula
+            # A14="Ahorro en intereses (€)", B14=fórmula
+            # A15="Ahorro real (€)", B15=fórmula
+            # A16="¿Vale la pena?", B16=fórmula
+            # A17="Porcentaje de ahorro (%)", B17=fórmula
+
+            # DATOS DE ENTRADA - Referencias:
+            # B3 = Capital (fila 3)
+            # B4 = Interés (fila 4)
+            # B5 = Plazo años (fila 5)
+            # B8 = Bonif nómina (fila 8)
+            # B9 = Bonif vida (fila 9)
+            # B10 = Bonif hogar (fila 10)
+            # B11 = Bonif tarjeta (fila 11)
+            # B12 = Otras bonif (fila 12)
+            # B15 = Coste vida (fila 15)
+            # B16 = Coste hogar (fila 16)
+            # B17 = Coste tarjeta anual (fila 17)
+            # B18 = Otros costes (fila 18)
+
+            # Calcular meses totales (fila 3) -> Plazo * 12
+            cells["B3"] = (f"={input_sheet}!B5*12", "0")
+
+            # Total bonificaciones (fila 4) -> Suma B8+B9+B10+B11+B12
+            cells["B4"] = (
+                f"={input_sheet}!B8+{input_sheet}!B9+{input_sheet}!B10+{input_sheet}!B11+{input_sheet}!B12",
+                "0.00%",
+            )
+
+            # Tipo efectivo sin bonificaciones (fila 5) -> Interés de B4
+            cells["B5"] = (f"={input_sheet}!B4", "0.00%")
+
+            # Tipo efectivo con bonificaciones (fila 6) -> B5 - B4 (tipo - bonificaciones)
+            cells["B6"] = ("=MAX(0, B5-B4)", "0.00%")
+
+            # Cuota mensual SIN bonificaciones (fila 7) -> Capital en B3, usa tipo B5, meses B3
+            cells["B7"] = (
+                f"=IF(B5=0, {input_sheet}!B3/B3, {input_sheet}!B3*(B5/12)*(1+B5/12)^B3/((1+B5/12)^B3-1))",
+                "#,##0.00",
+            )
+
+            # Cuota mensual CON bonificaciones (fila 8) -> Capital en B3, usa tipo B6, meses B3
+            cells["B8"] = (
+                f"=IF(B6=0, {input_sheet}!B3/B3, {input_sheet}!B3*(B6/12)*(1+B6/12)^B3/((1+B6/12)^B3-1))",
+                "#,##0.00",
+            )
+
+            # Total a pagar sin bonificaciones (fila 9) -> B7 * B3
+            cells["B9"] = ("=B7*B3", "#,##0.00")
+
+            # Total a pagar con bonificaciones (fila 10) -> B8 * B3
+            cells["B10"] = ("=B8*B3", "#,##0.00")
+
+            # Intereses sin bonificaciones (fila 11) -> B9 - Capital (B3 de Datos)
+            cells["B11"] = (f"=B9-{input_sheet}!B3", "#,##0.00")
+
+            # Intereses con bonificaciones (fila 12) -> B10 - Capital (B3 de Datos)
+            cells["B12"] = (f"=B10-{input_sheet}!B3", "#,##0.00")
+
+            # Costes de bonificaciones (fila 13) -> (B15+B16+B18)*meses + B17*años
+            cells["B13"] = (
+                f"=({input_sheet}!B15+{input_sheet}!B16+{input_sheet}!B18)*B3+{input_sheet}!B17*{input_sheet}!B5",
+                "#,##0.00",
+            )
+
+            # Ahorro nominal (fila 14) -> B11 - B12
+            cells["B14"] = ("=B11-B12", "#,##0.00")
+
+            # Ahorro real (fila 15) -> B14 - B13
+            cells["B15"] = ("=B14-B13", "#,##0.00")
+
+            # ¿Vale la pena? (fila 16) -> Si B15 > 0
+            cells["B16"] = ('=IF(B15>0,"SÍ ✓","NO ✗")', None)
+
+            # Porcentaje de ahorro (fila 17) -> (B15 / B9) * 100
+            cells["B17"] = ("=IF(B9=0,0,(B15/B9)*100)", "0.00")
+
+        # Hoja de Análisis de Bonificaciones
+        if "Análisis Bonificaciones" in sheets:
+            cells = formulas["Análisis Bonificaciones"] = {}
+            input_sheet = "'Datos de Entrada'"
+
+            # Total bonificaciones -> B8+B9+B10+B11+B12
+            cells["B7"] = (
+                f"={input_sheet}!B8+{input_sheet}!B9+{input_sheet}!B10+{input_sheet}!B11+{input_sheet}!B12",
+                None,
+            )
+
+            # Coste mensual total -> B15 (vida) + B16 (hogar) + B17/12 (tarjeta) + B18 (otros)
+            cells["C7"] = (
+                f"={input_sheet}!B15+{input_sheet}!B16+{input_sheet}!B17/12+{input_sheet}!B18",
+                "#,##0.00",
+            )
+
+            # Coste total -> (B15+B16+B18)*Plazo*12 + B17*Plazo
+            cells["D7"] = (
+                f"=({input_sheet}!B15+{input_sheet}!B16+{input_sheet}!B18)*{input_sheet}!B5*12+{input_sheet}!B17*{input_sheet}!B5",
+                "#,##0.00",
+            )
+
+            # Ahorro en intereses (referencia a la hoja Resumen, B14 = ahorro nominal)
+            cells["E7"] = ("=Resumen!B14", "#,##0.00")
+
+        # Hoja de Análisis Individual Seguros
+        if "Análisis Individual Seguros" in sheets:
+            cells = formulas["Análisis Individual Seguros"] = {}
+            input_sheet = "'Datos de Entrada'"
+
+            # ESTRUCTURA DE LA HOJA "Análisis Individual Seguros":
+            # Fila 1: Headers ["Concepto", "Valor"]
+            # Fila 2: "▼ SEGURO DE VIDA" (vacío)
+            # Fila 3: "Bonificación aplicada (%)" -> debe leer B9 (bonif vida)
+            # Fila 4: "Coste mensual actual (€)" -> debe leer B15 (coste vida)
+            # Fila 5: "Coste total durante hipoteca (€)" -> debe calcular B15*B5*12
+            # Fila 6: "Ahorro en intereses (€)" -> calculado por Python
+            # Fila 7: "Ahorro neto (€)" -> debe calcular B6-B5
+            # Fila 8: "¿Vale la pena?" -> debe calcular IF(B7>0, "SÍ ✓", "NO ✗")
+            # Fila 9: "" (vacío)
+            # Fila 10: "Análisis de rentabilidad:" (vacío)
+            # Fila 11: "Coste mensual máximo rentable (€)" -> calculado por Python
+            # Fila 12: "Coste anual máximo rentable (€)" -> calculado por Python
+            # Fila 13: "Coste total máximo rentable (€)" -> calculado por Python
+            # Fila 14: "" (vacío)
+            # Fila 15: "▼ SEGURO DE HOGAR" (vacío)
+            # Fila 16: "Bonificación aplicada (%)" -> debe leer B10 (bonif hogar)
+            # Fila 17: "Coste mensual actual (€)" -> debe leer B16 (coste hogar)
+            # Fila 18: "Coste total durante hipoteca (€)" -> debe calcular B16*B5*12
+            # Fila 19: "Ahorro en intereses (€)" -> calculado por Python
+            # Fila 20: "Ahorro neto (€)" -> debe calcular B19-B18
+            # Fila 21: "¿Vale la pena?" -> debe calcular IF(B20>0, "SÍ ✓", "NO ✗")
+
+            # ===== SEGURO DE VIDA =====
+            # B3: Bonificación vida -> B9 de Datos de Entrada
+            cells["B3"] = (f"={input_sheet}!B9", "0.00%")
+
+            # B4: Coste mensual vida -> B15 de Datos de Entrada
+            cells["B4"] = (f"={input_sheet}!B15", "#,##0.00")
+
+            # B5: Coste total vida -> B15 * B5 (años) * 12 meses
+            cells["B5"] = (f"={input_sheet}!B15*{input_sheet}!B5*12", "#,##0.00")
+
+            # B7: Ahorro neto vida -> Ahorro intereses (B6) - Coste total (B5)
+            cells["B7"] = ("=B6-B5", "#,##0.00")
+
+            # B8: ¿Vale la pena? -> IF ahorro neto > 0
+            cells["B8"] = ('=IF(B7>0, "SÍ ✓", "NO ✗")', None)
+
+            # ===== SEGURO DE HOGAR =====
+            # B16: Bonificación hogar -> B10 de Datos de Entrada
+            cells["B16"] = (f"={input_sheet}!B10", "0.00%")
+
+            # B17: Coste mensual hogar -> B16 de Datos de Entrada
+            cells["B17"] = (f"={input_sheet}!B16", "#,##0.00")
+
+            # B18: Coste total hogar -> B16 * B5 (años) * 12 meses
+            cells["B18"] = (f"={input_sheet}!B16*{input_sheet}!B5*12", "#,##0.00")
+
+            # B20: Ahorro neto hogar -> Ahorro intereses (B19) - Coste total (B18)
+            cells["B20"] = ("=B19-B18", "#,##0.00")
+
+            # B21: ¿Vale la pena? -> IF ahorro neto > 0
+            cells["B21"] = ('=IF(B20>0, "SÍ ✓", "NO ✗")', None)
+
+            # B29: Diferencia de ahorro -> ABS(B7 - B20)
+            cells["B29"] = ("=ABS(B7-B20)", "#,##0.00")
+
+        return formulas
+
+    def _computed_values(self, sheets: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+        """Valores de la hoja Resumen, que en Excel solo tiene fórmulas."""
+        if "Resumen" not in sheets:
+            return {}
+
+        results = self.results
+        total_bonus = self.calculator.calculate_total_bonus()
+        values = [
+            self.data.years * 12,
+            total_bonus,
+            self.data.interest_rate,
+            max(0, self.data.interest_rate - total_bonus),
+            results.monthly_payment_without_bonus,
+            results.monthly_payment_with_bonus,
+            results.total_paid_without_bonus,
+            results.total_paid_with_bonus,
+            results.total_interest_without_bonus,
+            results.total_interest_with_bonus,
+            results.total_bonus_costs,
+            results.total_interest_without_bonus - results.total_interest_with_bonus,
+            results.real_savings,
+            "SÍ ✓" if results.is_worth_it else "NO ✗",
+            results.savings_percentage,
+        ]
+        # Fila 3 = meses totales ... fila 17 = porcentaje de ahorro
+        return {"Resumen": {f"B{row}": value for row, value in enumerate(values, start=3)}}
+
+
+class ReportWriter(ABC):
+    """Base de los escritores de reportes: cada formato implementa write."""
+
+    suffix = ""  # Extensión del archivo ("" si se escribe un directorio)
+
+    @abstractmethod
+    def write(self, model: ReportModel, path: str) -> str:
+        """
+        Escribe el reporte.
+
+        Args:
+            model: Contenido del reporte
+            path: Archivo o directorio de salida
+
+        Returns:
+            Ruta absoluta de lo escrito
+        """
+
+
+class TableDirectoryWriter(ReportWriter):
+    """
+    Un archivo por hoja en el directorio de salida, escrito con los
+    RowWriter de writers (la extensión table_suffix elige el formato).
+    """
+
+    table_suffix = ""
+
+    def write(self, model: ReportModel, path: str) -> str:
+        os.makedirs(path, exist_ok=True)
+        for sheet_name, df in model.tables().items():
+            table_path = os.path.join(path, f"{table_name(sheet_name)}{self.table_suffix}")
+            with open_row_writer(table_path, [str(name) for name in df.columns]) as writer:
+                self.write_table(writer, df)
+        return os.path.abspath(path)
+
+    def write_table(self, writer: RowWriter, df: pd.DataFrame) -> None:
+        """Escribe una hoja con el escritor de su archivo (por defecto, fila a fila)."""
+        writer.write_rows(list(df.itertuples(index=False, name=None)))
+
+
+class CsvReportWriter(TableDirectoryWriter):
+    """Un CSV por hoja en el directorio de salida."""
+
+    table_suffix = ".csv"
+
+
+class JsonReportWriter(ReportWriter):
+    """Un documento JSON con las columnas y filas de cada hoja."""
+
+    suffix = ".json"
+
+    def write(self, model: ReportModel, path: str) -> str:
+        document = {
+            table_name(sheet_name): {"sheet": sheet_name, **df.to_dict(orient="split", index=False)}
+            for sheet_name, df in model.tables().items()
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False)
+        return os.path.abspath(path)
+
+
+class ParquetReportWriter(TableDirectoryWriter):
+    """
+    Un Parquet por hoja en el directorio de salida. Requiere pyarrow.
+
+    Cada hoja se escribe por columnas, de una vez: las numéricas (las tablas
+    de amortización) pasan a Arrow directamente desde sus arrays de NumPy; las
+    de texto mixto se guardan como texto, porque Parquet necesita un único
+    tipo por columna.
+    """
+
+    table_suffix = ".parquet"
+
+    def write_table(self, writer: ParquetRowWriter, df: pd.DataFrame) -> None:
+        writer.write_columns(
+            [
+                (
+                    df[name].to_numpy()
+                    if pd.api.types.is_numeric_dtype(df[name])
+                    else [str(value) for value in df[name]]
+                )
+                for name in df.columns
+            ]
+        )
+
+
+DATA_WRITERS = {
+    "csv": CsvReportWriter,
+    "json": JsonReportWriter,
+    "parquet": ParquetReportWriter,
+}
@@ -0,0 +1,224 @@
+"""
+Generación de muchos reportes en paralelo (Excel, CSV, JSON o Parquet).
+
+Los procesos del pool se crean una vez y se reutilizan para todos los
+reportes (y entre llamadas si se usa ReportPool directamente), así que
+pandas y openpyxl solo se cargan al arrancar cada proceso. A cada proceso se
+le envía el nombre del reporte y los datos como FrozenMortgageData
+empaquetado (92 bytes). Un reporte que falla no detiene el resto: su error
+queda en el resultado. Si un proceso muere, los reportes pendientes en ese
+pool se registran como fallidos y se continúa con un pool nuevo.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .excel_generator import ExcelReportWriter
+from .models import FrozenMortgageData
+from .report_model import DATA_WRITERS, ReportBuilder, ReportWriter
+from .scenarios import submit_bounded
+
+REPORT_FORMATS = ("xlsx", *DATA_WRITERS)
+
+# Argumentos de _generate_report: nombre, ruta, registro, motor y formato
+ReportTask = Tuple[str, str, bytes, str, str]
+
+
+@dataclass(frozen=True)
+class ReportOutcome:
+    """Resultado de generar un reporte."""
+
+    name: str
+    path: str  # Ruta del archivo (pedida, aunque haya fallado)
+    seconds: float  # Tiempo de generación en el proceso que lo generó
+    error: Optional[str] = None  # Tipo y mensaje de la excepción si ha fallado
+
+    @property
+    def ok(self) -> bool:
+        """Si el reporte se generó correctamente."""
+        return self.error is None
+
+
+def _report_writer(report_format: str, backend: str) -> ReportWriter:
+    """Escritor para un formato ("xlsx" usa el motor de Excel indicado)."""
+    if report_format == "xlsx":
+        return ExcelReportWriter(backend)
+    if report_format not in DATA_WRITERS:
+        raise ValueError(
+            f"Formato desconocido: {report_format} (disponibles: {', '.join(REPORT_FORMATS)})"
+        )
+    return DATA_WRITERS[report_format]()
+
+
+def _generate_report(
+    name: str, path: str, record: bytes, backend: str, report_format: str
+) -> ReportOutcome:
+    """Genera un reporte a partir de su registro binario, capturando cualquier error."""
+    start = time.perf_counter()
+    try:
+        mortgage_data = FrozenMortgageData.from_bytes(record).to_mortgage_data()
+        model = ReportBuilder(mortgage_data).build()
+        path = _report_writer(report_format, backend).write(model, path)
+    except Exception as error:
+        return ReportOutcome(
+            name, path, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+        )
+
+    return ReportOutcome(name, path, time.perf_counter() - start)
+
+
+class ReportPool:
+    """
+    Pool de procesos reutilizable para generar reportes.
+
+    Uso:
+        with ReportPool(workers=4) as pool:
+            outcomes = pool.generate(escenarios, "reportes")
+    """
+
+    def __init__(
+        self, workers: Optional[int] = None, backend: str = "openpyxl", report_format: str = "xlsx"
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.report_format = report_format
+        # Valida el formato y el motor antes de arrancar ningún proceso
+        self._suffix = _report_writer(report_format, backend).suffix
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Futures pendientes enviados al pool actual
+        self._pool_futures: Set[Future] = set()
+
+    def __enter__(self) -> "ReportPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Termina los procesos del pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._pool_futures.clear()
+
+    def generate(self, scenarios: Iterable[Dict[str, Any]], out_dir: str) -> List[ReportOutcome]:
+        """
+        Genera un reporte por escenario en out_dir (nombre.xlsx, nombre.json, o
+        un directorio nombre/ con una tabla por hoja para CSV y Parquet).
+
+        Args:
+            scenarios: Iterable de diccionarios con 'nombre' y 'data' (MortgageData)
+            out_dir: Directorio de salida (se crea si no existe)
+
+        Returns:
+            Un ReportOutcome por escenario, en el mismo orden
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        tasks = (self._task(scenario, out_dir) for scenario in scenarios)
+
+        if self.workers == 1:
+            return [
+                task if isinstance(task, ReportOutcome) else _generate_report(*task)
+                for task in tasks
+            ]
+
+        # Como mucho dos reportes pendientes por proceso
+        return [
+            self._collect(task, future)
+            for task, future in submit_bounded(self._submit, tasks, 2 * self.workers)
+        ]
+
+    def _task(self, scenario: Dict[str, Any], out_dir: str) -> Union[ReportTask, ReportOutcome]:
+        """
+        Argumentos de _generate_report para un escenario.
+
+        Si el escenario no es válido (falta una clave o los datos no se pueden
+        empaquetar) devuelve directamente el ReportOutcome fallido.
+        """
+        name = str(scenario.get("nombre", ""))
+        path = os.path.join(out_dir, f"{name}{self._suffix}")
+        try:
+            name = scenario["nombre"]
+            record = FrozenMortgageData.from_mortgage_data(scenario["data"]).to_bytes()
+        except Exception as error:
+            return ReportOutcome(name, path, 0.0, f"{type(error).__name__}: {error}")
+
+        return (name, path, record, self.backend, self.report_format)
+
+    def _submit(self, task: Union[ReportTask, ReportOutcome]) -> Future:
+        """
+        Envía una tarea al pool (un escenario ya fallido queda como resultado).
+
+        Si el pool está roto porque un proceso ha muerto, se sustituye por uno
+        nuevo y la tarea se envía a este.
+        """
+        if isinstance(task, ReportOutcome):
+            future: Future = Future()
+            future.set_result(task)
+            return future
+
+        if self._executor is not None:
+            try:
+                return self._track(self._executor.submit(_generate_report, *task))
+            except BrokenProcessPool:
+                self._discard_executor()
+
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._track(self._executor.submit(_generate_report, *task))
+
+    def _track(self, future: Future) -> Future:
+        """Registra un Future como enviado al pool actual."""
+        self._pool_futures.add(future)
+        return future
+
+    def _collect(self, task: Union[ReportTask, ReportOutcome], future: Future) -> ReportOutcome:
+        """
+        Resultado de una tarea; si ha fallado fuera de _generate_report (por
+        ejemplo, porque su proceso ha muerto) se registra como fallo.
+        """
+        in_current_pool = future in self._pool_futures
+        self._pool_futures.discard(future)
+        try:
+            return future.result()
+        except Exception as error:
+            # Un proceso muerto rompe el pool: se descarta para que el resto de
+            # reportes (y las siguientes llamadas) usen uno nuevo
+            if isinstance(error, BrokenProcessPool) and in_current_pool:
+                self._discard_executor()
+            name, path = task[:2]
+            return ReportOutcome(name, path, 0.0, f"{type(error).__name__}: {error}")
+
+    def _discard_executor(self) -> None:
+        """Abandona el pool actual (roto); el siguiente envío crea otro."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pool_futures.clear()
+
+
+def generate_reports(
+    scenarios: Iterable[Dict[str, Any]],
+    out_dir: str,
+    workers: Optional[int] = None,
+    backend: str = "openpyxl",
+    report_format: str = "xlsx",
+) -> List[ReportOutcome]:
+    """
+    Genera los reportes de muchos escenarios en paralelo.
+
+    Args:
+        scenarios: Iterable de diccionarios con 'nombre' y 'data' (MortgageData)
+        out_dir: Directorio de salida (se crea si no existe)
+        workers: Número de procesos (1 para no usar el pool; None para todos los núcleos)
+        backend: Motor de Excel ("openpyxl" o "write_only")
+        report_format: "xlsx", "csv", "json" o "parquet"
+
+    Returns:
+        Un ReportOutcome por escenario, en el mismo orden
+    """
+    with ReportPool(workers, backend, report_format) as pool:
+        return pool.generate(scenarios, out_dir)
@@ -0,0 +1,201 @@
+"""
+Comparación de grandes volúmenes de ofertas hipotecarias por bloques.
+
+Los escenarios se leen de un iterable (puede ser un generador), se agrupan en
+bloques que se calculan de forma vectorizada con MortgageBatch, opcionalmente
+en un pool de procesos, y las filas se escriben en el archivo de salida a
+medida que llegan. La memoria usada depende del tamaño de bloque, no del
+número de escenarios.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from .batch import MortgageBatch
+from .models import FrozenMortgageData
+from .writers import open_row_writer
+
+T = TypeVar("T")
+
+COMPARISON_COLUMNS = (
+    "Escenario",
+    "Capital (€)",
+    "Tipo Base (%)",
+    "Plazo (años)",
+    "Bonificaciones (%)",
+    "Tipo Final (%)",
+    "Cuota Mensual (€)",
+    "Total Intereses (€)",
+    "Total a Pagar (€)",
+    "Costes Bonificaciones (€)",
+    "Coste Real Total (€)",
+    "Ahorro Real (€)",
+    "¿Vale la pena?",
+)
+
+
+@dataclass(frozen=True)
+class ComparisonProgress:
+    """Estado de una comparación en curso o terminada."""
+
+    processed: int  # Escenarios escritos
+    elapsed: float  # Segundos transcurridos
+
+    @property
+    def throughput(self) -> float:
+        """Escenarios por segundo."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def comparison_rows(names: List[str], batch: MortgageBatch) -> List[Tuple[Any, ...]]:
+    """
+    Calcula las filas de la comparación para un bloque de escenarios.
+
+    Si un escenario no tiene bonificaciones se muestran los importes sin
+    bonificar, ahorro 0 y "N/A" en la última columna.
+
+    Args:
+        names: Nombre de cada escenario
+        batch: Datos de los escenarios, en el mismo orden
+
+    Returns:
+        Lista de filas con los valores de COMPARISON_COLUMNS
+    """
+    results = batch.calculate(effective_rates=False)
+    total_bonus = batch.calculate_total_bonus()
+    has_bonus = total_bonus > 0
+
+    total_paid = np.where(
+        has_bonus, results.total_paid_with_bonus, results.total_paid_without_bonus
+    )
+    verdict = np.where(results.is_worth_it, "SÍ", np.where(has_bonus, "NO", "N/A"))
+
+    columns = (
+        names,
+        batch.capital.tolist(),
+        batch.interest_rate.tolist(),
+        batch.years.tolist(),
+        total_bonus.tolist(),
+        np.maximum(0, batch.interest_rate - total_bonus).tolist(),
+        np.where(
+            has_bonus, results.monthly_payment_with_bonus, results.monthly_payment_without_bonus
+        ).tolist(),
+        np.where(
+            has_bonus, results.total_interest_with_bonus, results.total_interest_without_bonus
+        ).tolist(),
+        total_paid.tolist(),
+        results.total_bonus_costs.tolist(),
+        (total_paid + results.total_bonus_costs).tolist(),
+        np.where(has_bonus, results.real_savings, 0.0).tolist(),
+        verdict.tolist(),
+    )
+
+    return list(zip(*columns))
+
+
+def submit_bounded(
+    submit: Callable[[T], Future], tasks: Iterable[T], max_pending: int
+) -> Iterator[Tuple[T, Future]]:
+    """
+    Envía tareas a un pool con un número máximo de tareas pendientes.
+
+    La siguiente tarea no se envía hasta que se pide el siguiente resultado,
+    así que si quien consume espera cada Future la memoria queda acotada.
+
+    Args:
+        submit: Envía una tarea y devuelve su Future
+        tasks: Tareas (puede ser un generador)
+        max_pending: Tareas enviadas como máximo sin haber entregado su Future
+
+    Returns:
+        Iterador de pares (tarea, Future) en el orden de las tareas
+    """
+    pending: deque = deque()
+    for task in tasks:
+        pending.append((task, submit(task)))
+        if len(pending) >= max_pending:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def _compare_chunk(names: List[str], records: bytes) -> List[Tuple[Any, ...]]:
+    """Calcula un bloque recibido como FrozenMortgageData.pack_many."""
+    return comparison_rows(names, MortgageBatch.from_bytes(records))
+
+
+def _pack_chunks(
+    scenarios: Iterable[Dict[str, Any]], chunk_size: int
+) -> Iterator[Tuple[List[str], bytes]]:
+    """Agrupa los escenarios en bloques compactos de nombres y registros binarios."""
+    iterator = iter(scenarios)
+    pack = FrozenMortgageData.STRUCT.pack
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        names = [scenario["nombre"] for scenario in chunk]
+        records = b"".join(
+            pack(*[getattr(scenario["data"], name) for name in FrozenMortgageData.__match_args__])
+            for scenario in chunk
+        )
+        yield names, records
+
+
+def stream_comparison(
+    scenarios: Iterable[Dict[str, Any]],
+    output_file: str,
+    chunk_size: int = 10_000,
+    workers: Optional[int] = 1,
+    progress: Optional[Callable[[ComparisonProgress], None]] = None,
+) -> ComparisonProgress:
+    """
+    Compara escenarios por bloques y escribe las filas según se calculan.
+
+    Args:
+        scenarios: Iterable de diccionarios con 'nombre' y 'data' (MortgageData)
+        output_file: Archivo de salida (.csv, .parquet o .xlsx)
+        chunk_size: Escenarios por bloque
+        workers: Número de procesos (1 para no usar el pool; None para todos los núcleos)
+        progress: Función a la que se llama tras escribir cada bloque
+
+    Returns:
+        ComparisonProgress final con el total de escenarios y el rendimiento
+    """
+    if chunk_size <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+
+    start = time.perf_counter()
+    chunks = _pack_chunks(scenarios, chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    with open_row_writer(output_file, COMPARISON_COLUMNS) as writer:
+
+        def write(rows: List[Tuple[Any, ...]]) -> None:
+            writer.write_rows(rows)
+            if progress is not None:
+                progress(ComparisonProgress(writer.rows_written, time.perf_counter() - start))
+
+        if workers == 1:
+            for names, records in chunks:
+                write(_compare_chunk(names, records))
+        else:
+            # Como mucho dos bloques pendientes por proceso
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                submitted = submit_bounded(
+                    lambda chunk: pool.submit(_compare_chunk, *chunk), chunks, 2 * workers
+                )
+                for _, future in submitted:
+                    write(future.result())
+
+        processed = writer.rows_written
+
+    return ComparisonProgress(processed, time.perf_counter() - start)
@@ -0,0 +1,144 @@
+"""
+Tabla de amortización almacenada por columnas.
+"""
+
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .annuity import monthly_rate, remaining_balance
+
+Row = Tuple[int, float, float, float, float]
+
+
+class AmortizationSchedule:
+    """
+    Tabla de amortización respaldada por arrays NumPy contiguos.
+
+    Cada columna (month, payment, interest, principal, balance) es un array de
+    solo lectura accesible sin copias. Iterar o indexar por posición devuelve
+    tuplas (mes, cuota, intereses, amortización, pendiente) como la antigua
+    lista de tuplas.
+    """
+
+    COLUMNS = ("month", "payment", "interest", "principal", "balance")
+
+    __slots__ = COLUMNS
+
+    def __init__(self, month, payment, interest, principal, balance):
+        for name, values in zip(self.COLUMNS, (month, payment, interest, principal, balance)):
+            array = np.asarray(values, dtype=np.int64 if name == "month" else float).view()
+            array.flags.writeable = False
+            object.__setattr__(self, name, array)
+
+    @classmethod
+    def build(
+        cls,
+        capital: float,
+        annual_rate: float,
+        n_payments: int,
+        payment: float,
+        first_month: int = 1,
+        rows: Optional[int] = None,
+        settle_last: bool = False,
+    ) -> "AmortizationSchedule":
+        """
+        Construye la tabla sin bucles de Python.
+
+        Args:
+            capital: Capital pendiente al inicio de la tabla
+            annual_rate: Tasa de interés anual en porcentaje
+            n_payments: Número de cuotas que quedan hasta cancelar el préstamo
+            payment: Cuota mensual
+            first_month: Número del primer mes de la tabla
+            rows: Filas a construir (por defecto n_payments); si son menos, la
+                tabla termina antes de cancelar el préstamo
+            settle_last: Si la última cuota se ajusta para cancelar exactamente
+                el pendiente en lugar de ser igual a las demás
+
+        Returns:
+            AmortizationSchedule con una fila por mes
+        """
+        rows = n_payments if rows is None else rows
+        elapsed = np.arange(rows, dtype=np.int64)
+        balance_before = remaining_balance(capital, annual_rate, payment, elapsed)
+
+        interest = balance_before * monthly_rate(annual_rate)
+        payments = np.full(rows, payment, dtype=float)
+        principal = payment - interest
+        balance = np.maximum(0, balance_before - principal)
+
+        # Ajuste para el último pago (por redondeos)
+        if rows and rows == n_payments:
+            balance[-1] = 0.0
+            if settle_last:
+                principal[-1] = balance_before[-1]
+                payments[-1] = balance_before[-1] + interest[-1]
+
+        return cls(elapsed + first_month, payments, interest, principal, balance)
+
+    @classmethod
+    def concatenate(cls, schedules: Sequence["AmortizationSchedule"]) -> "AmortizationSchedule":
+        """Une varias tablas consecutivas en una sola."""
+        return cls(
+            *(
+                np.concatenate([getattr(schedule, name) for schedule in schedules])
+                for name in cls.COLUMNS
+            )
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AmortizationSchedule es inmutable")
+
+    def __len__(self) -> int:
+        return len(self.month)
+
+    def __iter__(self) -> Iterator[Row]:
+        return zip(
+            self.month.tolist(),
+            self.payment.tolist(),
+            self.interest.tolist(),
+            self.principal.tolist(),
+            self.balance.tolist(),
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AmortizationSchedule(*(getattr(self, name)[index] for name in self.COLUMNS))
+
+        return tuple(getattr(self, name)[index].item() for name in self.COLUMNS)
+
+    def __repr__(self) -> str:
+        return f"AmortizationSchedule({len(self)} meses)"
+
+    @property
+    def total_interest(self) -> float:
+        """Intereses totales de la tabla."""
+        return float(self.interest.sum())
+
+    def to_frame(
+        self, labels: Optional[Dict[str, str]] = None, decimals: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Convierte la tabla en un DataFrame directamente desde las columnas.
+
+        Las columnas se copian (un array por columna, sin objetos por fila), así
+        que el DataFrame se puede modificar sin tocar la tabla compartida.
+
+        Args:
+            labels: Nombres de columna a usar en lugar de los internos
+            decimals: Decimales a los que redondear los importes
+
+        Returns:
+            DataFrame con una fila por mes
+        """
+        labels = labels or {}
+        frame = {}
+        for name in self.COLUMNS:
+            values = getattr(self, name)
+            if decimals is not None and name != "month":
+                values = np.round(values, decimals)
+            frame[labels.get(name, name)] = values
+
+        return pd.DataFrame(frame, copy=True)
@@ -0,0 +1,144 @@
+"""
+Análisis de sensibilidad multidimensional sobre cualquier campo de MortgageData.
+
+Cada eje es un campo con su lista de valores; el cubo contiene los resultados
+de todas las combinaciones. Las celdas se calculan con MortgageBatch en
+bloques de chunk_size, así que la memoria auxiliar no depende del tamaño del
+cubo, solo de las salidas pedidas.
+"""
+
+import math
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import MortgageBatch, MortgageBatchResults
+from .models import MortgageData
+
+OUTPUTS = tuple(f.name for f in fields(MortgageBatchResults))
+EFFECTIVE_RATE_OUTPUTS = ("effective_rate_without_bonus", "effective_rate_with_bonus")
+
+
+def inclusive_range(start: float, stop: float, step: float) -> np.ndarray:
+    """
+    Valores de start a stop (incluido) cada step, sin acumular error de redondeo.
+
+    Args:
+        start: Primer valor
+        stop: Último valor admitido
+        step: Paso entre valores
+
+    Returns:
+        Array con start + i * step, redondeado a 10 decimales
+    """
+    if step <= 0:
+        raise ValueError("El paso debe ser positivo")
+
+    count = math.floor((stop - start) / step + 1e-9) + 1
+    return np.round(start + step * np.arange(max(count, 0)), 10)
+
+
+@dataclass
+class SensitivityCube:
+    """Resultados de un análisis de sensibilidad; un array N-dimensional por salida."""
+
+    axes: Dict[str, np.ndarray]  # Valores de cada eje, en el orden de las dimensiones
+    values: Dict[str, np.ndarray]  # Salidas, cada una con forma shape
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Número de valores de cada eje."""
+        return tuple(len(values) for values in self.axes.values())
+
+    def __getitem__(self, output: str) -> np.ndarray:
+        return self.values[output]
+
+    def sel(self, output: str, **coords) -> np.ndarray:
+        """
+        Selecciona una salida fijando el valor de algunos ejes.
+
+        Args:
+            output: Nombre de la salida
+            **coords: Valor de cada eje a fijar (debe estar en el eje)
+
+        Returns:
+            Array con las dimensiones de los ejes no fijados
+        """
+        index = []
+        for name, values in self.axes.items():
+            if name in coords:
+                matches = np.flatnonzero(np.isclose(values, coords[name]))
+                if not matches.size:
+                    raise KeyError(f"{coords[name]} no está en el eje {name}")
+                index.append(int(matches[0]))
+            else:
+                index.append(slice(None))
+
+        return self.values[output][tuple(index)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convierte el cubo en un DataFrame largo: una fila por celda."""
+        grids = np.meshgrid(*self.axes.values(), indexing="ij")
+        columns = {name: grid.ravel() for name, grid in zip(self.axes, grids)}
+        columns.update({name: values.ravel() for name, values in self.values.items()})
+        return pd.DataFrame(columns)
+
+
+def sensitivity_cube(
+    base_data: MortgageData,
+    axes: Dict[str, Sequence],
+    outputs: Optional[Sequence[str]] = None,
+    chunk_size: int = 1_000_000,
+) -> SensitivityCube:
+    """
+    Calcula los resultados para todas las combinaciones de valores de los ejes.
+
+    Args:
+        base_data: Datos de partida; los campos sin eje conservan su valor
+        axes: Valores de cada campo a variar, p. ej. {"interest_rate": [...], "years": [...]}
+        outputs: Campos de MortgageBatchResults a guardar (por defecto todos); las
+            TAE solo se calculan si se piden
+        chunk_size: Celdas calculadas en cada bloque
+
+    Returns:
+        SensitivityCube con un array de forma (len(eje1), len(eje2), ...) por salida
+    """
+    if not axes:
+        raise ValueError("Hace falta al menos un eje")
+    unknown = set(axes) - set(MortgageBatch.FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+    outputs = tuple(outputs or OUTPUTS)
+    unknown = set(outputs) - set(OUTPUTS)
+    if unknown:
+        raise ValueError(f"Salidas desconocidas: {', '.join(sorted(unknown))}")
+    if chunk_size <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+
+    axes = {name: np.asarray(values) for name, values in axes.items()}
+    shape = tuple(len(values) for values in axes.values())
+    size = math.prod(shape)
+    effective_rates = any(output in EFFECTIVE_RATE_OUTPUTS for output in outputs)
+
+    base = {name: getattr(base_data, name) for name in MortgageBatch.FIELDS}
+    flat = {
+        output: np.empty(size, dtype=bool if output == "is_worth_it" else float)
+        for output in outputs
+    }
+
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        indices = np.unravel_index(np.arange(start, stop), shape)
+        columns = dict(base)
+        for (name, values), index in zip(axes.items(), indices):
+            columns[name] = values[index]
+
+        results = MortgageBatch(**columns).calculate(effective_rates=effective_rates)
+        for output in outputs:
+            flat[output][start:stop] = getattr(results, output)
+
+    return SensitivityCube(
+        axes=axes, values={output: values.reshape(shape) for output, values in flat.items()}
+    )
@@ -0,0 +1,157 @@
+"""
+Hipotecas variables (índice + diferencial) con revisiones periódicas del tipo.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .annuity import annuity_payment, remaining_balance
+from .calculator import MortgageCalculator
+from .models import MortgageData
+
+
+@dataclass
+class VariableRateResults:
+    """Resultados por trayectoria del índice; cada fila es una trayectoria."""
+
+    rates: np.ndarray  # Tipo anual aplicado en cada periodo (%)
+    payments: np.ndarray  # Cuota mensual de cada periodo
+    interest: np.ndarray  # Intereses pagados en cada periodo
+    balances: np.ndarray  # Pendiente al inicio de cada periodo y al final del préstamo
+    total_interest: np.ndarray  # Intereses totales de cada trayectoria
+
+    @property
+    def total_paid(self) -> np.ndarray:
+        """Total pagado (capital más intereses) en cada trayectoria."""
+        return self.balances[:, 0] + self.total_interest
+
+
+class VariableRateCalculator:
+    """
+    Calculadora de hipotecas a tipo variable.
+
+    El tipo de cada periodo es el índice más el diferencial menos las
+    bonificaciones, sin bajar de cero. Si hay un periodo inicial a tipo fijo,
+    se usa mortgage_data.interest_rate (también menos las bonificaciones). En
+    cada revisión la cuota se recalcula como la anualidad del pendiente en los
+    meses restantes, y el pendiente al final del periodo se obtiene con la
+    fórmula cerrada, sin simular mes a mes.
+    """
+
+    def __init__(
+        self,
+        mortgage_data: MortgageData,
+        spread: float,
+        reset_months: int = 12,
+        fixed_months: int = 0,
+    ):
+        if reset_months <= 0:
+            raise ValueError("El periodo de revisión debe ser de al menos un mes")
+
+        self.data = mortgage_data
+        self.spread = spread
+        self.reset_months = reset_months
+        self.fixed_months = fixed_months
+        self.calculator = MortgageCalculator(mortgage_data)
+
+    def period_lengths(self) -> np.ndarray:
+        """Meses de cada periodo: el fijo inicial (si existe) y los variables."""
+        n_payments = self.data.years * 12
+        fixed = min(self.fixed_months, n_payments)
+        variable = n_payments - fixed
+
+        lengths = [self.reset_months] * (variable // self.reset_months)
+        if variable % self.reset_months:
+            lengths.append(variable % self.reset_months)
+
+        return np.array(([fixed] if fixed else []) + lengths, dtype=np.int64)
+
+    @property
+    def n_resets(self) -> int:
+        """Número de valores del índice necesarios por trayectoria."""
+        return len(self.period_lengths()) - (1 if self.fixed_months > 0 else 0)
+
+    def period_rates(self, index_paths, with_bonus: bool = True) -> np.ndarray:
+        """
+        Calcula el tipo anual aplicado en cada periodo de cada trayectoria.
+
+        Args:
+            index_paths: Array (trayectorias, revisiones) con el índice en porcentaje
+            with_bonus: Si restar las bonificaciones del diferencial
+
+        Returns:
+            Array (trayectorias, periodos) con el tipo anual en porcentaje
+        """
+        paths = np.atleast_2d(np.asarray(index_paths, dtype=float))
+        if paths.shape[1] < self.n_resets:
+            raise ValueError(
+                f"Cada trayectoria necesita {self.n_resets} valores del índice "
+                f"(recibidos {paths.shape[1]})"
+            )
+
+        bonus = self.calculator.calculate_total_bonus() if with_bonus else 0.0
+        rates = np.maximum(0.0, paths[:, : self.n_resets] + (self.spread - bonus))
+
+        if self.fixed_months > 0:
+            fixed_rate = max(0.0, self.data.interest_rate - bonus)
+            rates = np.hstack([np.full((len(rates), 1), fixed_rate), rates])
+
+        return rates
+
+    def simulate(self, index_paths, with_bonus: bool = True) -> VariableRateResults:
+        """
+        Calcula cuotas, intereses y pendiente de cada trayectoria del índice.
+
+        Args:
+            index_paths: Array (trayectorias, revisiones) con el índice en porcentaje
+            with_bonus: Si restar las bonificaciones del diferencial
+
+        Returns:
+            VariableRateResults con un elemento por trayectoria y periodo
+        """
+        rates = self.period_rates(index_paths, with_bonus)
+        lengths = self.period_lengths()
+        remaining = self.data.years * 12 - np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+        n_paths, n_periods = rates.shape
+        payments = np.empty((n_paths, n_periods))
+        interest = np.empty((n_paths, n_periods))
+        balances = np.empty((n_paths, n_periods + 1))
+        balances[:, 0] = self.data.capital
+
+        for period in range(n_periods):
+            balance = balances[:, period]
+            payment = annuity_payment(balance, rates[:, period], remaining[period])
+            if period == n_periods - 1:
+                # Ajuste para el último pago (por redondeos)
+                end_balance = np.zeros(n_paths)
+            else:
+                end_balance = remaining_balance(balance, rates[:, period], payment, lengths[period])
+
+            payments[:, period] = payment
+            interest[:, period] = payment * lengths[period] - (balance - end_balance)
+            balances[:, period + 1] = end_balance
+
+        return VariableRateResults(
+            rates=rates,
+            payments=payments,
+            interest=interest,
+            balances=balances,
+            total_interest=interest.sum(axis=1),
+        )
+
+    def bonus_savings(self, index_paths) -> np.ndarray:
+        """
+        Calcula el ahorro real de las bonificaciones en cada trayectoria.
+
+        Args:
+            index_paths: Array (trayectorias, revisiones) con el índice en porcentaje
+
+        Returns:
+            Array con el ahorro en intereses menos el coste de las bonificaciones
+        """
+        without_bonus = self.simulate(index_paths, with_bonus=False).total_interest
+        with_bonus = self.simulate(index_paths, with_bonus=True).total_interest
+
+        return without_bonus - with_bonus - self.calculator.calculate_total_bonus_costs()
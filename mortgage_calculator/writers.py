@@ -0,0 +1,168 @@
+"""
+Escritura de tablas por bloques de filas, sin mantenerlas enteras en memoria.
+
+Todos los escritores se usan como gestores de contexto:
+
+    with open_row_writer("salida.csv", ["A", "B"]) as writer:
+        writer.write_rows([(1, 2), (3, 4)])
+"""
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import Any, List, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+
+class RowWriter(ABC):
+    """Escritor de filas con cabecera fija."""
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+
+    def __enter__(self) -> "RowWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    @abstractmethod
+    def open(self) -> None:
+        """Crea el archivo y escribe la cabecera."""
+
+    @abstractmethod
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Añade un bloque de filas, cada una con un valor por columna."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Termina de escribir el archivo."""
+
+
+class CsvRowWriter(RowWriter):
+    """Escritor de filas a CSV (UTF-8)."""
+
+    def open(self) -> None:
+        self._handle = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(self.columns)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class ParquetRowWriter(RowWriter):
+    """
+    Escritor de filas a Parquet; cada bloque es un row group. Requiere pyarrow.
+
+    Los bloques que ya están por columnas se escriben con write_columns, que
+    pasa los arrays de NumPy a Arrow sin crear objetos por fila.
+    """
+
+    def open(self) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Para escribir Parquet hace falta instalar pyarrow") from exc
+
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+
+        table = self._pa.Table.from_pydict(
+            {name: list(values) for name, values in zip(self.columns, zip(*rows))}
+        )
+        self._write_table(table)
+
+    def write_columns(self, columns: Sequence[Any]) -> None:
+        """
+        Añade un bloque de filas dado por columnas.
+
+        Args:
+            columns: Un array de NumPy (o lista de valores de un mismo tipo) por
+                columna, en el orden de la cabecera
+        """
+        arrays = [self._pa.array(values) for values in columns]
+        self._write_table(self._pa.Table.from_arrays(arrays, names=self.columns))
+
+    def _write_table(self, table) -> None:
+        """Escribe una tabla de Arrow como row group."""
+        if self._writer is None:
+            # El esquema se fija con el primer bloque
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self.rows_written += table.num_rows
+
+    def close(self) -> None:
+        if self._writer is None:
+            empty = self._pa.table({name: self._pa.array([]) for name in self.columns})
+            self._pq.write_table(empty, self.path)
+        else:
+            self._writer.close()
+
+
+class XlsxRowWriter(RowWriter):
+    """Escritor de filas a Excel con openpyxl en modo solo escritura."""
+
+    def __init__(self, path: str, columns: Sequence[str], sheet_name: str = "Sheet1"):
+        super().__init__(path, columns)
+        self.sheet_name = sheet_name
+
+    def open(self) -> None:
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(self.sheet_name)
+
+        header: List[WriteOnlyCell] = []
+        for name in self.columns:
+            cell = WriteOnlyCell(self._sheet, value=name)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        self._sheet.append(header)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        for row in rows:
+            self._sheet.append(row)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        self._workbook.save(self.path)
+
+
+WRITERS = {
+    ".csv": CsvRowWriter,
+    ".parquet": ParquetRowWriter,
+    ".xlsx": XlsxRowWriter,
+}
+
+
+def open_row_writer(path: str, columns: Sequence[str]) -> RowWriter:
+    """
+    Crea el escritor adecuado según la extensión del archivo.
+
+    Args:
+        path: Ruta del archivo (.csv, .parquet o .xlsx)
+        columns: Nombres de las columnas
+
+    Returns:
+        RowWriter sin abrir, para usar en un bloque with
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Formato no soportado: {extension} (usa {', '.join(WRITERS)})")
+
+    return WRITERS[extension](path, columns)
@@ -0,0 +1,74 @@
+"""
+Tests para la tabla precalculada de factores de anualidad.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.annuity_table import HEADER, AnnuityFactorTable, main
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+
+
+@pytest.fixture
+def table():
+    return AnnuityFactorTable.build(
+        min_rate=0.0, max_rate=6.0, step_bp=5, min_years=5, max_years=40
+    )
+
+
+def test_table_lookup_on_and_off_grid(table):
+    """Test que la tabla solo responde para tipos y plazos de la rejilla."""
+    assert table.factor(0.0, 10) == pytest.approx(1 / 120)
+    assert table.factor(3.45, 30) is not None
+    assert table.factor(3.47, 30) is None  # Fuera del paso de 5 pb
+    assert table.factor(6.05, 30) is None  # Por encima del tipo máximo
+    assert table.factor(3.45, 41) is None  # Plazo fuera de la rejilla
+
+
+def test_calculator_payment_from_table_matches_formula(table):
+    """Test que la cuota obtenida de la tabla coincide con la fórmula exacta."""
+    data = MortgageData(capital=200000.0, interest_rate=3.45, years=30)
+
+    with_table = MortgageCalculator(data, cache=None, annuity_table=table)
+    without_table = MortgageCalculator(data, cache=None)
+
+    for rate in (3.45, 3.47, 0.0):
+        expected = without_table.calculate_monthly_payment(rate)
+        assert with_table.calculate_monthly_payment(rate) == pytest.approx(expected, rel=1e-14)
+
+
+def test_table_roundtrip_memory_mapped(table, tmp_path):
+    """Test que la tabla se guarda y se vuelve a cargar mapeada en memoria."""
+    path = table.save(str(tmp_path / "factores.bin"))
+
+    loaded = AnnuityFactorTable.load(path)
+
+    assert isinstance(loaded.factors, np.memmap)
+    np.testing.assert_array_equal(loaded.factors, table.factors)
+    assert loaded.factor(4.2, 25) == table.factor(4.2, 25)
+
+
+def test_table_rejects_unknown_version(table, tmp_path):
+    """Test que se rechazan archivos de otra versión del formato."""
+    path = tmp_path / "factores.bin"
+    table.save(str(path))
+    content = bytearray(path.read_bytes())
+    content[4:6] = (99).to_bytes(2, "little")
+    path.write_bytes(bytes(content))
+
+    with pytest.raises(ValueError):
+        AnnuityFactorTable.load(str(path))
+    assert HEADER.size % 8 == 0
+
+
+def test_accuracy_report_and_cli(tmp_path, capsys):
+    """Test que el comando de construcción guarda la tabla e informa de su precisión."""
+    path = tmp_path / "factores.bin"
+
+    main(["build", str(path), "--max-rate", "2", "--step-bp", "25", "--max-years", "10"])
+
+    report = AnnuityFactorTable.load(str(path)).accuracy_report()
+    assert report["celdas"] == 9 * 6
+    assert report["error_relativo_maximo"] < 1e-13
+    assert "error_relativo_maximo" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+"""
+Tests para el cálculo vectorizado de lotes de hipotecas.
+"""
+
+from dataclasses import fields
+
+import numpy as np
+
+from mortgage_calculator.batch import MortgageBatch
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData, MortgageResults
+
+SCENARIOS = [
+    MortgageData(capital=150000.0, interest_rate=3.0, years=25),
+    MortgageData(capital=120000.0, interest_rate=0.0, years=10),
+    MortgageData(
+        capital=200000.0,
+        interest_rate=4.0,
+        years=30,
+        payroll_bonus=0.50,
+        life_insurance_bonus=0.40,
+        home_insurance_bonus=0.30,
+        life_insurance_cost_monthly=15.0,
+        home_insurance_cost_monthly=15.0,
+    ),
+    MortgageData(
+        capital=150000.0,
+        interest_rate=2.5,
+        years=20,
+        payroll_bonus=0.20,
+        life_insurance_bonus=0.15,
+        home_insurance_bonus=0.15,
+        card_bonus=0.10,
+        other_bonus=0.05,
+        life_insurance_cost_monthly=100.0,
+        home_insurance_cost_monthly=100.0,
+        card_annual_fee=60.0,
+        other_costs_monthly=100.0,
+    ),
+    MortgageData(capital=90000.0, interest_rate=0.5, years=15, payroll_bonus=1.0),
+]
+
+
+def test_batch_matches_scalar_calculator():
+    """Test que el lote coincide fila a fila con MortgageCalculator.calculate()."""
+    results = MortgageBatch.from_mortgage_data(SCENARIOS).calculate()
+
+    assert len(results) == len(SCENARIOS)
+    for index, data in enumerate(SCENARIOS):
+        expected = MortgageCalculator(data).calculate()
+        for field in fields(MortgageResults):
+            actual = getattr(results, field.name)[index]
+            np.testing.assert_allclose(actual, getattr(expected, field.name), rtol=1e-9, atol=1e-6)
+
+
+def test_batch_broadcasts_scalar_columns():
+    """Test que los argumentos escalares se expanden al tamaño del lote."""
+    batch = MortgageBatch(capital=[100000.0, 200000.0], interest_rate=3.0, years=20)
+
+    assert len(batch) == 2
+    payments = batch.calculate_monthly_payment(3.0)
+    assert abs(payments[1] - 2 * payments[0]) < 1e-9
+
+
+def test_batch_row_returns_mortgage_results():
+    """Test que una fila del lote se convierte en MortgageResults."""
+    results = MortgageBatch.from_mortgage_data(SCENARIOS[2:3]).calculate()
+
+    row = results.row(0)
+    assert isinstance(row, MortgageResults)
+    assert row.is_worth_it is True
+    assert list(results.to_frame().columns) == [f.name for f in fields(MortgageResults)]
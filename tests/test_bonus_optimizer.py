@@ -0,0 +1,151 @@
+"""
+Tests para el optimizador de combinaciones de bonificaciones.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.annuity import annuity_payment
+from mortgage_calculator.bonus_optimizer import BonusCatalog, BonusProduct, optimize_bonuses
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from utils import recommend_best_bonus_combination
+
+DATA = MortgageData(capital=250000.0, interest_rate=3.2, years=30)
+
+
+def brute_force(catalog, k):
+    """Ahorro real de las k mejores combinaciones válidas, probando todas."""
+    products = {product.name: product for product in catalog.products}
+    values = []
+    for size in range(1, len(catalog) + 1):
+        for names in combinations(products, size):
+            chosen = [products[name] for name in names]
+            if any(
+                other.name in product.excludes
+                or (product.group is not None and product.group == other.group)
+                for product, other in combinations(chosen, 2)
+                for product, other in ((product, other), (other, product))
+            ):
+                continue
+            if any(set(product.requires) - set(names) for product in chosen):
+                continue
+            data = MortgageData(
+                capital=DATA.capital,
+                interest_rate=DATA.interest_rate,
+                years=DATA.years,
+                other_bonus=sum(product.bonus for product in chosen),
+                other_costs_monthly=sum(product.cost_monthly for product in chosen),
+            )
+            values.append(MortgageCalculator(data, cache=None).calculate().real_savings)
+    return sorted(values, reverse=True)[:k]
+
+
+def make_catalog(seed, n=10):
+    """Catálogo aleatorio con grupos excluyentes, un requisito y un pack."""
+    rng = np.random.default_rng(seed)
+    products = [
+        BonusProduct(
+            name=f"p{i}",
+            bonus=round(float(rng.uniform(0.05, 0.5)), 2),
+            cost_monthly=round(float(rng.uniform(0, 60)), 1),
+            group=f"g{i % 3}" if i < 6 else None,
+            requires=("p0",) if i == 8 else (),
+        )
+        for i in range(n)
+    ]
+    products.append(BonusProduct("pack", 0.6, 40.0, excludes=("p1", "p2")))
+    return BonusCatalog(products)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_top_k_matches_brute_force(seed):
+    """Test que la poda no pierde ninguna de las k mejores combinaciones."""
+    catalog = make_catalog(seed)
+
+    results = optimize_bonuses(DATA, catalog, top_k=5)
+
+    np.testing.assert_allclose([r.real_savings for r in results], brute_force(catalog, 5))
+
+
+def test_near_tie_catalog_with_30_products():
+    """
+    Test con 30 productos del mismo coste por punto de bonificación.
+
+    El ahorro real solo depende de la bonificación total, así que las mejores
+    combinaciones se pueden calcular partiendo el catálogo en dos mitades.
+    """
+    rng = np.random.default_rng(0)
+    bonus = rng.uniform(0.02, 0.1, 30)
+    catalog = BonusCatalog(
+        [BonusProduct(f"p{i}", float(value), float(value * 130)) for i, value in enumerate(bonus)]
+    )
+
+    def real_savings(total_bonus):
+        n_payments = DATA.years * 12
+        payment_without = annuity_payment(DATA.capital, DATA.interest_rate, n_payments)
+        payment_with = annuity_payment(DATA.capital, DATA.interest_rate - total_bonus, n_payments)
+        return (payment_without - payment_with) * n_payments - total_bonus * 130 * n_payments
+
+    def subset_sums(values):
+        sums = np.zeros(1)
+        for value in values:
+            sums = np.concatenate([sums, sums + value])
+        return sums
+
+    # Para cada suma de la primera mitad, las mejores de la segunda son las
+    # más cercanas (por cada lado) a la bonificación total óptima
+    left, right = subset_sums(bonus[:15]), np.sort(subset_sums(bonus[15:]))
+    totals = np.linspace(0, bonus.sum(), 100001)
+    target = totals[np.argmax(real_savings(totals))]
+    nearest = np.clip(np.searchsorted(right, target - left)[:, None] + np.arange(-10, 10), 0, None)
+    nearest = np.minimum(nearest, len(right) - 1)
+    pairs = np.unique(np.stack([np.repeat(np.arange(len(left)), 20), nearest.ravel()]), axis=1)
+    pairs = pairs[:, (pairs[0] > 0) | (pairs[1] > 0)]
+    expected = np.sort(real_savings(left[pairs[0]] + right[pairs[1]]))[::-1][:10]
+
+    results = optimize_bonuses(DATA, catalog, top_k=10, tolerance=0)
+
+    np.testing.assert_allclose([r.real_savings for r in results], expected, rtol=0, atol=1e-5)
+    results = optimize_bonuses(DATA, catalog, top_k=10)
+    np.testing.assert_allclose([r.real_savings for r in results], expected, rtol=0, atol=0.01)
+
+
+def test_constraints_are_respected():
+    """Test de exclusiones, grupos y requisitos en las combinaciones devueltas."""
+    catalog = make_catalog(0)
+
+    for result in optimize_bonuses(DATA, catalog, top_k=50):
+        names = set(result.products)
+        assert not ({"pack", "p1"} <= names or {"pack", "p2"} <= names)
+        assert len(names & {"p0", "p3"}) <= 1
+        assert "p8" not in names or "p0" in names
+
+
+def test_catalog_rejects_invalid_definitions():
+    """Test que se rechazan nombres repetidos, referencias desconocidas y ciclos."""
+    with pytest.raises(ValueError):
+        BonusCatalog([BonusProduct("a", 0.1), BonusProduct("a", 0.2)])
+    with pytest.raises(ValueError):
+        BonusCatalog([BonusProduct("a", 0.1, requires=("b",))])
+    with pytest.raises(ValueError):
+        BonusCatalog(
+            [BonusProduct("a", 0.1, requires=("b",)), BonusProduct("b", 0.1, requires=("a",))]
+        )
+
+
+def test_recommend_best_bonus_combination_uses_optimizer():
+    """Test que la recomendación devuelve la mejor combinación y sus resultados."""
+    bonuses = {
+        "nomina": {"bonus": 0.30, "cost_monthly": 0.0},
+        "seguros": {"bonus": 0.50, "cost_monthly": 45.0},
+        "tarjeta": {"bonus": 0.10, "cost_monthly": 5.0},
+    }
+
+    recommendation = recommend_best_bonus_combination(DATA, bonuses)
+
+    assert recommendation["mejor_combinacion"] == ["nomina", "seguros", "tarjeta"]
+    assert recommendation["resultados"].real_savings == pytest.approx(recommendation["ahorro_real"])
+    assert recommendation["vale_la_pena"]
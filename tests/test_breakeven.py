@@ -0,0 +1,96 @@
+"""
+Tests para el cálculo del punto de equilibrio de las bonificaciones.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.batch import MortgageBatch
+from mortgage_calculator.breakeven import (
+    bonus_break_evens,
+    break_even_batch,
+    break_even_cost,
+    break_even_profile_amount,
+)
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.cost_schedules import CostProfile, EscalatingCost, FlatCost
+from mortgage_calculator.models import MortgageData
+from utils import calculate_break_even_cost
+
+DATA = MortgageData(
+    capital=200000.0,
+    interest_rate=3.5,
+    years=30,
+    payroll_bonus=0.3,
+    life_insurance_bonus=0.3,
+    home_insurance_bonus=0.2,
+)
+
+
+def real_savings_with_cost(monthly_cost):
+    """Ahorro real si el coste mensual se reparte entre ambos seguros."""
+    data = MortgageData(
+        **{
+            **vars(DATA),
+            "life_insurance_cost_monthly": monthly_cost / 2,
+            "home_insurance_cost_monthly": monthly_cost / 2,
+        }
+    )
+    return MortgageCalculator(data).calculate().real_savings
+
+
+def test_break_even_is_exact_to_the_cent():
+    """Test que el coste máximo aún compensa y un céntimo más ya no."""
+    result = break_even_cost(DATA)
+
+    assert real_savings_with_cost(result.monthly_cost) == pytest.approx(0.0, abs=1e-6)
+    assert real_savings_with_cost(result.max_monthly_cost) > 0
+    assert real_savings_with_cost(result.max_monthly_cost + 0.01) <= 0
+    assert result.total_cost == pytest.approx(result.monthly_cost * 360)
+
+
+def test_batch_matches_scalar():
+    """Test que la versión en lote coincide con la escalar."""
+    loans = [DATA, MortgageData(capital=1e5, interest_rate=2.0, years=20, card_bonus=0.1)]
+    results = break_even_batch(MortgageBatch.from_mortgage_data(loans))
+
+    for i, data in enumerate(loans):
+        assert results.monthly_cost[i] == pytest.approx(break_even_cost(data).monthly_cost)
+    assert np.all(results.max_monthly_cost >= 0)
+
+
+def test_bonus_break_evens_evaluate_each_bonus_alone():
+    """Test que cada bonificación se evalúa por separado."""
+    results = bonus_break_evens(DATA)
+
+    assert set(results) == {"payroll_bonus", "life_insurance_bonus", "home_insurance_bonus"}
+    alone = break_even_cost(MortgageData(capital=2e5, interest_rate=3.5, years=30, other_bonus=0.2))
+    assert results["home_insurance_bonus"].monthly_cost == pytest.approx(alone.monthly_cost)
+
+
+def test_bisection_matches_analytic_for_flat_costs():
+    """Test que la bisección da el valor analítico con costes constantes."""
+    amount = break_even_profile_amount(DATA, lambda x: CostProfile(life_insurance=FlatCost(x)))
+
+    assert amount == pytest.approx(break_even_cost(DATA).monthly_cost, abs=1e-5)
+
+
+def test_bisection_with_escalating_costs():
+    """Test que con costes crecientes el importe inicial de equilibrio es menor."""
+    amount = break_even_profile_amount(
+        DATA, lambda x: CostProfile(life_insurance=EscalatingCost(x, annual_increase=3.0))
+    )
+    calculator = MortgageCalculator(
+        DATA, cost_profile=CostProfile(life_insurance=EscalatingCost(amount, 3.0))
+    )
+
+    assert amount < break_even_cost(DATA).monthly_cost
+    assert calculator.calculate().real_savings == pytest.approx(0.0, abs=1e-3)
+
+
+def test_break_even_step_is_deprecated():
+    """Test que step avisa de que está obsoleto y no cambia el resultado."""
+    with pytest.deprecated_call():
+        result = calculate_break_even_cost(DATA, step=0.5)
+
+    assert result == calculate_break_even_cost(DATA)
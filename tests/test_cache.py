@@ -0,0 +1,80 @@
+"""
+Tests para la caché LRU de cuotas y tablas de amortización.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from mortgage_calculator.cache import LRUCache, loan_key
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test que la caché expulsa la entrada menos usada y cuenta aciertos y fallos."""
+    cache = LRUCache(maxsize=2)
+
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 0)  # "a" pasa a ser la más reciente
+    cache.get_or_compute("c", lambda: 3)  # expulsa "b"
+
+    stats = cache.stats()
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 3, 1, 2)
+    assert stats.hit_rate == 0.25
+
+
+def test_lru_cache_resize_and_disable():
+    """Test que cambiar el tamaño expulsa entradas y que tamaño cero no almacena nada."""
+    cache = LRUCache(maxsize=3)
+    for key in range(3):
+        cache.get_or_compute(key, lambda: key)
+
+    cache.resize(1)
+    assert len(cache) == 1
+    assert cache.stats().evictions == 2
+
+    cache.resize(0)
+    cache.get_or_compute("x", lambda: 1)
+    assert len(cache) == 0
+
+
+def test_loan_key_normalizes_rate():
+    """Test que tasas equivalentes salvo error de redondeo comparten clave."""
+    assert loan_key("payment", 100000, 3.5 - 0.9, 360) == loan_key("payment", 100000.0, 2.6, 360)
+
+
+def test_calculator_uses_cache_transparently():
+    """Test que la calculadora reutiliza cuotas y tablas desde la caché."""
+    cache = LRUCache(maxsize=16)
+    data = MortgageData(capital=200000.0, interest_rate=3.5, years=30, payroll_bonus=0.5)
+
+    first = MortgageCalculator(data, cache=cache)
+    schedule = first.calculate_amortization_schedule(3.0)
+    results = first.calculate()
+
+    second = MortgageCalculator(data, cache=cache)
+    assert second.calculate_amortization_schedule(3.0) is schedule
+    assert second.calculate() == results
+    assert cache.stats().hits > 0
+
+    uncached = MortgageCalculator(data, cache=None).calculate()
+    assert uncached == results
+
+
+def test_cache_shared_across_threads():
+    """Test que la caché se puede compartir entre hilos."""
+    cache = LRUCache(maxsize=8)
+    data = MortgageData(capital=150000.0, interest_rate=3.0, years=25)
+
+    def payment(rate):
+        return MortgageCalculator(data, cache=cache).calculate_monthly_payment(rate)
+
+    rates = [2.0, 2.5, 3.0, 3.5] * 50
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        payments = list(pool.map(payment, rates))
+
+    stats = cache.stats()
+    assert payments[:4] == payments[4:8]
+    assert stats.hits + stats.misses == len(rates)
+    assert stats.size == 4
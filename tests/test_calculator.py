@@ -2,7 +2,11 @@
 Tests para el módulo de cálculo de hipotecas.
 """
 
+import numpy as np
+import pytest
+
 from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.cost_schedules import CostProfile, EscalatingCost
 from mortgage_calculator.models import MortgageData
 
 
@@ -224,3 +228,183 @@ def test_high_bonus_reduces_rate_significantly():
 
     assert total_bonus == 1.70
     assert results.effective_rate_with_bonus < 3.0  # Tipo efectivo mucho menor
+
+
+def test_closed_form_totals_match_schedule():
+    """Test que los totales analíticos coinciden con los de las tablas de amortización."""
+    data = MortgageData(
+        capital=250000.0,
+        interest_rate=3.8,
+        years=35,
+        payroll_bonus=0.40,
+        home_insurance_bonus=0.20,
+        home_insurance_cost_monthly=20.0,
+    )
+
+    calculator = MortgageCalculator(data)
+    fast = calculator.calculate()
+    slow = calculator.calculate(use_schedule=True)
+
+    assert abs(fast.total_interest_without_bonus - slow.total_interest_without_bonus) < 1e-4
+    assert abs(fast.total_interest_with_bonus - slow.total_interest_with_bonus) < 1e-4
+    assert fast.is_worth_it == slow.is_worth_it
+
+
+def test_verify_closed_form_within_tolerance():
+    """Test que la verificación de la fórmula cerrada acepta el redondeo del último pago."""
+    data = MortgageData(capital=100000.0, interest_rate=3.0, years=20)
+
+    calculator = MortgageCalculator(data)
+
+    assert calculator.verify_closed_form(3.0) < 1e-4
+    assert calculator.verify_closed_form(0.0) < 1e-4
+    assert calculator.calculate(verify=True).total_interest_without_bonus > 0
+
+
+def test_iter_amortization_matches_schedule():
+    """Test que el generador produce las mismas filas que la tabla completa."""
+    data = MortgageData(capital=100000.0, interest_rate=3.0, years=15)
+
+    calculator = MortgageCalculator(data)
+    schedule = calculator.calculate_amortization_schedule(3.0)
+    rows = list(calculator.iter_amortization(3.0, start=25, stop=36))
+
+    assert [row[0] for row in rows] == list(range(25, 37))
+    for row, expected in zip(rows, schedule[24:36]):
+        assert all(abs(a - b) < 1e-6 for a, b in zip(row, expected))
+
+
+def test_iter_amortization_is_lazy():
+    """Test que el generador permite terminar antes de recorrer todo el préstamo."""
+    data = MortgageData(capital=200000.0, interest_rate=4.0, years=30)
+
+    calculator = MortgageCalculator(data)
+    cumulative_interest = 0.0
+    for month, _, interest, _, _ in calculator.iter_amortization(4.0):
+        cumulative_interest += interest
+        if cumulative_interest > 50000.0:
+            break
+
+    assert month < 100
+    assert list(calculator.iter_amortization(4.0, start=360))[-1][4] == 0.0
+
+
+def test_random_access_queries_match_schedule():
+    """Test que las consultas en tiempo constante coinciden con la tabla."""
+    data = MortgageData(capital=180000.0, interest_rate=3.2, years=25)
+
+    calculator = MortgageCalculator(data)
+    schedule = calculator.calculate_amortization_schedule(3.2)
+
+    assert abs(calculator.balance_at(3.2, 84) - schedule[83][4]) < 1e-6
+    assert calculator.balance_at(3.2, 0) == data.capital
+    assert calculator.balance_at(3.2, 300) == 0.0
+    assert abs(calculator.cumulative_interest(3.2, 84) - schedule.interest[:84].sum()) < 1e-6
+    assert abs(calculator.cumulative_principal(3.2, 84) - schedule.principal[:84].sum()) < 1e-6
+
+    # Intereses pagados entre los años 5 y 10
+    expected = schedule.interest[48:120].sum()
+    assert abs(calculator.interest_between(3.2, 49, 120) - expected) < 1e-6
+
+
+def test_random_access_queries_vectorized():
+    """Test que las consultas aceptan arrays de meses."""
+    data = MortgageData(capital=100000.0, interest_rate=2.5, years=20)
+
+    calculator = MortgageCalculator(data)
+    months = np.arange(0, 241, 12)
+    balances = calculator.balance_at(2.5, months)
+
+    assert balances.shape == months.shape
+    assert balances[5] == calculator.balance_at(2.5, 60)
+    assert np.all(np.diff(calculator.cumulative_interest(2.5, months)) > 0)
+    np.testing.assert_allclose(
+        calculator.interest_between(2.5, months[1:] - 11, months[1:]),
+        np.diff(calculator.cumulative_interest(2.5, months)),
+    )
+
+    with pytest.raises(ValueError):
+        calculator.balance_at(2.5, 241)
+
+
+def test_cost_change_recomputes_only_dependent_stages():
+    """Test que cambiar un coste solo repite las etapas que dependen de él."""
+    data = MortgageData(
+        capital=200000.0,
+        interest_rate=3.0,
+        years=25,
+        payroll_bonus=0.3,
+        life_insurance_bonus=0.2,
+        life_insurance_cost_monthly=25.0,
+        card_annual_fee=30.0,
+    )
+    calculator = MortgageCalculator(data)
+    calculator.calculate()
+    assert calculator.last_recomputed_stages == tuple(MortgageCalculator.STAGE_DEPENDENCIES)
+
+    data.life_insurance_cost_monthly = 40.0
+    results = calculator.calculate()
+
+    assert set(calculator.last_recomputed_stages) == {
+        "costs",
+        "savings",
+        "effective_rate_with_bonus",
+    }
+    expected = MortgageCalculator(MortgageData(**vars(data)), cache=None).calculate()
+    assert results == expected
+
+    calculator.calculate()
+    assert calculator.last_recomputed_stages == ()
+
+
+def test_cost_profile_change_recomputes_costs():
+    """Test que asignar otro perfil de costes invalida las etapas que lo usan."""
+    data = MortgageData(
+        capital=200000.0,
+        interest_rate=3.0,
+        years=25,
+        payroll_bonus=0.3,
+        life_insurance_bonus=0.2,
+        life_insurance_cost_monthly=30.0,
+    )
+    calculator = MortgageCalculator(data)
+    calculator.calculate()
+
+    profile = CostProfile(life_insurance=EscalatingCost(30.0, 10.0))
+    calculator.cost_profile = profile
+    results = calculator.calculate()
+
+    assert set(calculator.last_recomputed_stages) == {
+        "costs",
+        "savings",
+        "effective_rate_with_bonus",
+    }
+    expected = MortgageCalculator(data, cache=None, cost_profile=profile).calculate()
+    assert results == expected
+    assert results.total_bonus_costs > 9000.0
+
+    calculator.annuity_table = None
+    calculator.calculate()
+    assert calculator.last_recomputed_stages == ()
+
+
+def test_dependent_stages_follow_dependency_graph():
+    """Test que un cambio de tipo se propaga a todas las etapas que lo usan."""
+    assert MortgageCalculator.dependent_stages(["card_annual_fee"]) == [
+        "costs",
+        "savings",
+        "effective_rate_with_bonus",
+    ]
+    assert MortgageCalculator.dependent_stages(["payroll_bonus"]) == [
+        "bonus",
+        "with_bonus",
+        "costs",
+        "savings",
+        "effective_rate_with_bonus",
+    ]
+    assert MortgageCalculator.dependent_stages(["interest_rate", "years"]) == list(
+        MortgageCalculator.STAGE_DEPENDENCIES
+    )
+    assert MortgageCalculator.dependent_stages(["annuity_table"]) == [
+        name for name in MortgageCalculator.STAGE_DEPENDENCIES if name != "bonus"
+    ]
@@ -0,0 +1,87 @@
+"""
+Tests para los calendarios de costes variables de las bonificaciones.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.cost_schedules import (
+    ArrayCost,
+    BalanceLinkedCost,
+    CostProfile,
+    EscalatingCost,
+    FlatCost,
+    StepCost,
+)
+from mortgage_calculator.models import MortgageData
+
+DATA = MortgageData(
+    capital=200000.0,
+    interest_rate=3.0,
+    years=25,
+    payroll_bonus=0.3,
+    life_insurance_bonus=0.2,
+    home_insurance_bonus=0.1,
+    life_insurance_cost_monthly=25.0,
+    home_insurance_cost_monthly=15.0,
+    card_annual_fee=30.0,
+)
+
+
+def test_flat_profile_matches_constant_costs():
+    """Test que un perfil con costes constantes da los mismos resultados."""
+    profile = CostProfile(life_insurance=FlatCost(25.0), home_insurance=FlatCost(15.0))
+
+    expected = MortgageCalculator(DATA).calculate()
+    results = MortgageCalculator(DATA, cost_profile=profile).calculate()
+
+    assert results.total_bonus_costs == pytest.approx(expected.total_bonus_costs)
+    assert results.real_savings == pytest.approx(expected.real_savings)
+    assert results.effective_rate_with_bonus == pytest.approx(expected.effective_rate_with_bonus)
+
+
+def test_schedules_are_aligned_with_months():
+    """Test de los importes de cada calendario mes a mes."""
+    balance = np.ones(30)
+
+    escalating = EscalatingCost(10.0, annual_increase=2.0).monthly(30, balance)
+    assert escalating[:12] == pytest.approx([10.0] * 12)
+    assert escalating[12:24] == pytest.approx([10.2] * 12)
+    assert escalating[24] == pytest.approx(10.404)
+
+    steps = StepCost([20.0, 25.0], months_per_step=12).monthly(30, balance)
+    assert list(steps[[0, 11, 12, 23, 24, 29]]) == [20.0, 20.0, 25.0, 25.0, 25.0, 25.0]
+
+    with pytest.raises(ValueError):
+        ArrayCost([1.0] * 10).monthly(30, balance)
+
+
+def test_rising_premiums_reduce_real_savings():
+    """Test que las primas crecientes aumentan el coste y reducen el ahorro."""
+    profile = CostProfile(
+        life_insurance=StepCost(np.linspace(25.0, 80.0, 25)),
+        home_insurance=EscalatingCost(15.0, annual_increase=3.0),
+    )
+
+    flat = MortgageCalculator(DATA).calculate()
+    rising = MortgageCalculator(DATA, cost_profile=profile).calculate()
+
+    assert rising.total_bonus_costs > flat.total_bonus_costs
+    assert rising.real_savings == pytest.approx(
+        flat.real_savings - (rising.total_bonus_costs - flat.total_bonus_costs)
+    )
+    assert rising.effective_rate_with_bonus > flat.effective_rate_with_bonus
+
+
+def test_balance_linked_cover_follows_schedule():
+    """Test que el seguro ligado al pendiente sigue la tabla de amortización."""
+    profile = CostProfile(life_insurance=BalanceLinkedCost(FlatCost(25.0)))
+    calculator = MortgageCalculator(DATA, cost_profile=profile)
+
+    costs = calculator.calculate_monthly_costs()
+    schedule = calculator.calculate_amortization_schedule(2.4)
+    opening_balance = schedule.balance + schedule.principal
+
+    np.testing.assert_allclose(costs, 25.0 * opening_balance / DATA.capital + 15.0)
+    assert calculator.calculate_total_bonus_costs() == pytest.approx(costs.sum() + 30.0 * 25)
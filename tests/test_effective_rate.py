@@ -0,0 +1,78 @@
+"""
+Tests para el cálculo de la TAE por TIR de los flujos mensuales.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.effective_rate import (
+    effective_annual_rate,
+    effective_annual_rate_batch,
+    solve_monthly_irr,
+)
+from mortgage_calculator.models import MortgageData
+
+
+def npv_from_cash_flows(rate, capital, monthly_flow, n_payments, annual_fee):
+    """Descuenta los flujos mes a mes, sin fórmulas cerradas."""
+    months = np.arange(1, n_payments + 1)
+    flows = np.full(n_payments, monthly_flow)
+    flows[11::12] += annual_fee
+    return np.sum(flows / (1 + rate) ** months) - capital
+
+
+def test_effective_rate_without_costs_is_compounded_nominal_rate():
+    """Test que sin costes la TAE es el tipo nominal capitalizado mensualmente."""
+    data = MortgageData(capital=200000.0, interest_rate=3.5, years=30)
+
+    calculator = MortgageCalculator(data)
+
+    expected = ((1 + 0.035 / 12) ** 12 - 1) * 100
+    assert calculator.calculate_effective_rate(3.5) == pytest.approx(expected, abs=1e-9)
+    assert calculator.calculate_effective_rate(0.0) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_monthly_irr_zeroes_cash_flow_npv():
+    """Test que la TIR anula el valor actual de los flujos con costes y cuota anual."""
+    capital, payment, n_payments, annual_fee = 180000.0, 850.0, 300, 60.0
+
+    rate = solve_monthly_irr(capital, payment + 45.0, n_payments, annual_fee)
+
+    assert abs(npv_from_cash_flows(rate, capital, payment + 45.0, n_payments, annual_fee)) < 1e-6
+
+
+def test_bonus_costs_raise_effective_rate():
+    """Test que los costes de las bonificaciones encarecen la TAE."""
+    data = MortgageData(
+        capital=150000.0,
+        interest_rate=3.0,
+        years=25,
+        payroll_bonus=0.5,
+        life_insurance_cost_monthly=30.0,
+        card_annual_fee=40.0,
+    )
+
+    calculator = MortgageCalculator(data)
+    results = calculator.calculate()
+
+    assert results.effective_rate_with_bonus > calculator.calculate_effective_rate(2.5)
+    assert results.effective_rate_with_bonus < results.effective_rate_without_bonus
+
+
+def test_batch_solver_matches_scalar():
+    """Test que el resolvedor vectorizado coincide con el escalar."""
+    rng = np.random.default_rng(7)
+    capital = rng.uniform(50000, 500000, 200)
+    payment = capital * rng.uniform(0.003, 0.01, 200)
+    n_payments = rng.integers(5, 41, 200) * 12
+    monthly_costs = rng.uniform(0, 100, 200)
+    annual_fee = rng.uniform(0, 100, 200)
+
+    batch = effective_annual_rate_batch(capital, payment, n_payments, monthly_costs, annual_fee)
+    scalar = [
+        effective_annual_rate(*args)
+        for args in zip(capital, payment, n_payments, monthly_costs, annual_fee)
+    ]
+
+    np.testing.assert_allclose(batch, scalar, rtol=1e-10, atol=1e-10)
@@ -0,0 +1,104 @@
+"""
+Tests para el generador de reportes Excel y sus motores.
+"""
+
+import pytest
+from openpyxl import load_workbook
+
+from mortgage_calculator.excel_generator import ExcelGenerator
+from mortgage_calculator.models import MortgageData
+
+CASES = [
+    MortgageData(
+        capital=180000.0,
+        interest_rate=3.1,
+        years=30,
+        payroll_bonus=0.3,
+        life_insurance_bonus=0.25,
+        home_insurance_bonus=0.15,
+        card_bonus=0.1,
+        life_insurance_cost_monthly=25.0,
+        home_insurance_cost_monthly=18.0,
+        card_annual_fee=40.0,
+        other_costs_monthly=2.0,
+    ),
+    MortgageData(capital=123456.78, interest_rate=2.37, years=40),
+]
+
+
+def describe_workbook(path):
+    """Valores, formatos y anchos de todas las celdas del libro."""
+    wb = load_workbook(path)
+    description = []
+    for ws in wb.worksheets:
+        widths = {letter: dim.width for letter, dim in ws.column_dimensions.items()}
+        description.append((ws.title, ws.dimensions, widths))
+        for row in ws.iter_rows():
+            for cell in row:
+                description.append(
+                    (
+                        ws.title,
+                        cell.coordinate,
+                        cell.value,
+                        cell.number_format,
+                        cell.font.b,
+                        cell.font.sz,
+                        cell.font.color.rgb if cell.font.color else None,
+                        cell.fill.fill_type,
+                        cell.fill.fgColor.rgb,
+                        cell.alignment.horizontal,
+                        cell.border.left.style if cell.border.left else None,
+                    )
+                )
+    return description
+
+
+@pytest.mark.parametrize("mortgage_data", CASES)
+def test_write_only_backend_matches_openpyxl(mortgage_data, tmp_path):
+    """Test que el motor en streaming produce las mismas celdas, formatos y anchos."""
+    standard = ExcelGenerator(mortgage_data).generate_report(str(tmp_path / "normal.xlsx"))
+    streaming = ExcelGenerator(mortgage_data).generate_report(
+        str(tmp_path / "streaming.xlsx"), backend="write_only"
+    )
+
+    assert describe_workbook(streaming) == describe_workbook(standard)
+
+
+def test_report_contents(tmp_path):
+    """Test de las hojas, fórmulas y formatos principales del reporte."""
+    path = ExcelGenerator(CASES[0]).generate_report(str(tmp_path / "reporte.xlsx"))
+    wb = load_workbook(path)
+
+    assert wb.sheetnames == [
+        "Datos de Entrada",
+        "Resumen",
+        "Comparación",
+        "Amortización SIN Bonif.",
+        "Amortización CON Bonif.",
+        "Análisis Bonificaciones",
+        "Análisis Individual Seguros",
+    ]
+    assert wb["Datos de Entrada"]["B8"].value == pytest.approx(0.003)
+    assert wb["Datos de Entrada"]["B8"].number_format == "0.00%"
+    assert wb["Resumen"]["B3"].value == "='Datos de Entrada'!B5*12"
+    assert wb["Resumen"]["A1"].font.b
+    assert wb["Resumen"]["A2"].fill.fgColor.rgb == "00B4C7E7"
+    assert wb["Amortización CON Bonif."].max_row == 361
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        ExcelGenerator(CASES[0]).generate_report(str(tmp_path / "x.xlsx"), backend="xlsxwriter")
+
+
+def test_column_widths_fit_longest_value(tmp_path):
+    """Test que los anchos calculados desde los datos coinciden con los del texto guardado."""
+    path = ExcelGenerator(CASES[0]).generate_report(str(tmp_path / "reporte.xlsx"))
+    wb = load_workbook(path)
+
+    for sheet_name in ("Comparación", "Amortización SIN Bonif.", "Amortización CON Bonif."):
+        ws = wb[sheet_name]
+        for column in ws.columns:
+            longest = max((len(str(cell.value)) for cell in column if cell.value), default=0)
+            width = ws.column_dimensions[column[0].column_letter].width
+            assert width == min(50, max(12, longest + 2))
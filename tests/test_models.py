@@ -0,0 +1,65 @@
+"""
+Tests para las variantes congeladas de los modelos.
+"""
+
+import dataclasses
+
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import FrozenMortgageData, FrozenMortgageResults, MortgageData
+
+DATA = MortgageData(
+    capital=200000.0,
+    interest_rate=3.0,
+    years=25,
+    payroll_bonus=0.3,
+    life_insurance_cost_monthly=25.0,
+    card_annual_fee=30.0,
+)
+
+
+def test_frozen_data_is_immutable_and_hashable():
+    """Test que los datos congelados no admiten cambios y sirven como clave."""
+    frozen = FrozenMortgageData.from_mortgage_data(DATA)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.capital = 1.0
+    assert not hasattr(frozen, "__dict__")
+    assert {frozen: 1}[FrozenMortgageData.from_mortgage_data(DATA)] == 1
+    assert frozen.to_mortgage_data() == DATA
+
+
+def test_replace_changes_only_given_fields():
+    """Test que replace devuelve una copia con los campos indicados."""
+    frozen = FrozenMortgageData.from_mortgage_data(DATA)
+    changed = frozen.replace(interest_rate=3.5)
+
+    assert changed.interest_rate == 3.5
+    assert changed.replace(interest_rate=3.0) == frozen
+    assert frozen.interest_rate == 3.0
+
+
+def test_binary_round_trip():
+    """Test que la codificación binaria conserva todos los campos."""
+    frozen = FrozenMortgageData.from_mortgage_data(DATA)
+    results = FrozenMortgageResults.from_results(MortgageCalculator(DATA).calculate())
+
+    assert len(frozen.to_bytes()) == FrozenMortgageData.STRUCT.size
+    assert FrozenMortgageData.from_bytes(frozen.to_bytes()) == frozen
+    assert FrozenMortgageResults.from_bytes(results.to_bytes()) == results
+
+    scenarios = [frozen.replace(interest_rate=rate / 10) for rate in range(20, 40)]
+    buffer = FrozenMortgageData.pack_many(scenarios)
+    assert len(buffer) == 20 * FrozenMortgageData.STRUCT.size
+    assert FrozenMortgageData.unpack_many(buffer) == scenarios
+
+
+def test_calculator_accepts_frozen_data():
+    """Test que la calculadora da lo mismo con datos congelados."""
+    frozen = FrozenMortgageData.from_mortgage_data(DATA)
+
+    results = MortgageCalculator(frozen).calculate()
+
+    assert results == MortgageCalculator(DATA).calculate()
+    assert FrozenMortgageResults.from_results(results).to_results() == results
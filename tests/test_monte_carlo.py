@@ -0,0 +1,66 @@
+"""
+Tests para la simulación Monte Carlo del Euríbor.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.monte_carlo import EuriborModel, run_monte_carlo
+from mortgage_calculator.variable_rate import VariableRateCalculator
+
+DATA = MortgageData(
+    capital=200000.0,
+    interest_rate=2.5,
+    years=25,
+    payroll_bonus=0.3,
+    life_insurance_bonus=0.2,
+    life_insurance_cost_monthly=25.0,
+)
+
+
+def test_zero_volatility_matches_deterministic_engine():
+    """Test que sin volatilidad todas las trayectorias dan el ahorro determinista."""
+    model = EuriborModel(initial=3.0, long_term_mean=3.0, volatility=0.0)
+
+    results = run_monte_carlo(DATA, spread=0.9, model=model, n_paths=10, seed=1, workers=1)
+
+    engine = VariableRateCalculator(DATA, spread=0.9)
+    expected = engine.bonus_savings(np.full(engine.n_resets, 3.0))[0]
+    assert np.allclose(results.savings, expected)
+    assert results.probability_worth_it in (0.0, 1.0)
+
+
+def test_results_are_reproducible_across_worker_counts():
+    """Test que la misma semilla da los mismos resultados con uno o varios procesos."""
+    serial = run_monte_carlo(DATA, 0.9, n_paths=3000, seed=42, workers=1, chunk_size=1000)
+    parallel = run_monte_carlo(DATA, 0.9, n_paths=3000, seed=42, workers=2, chunk_size=1000)
+
+    np.testing.assert_array_equal(serial.savings, parallel.savings)
+
+
+def test_summary_reports_distribution():
+    """Test que el resumen incluye probabilidad y percentiles ordenados."""
+    results = run_monte_carlo(DATA, 0.9, n_paths=2000, seed=3, workers=1, chunk_size=512)
+    summary = results.summary()
+
+    assert summary["trayectorias"] == 2000
+    assert 0.0 <= summary["probabilidad_vale_la_pena"] <= 1.0
+    percentiles = [summary[f"percentil_{level}"] for level in (5, 25, 50, 75, 95)]
+    assert percentiles == sorted(percentiles)
+    assert summary["percentil_50"] == pytest.approx(np.median(results.savings))
+
+
+def test_fixed_period_covering_whole_term():
+    """Test que sin revisiones del tipo todas las trayectorias dan el mismo ahorro."""
+    results = run_monte_carlo(DATA, 0.9, n_paths=5, fixed_months=300, seed=1, workers=1)
+
+    engine = VariableRateCalculator(DATA, 0.9, fixed_months=300)
+    assert engine.n_resets == 0
+    np.testing.assert_allclose(results.savings, engine.bonus_savings(np.empty((1, 0)))[0])
+
+
+@pytest.mark.parametrize("n_paths, chunk_size", [(0, 100), (-1, 100), (100, 0)])
+def test_invalid_sizes_are_rejected(n_paths, chunk_size):
+    with pytest.raises(ValueError):
+        run_monte_carlo(DATA, 0.9, n_paths=n_paths, chunk_size=chunk_size, workers=2)
@@ -0,0 +1,64 @@
+"""
+Tests para el calendario de pagos por periodos.
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.payment_calendar import build_payment_calendar, payment_dates
+
+DATA = MortgageData(capital=150000.0, interest_rate=3.0, years=10)
+
+
+@pytest.fixture
+def schedule():
+    return MortgageCalculator(DATA).calculate_amortization_schedule(3.0)
+
+
+def test_yearly_totals_match_schedule(schedule):
+    """Test que los totales anuales y acumulados cuadran con la tabla."""
+    calendar = build_payment_calendar(schedule)
+
+    assert list(calendar["Año"]) == list(range(1, 11))
+    assert calendar["Intereses (€)"].iloc[0] == pytest.approx(schedule.interest[:12].sum())
+    assert calendar["Pendiente (€)"].iloc[0] == pytest.approx(schedule.balance[11])
+    assert calendar["Intereses Acumulados (€)"].iloc[-1] == pytest.approx(schedule.total_interest)
+    assert calendar["Capital Amortizado Acumulado (€)"].iloc[-1] == pytest.approx(DATA.capital)
+
+
+@pytest.mark.parametrize("frequency, periods", [("quarter", 40), ("half", 20), (5, 24)])
+def test_other_frequencies(schedule, frequency, periods):
+    """Test de trimestres, semestres y periodos personalizados."""
+    calendar = build_payment_calendar(schedule, frequency)
+
+    assert len(calendar) == periods
+    assert calendar["Pagos Totales (€)"].sum() == pytest.approx(schedule.payment.sum())
+
+
+def test_fiscal_year_with_dates(schedule):
+    """Test que con fechas los años fiscales pueden quedar incompletos."""
+    calendar = build_payment_calendar(
+        schedule, start_date=datetime.date(2025, 2, 28), fiscal_year_start=4
+    )
+
+    # Febrero y marzo de 2025 forman el primer año fiscal
+    assert calendar["Hasta"].iloc[0] == np.datetime64("2025-03-28")
+    assert calendar["Desde"].iloc[1] == np.datetime64("2025-04-28")
+    assert len(calendar) == 11
+    assert calendar["Pagos Totales (€)"].iloc[0] == pytest.approx(2 * schedule.payment[0])
+
+
+def test_payment_dates_clip_to_month_end():
+    """Test que el día de pago se ajusta a meses más cortos."""
+    dates = payment_dates(datetime.date(2024, 1, 31), 4)
+
+    assert [str(date) for date in dates] == [
+        "2024-01-31",
+        "2024-02-29",
+        "2024-03-31",
+        "2024-04-30",
+    ]
@@ -0,0 +1,145 @@
+"""
+Tests para las amortizaciones anticipadas.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData, PrepaymentEvent
+
+DATA = MortgageData(capital=200000.0, interest_rate=3.0, years=25)
+
+
+def simulate_month_by_month(capital, annual_rate, n_payments, events):
+    """Recorre el préstamo mes a mes aplicando las amortizaciones anticipadas."""
+    monthly_rate = annual_rate / 100 / 12
+    payment = capital * monthly_rate / (1 - (1 + monthly_rate) ** -n_payments)
+    by_month = {event.month: event for event in events}
+    balance = capital
+    total_interest = 0.0
+    month = 0
+    while balance > 1e-6:
+        month += 1
+        interest = balance * monthly_rate
+        total_interest += interest
+        balance -= min(payment, balance + interest) - interest
+        event = by_month.get(month)
+        if event and balance > 0:
+            balance -= min(event.amount, balance)
+            if not event.reduce_term and balance > 0:
+                remaining = n_payments - month
+                payment = balance * monthly_rate / (1 - (1 + monthly_rate) ** -remaining)
+    return total_interest, month
+
+
+@pytest.mark.parametrize("reduce_term", [True, False])
+def test_prepayments_match_month_by_month_simulation(reduce_term):
+    """Test que el cálculo por tramos coincide con la simulación mensual."""
+    events = [
+        PrepaymentEvent(month=120, amount=10000.0, reduce_term=reduce_term),
+        PrepaymentEvent(month=60, amount=20000.0, reduce_term=reduce_term, fee_percentage=1.0),
+    ]
+
+    results = MortgageCalculator(DATA).calculate_with_prepayments(3.0, events)
+    expected_interest, expected_last = simulate_month_by_month(200000.0, 3.0, 300, events)
+
+    assert results.total_interest == pytest.approx(expected_interest, rel=1e-10)
+    assert results.last_month == expected_last
+    assert results.total_fees == pytest.approx(200.0)
+    assert results.net_savings == pytest.approx(results.interest_savings - 200.0)
+
+
+def test_prepayment_schedule_matches_results():
+    """Test que la tabla con amortizaciones cuadra con el cálculo cerrado."""
+    calculator = MortgageCalculator(DATA)
+    events = [
+        PrepaymentEvent(month=60, amount=20000.0),
+        PrepaymentEvent(month=120, amount=10000.0, reduce_term=False),
+    ]
+
+    results = calculator.calculate_with_prepayments(3.0, events)
+    schedule = calculator.calculate_prepayment_schedule(3.0, events)
+
+    assert len(schedule) == results.last_month
+    assert schedule.total_interest == pytest.approx(results.total_interest, rel=1e-10)
+    assert schedule.principal.sum() == pytest.approx(DATA.capital)
+    assert schedule.balance[-1] == 0.0
+    assert np.all(np.diff(schedule.month) == 1)
+
+
+def test_prepayment_covering_balance_cancels_loan():
+    """Test que amortizar más que el pendiente cancela el préstamo ese mes."""
+    results = MortgageCalculator(DATA).calculate_with_prepayments(
+        3.0, [PrepaymentEvent(month=12, amount=1e6)]
+    )
+
+    assert results.last_month == 12
+    assert results.interest_savings > 0
+
+
+def test_prepayment_grid_matches_scalar_calls():
+    """Test que cada celda de la rejilla coincide con el cálculo individual."""
+    calculator = MortgageCalculator(DATA)
+    months = [12, 60, 180]
+    amounts = [5000.0, 30000.0]
+
+    for reduce_term in (True, False):
+        grid = calculator.evaluate_prepayment_grid(
+            3.0, months, amounts, reduce_term=reduce_term, fee_percentage=0.5
+        )
+        assert grid.net_savings.shape == (3, 2)
+        for i, month in enumerate(months):
+            for j, amount in enumerate(amounts):
+                event = PrepaymentEvent(month, amount, reduce_term, 0.5)
+                expected = calculator.calculate_with_prepayments(3.0, [event])
+                assert grid.net_savings[i, j] == pytest.approx(expected.net_savings)
+                assert grid.last_month[i, j] == expected.last_month
+
+        best = grid.best()
+        assert (best.month, best.amount) == (12, 30000.0)
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize("annual_rate", [3.0, 0.0])
+def test_prepayment_grid_in_last_month(annual_rate):
+    """Test que la rejilla admite el último mes sin avisos de división por cero."""
+    calculator = MortgageCalculator(DATA)
+    months = [299, 300]
+
+    for reduce_term in (True, False):
+        grid = calculator.evaluate_prepayment_grid(
+            annual_rate, months, [5000.0], reduce_term=reduce_term
+        )
+        assert np.isfinite(grid.net_savings).all()
+        for i, month in enumerate(months):
+            event = PrepaymentEvent(month, 5000.0, reduce_term)
+            expected = calculator.calculate_with_prepayments(annual_rate, [event])
+            assert grid.net_savings[i, 0] == pytest.approx(expected.net_savings, abs=1e-6)
+            assert grid.last_month[i, 0] == expected.last_month
+
+
+def test_invalid_prepayment_is_rejected():
+    """Test que se rechazan meses fuera del plazo e importes no positivos."""
+    calculator = MortgageCalculator(DATA)
+
+    with pytest.raises(ValueError):
+        calculator.calculate_with_prepayments(3.0, [PrepaymentEvent(month=301, amount=1000.0)])
+    with pytest.raises(ValueError):
+        calculator.calculate_with_prepayments(3.0, [PrepaymentEvent(month=10, amount=0.0)])
+
+
+def test_prepayments_in_the_same_month_are_combined():
+    """Test que dos eventos en el mismo mes equivalen a uno por la suma."""
+    calculator = MortgageCalculator(DATA)
+    events = [PrepaymentEvent(month=24, amount=10000.0), PrepaymentEvent(month=24, amount=5000.0)]
+    combined = [PrepaymentEvent(month=24, amount=15000.0)]
+
+    results = calculator.calculate_with_prepayments(3.0, events)
+    schedule = calculator.calculate_prepayment_schedule(3.0, events)
+    expected = calculator.calculate_prepayment_schedule(3.0, combined)
+
+    assert len(schedule) == results.last_month
+    assert schedule.total_interest == pytest.approx(results.total_interest, rel=1e-10)
+    np.testing.assert_allclose(schedule.balance, expected.balance)
+    np.testing.assert_allclose(schedule.principal, expected.principal)
@@ -0,0 +1,118 @@
+"""
+Tests para la frontera de Pareto y el ranking de ofertas.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator import ranking
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.ranking import (
+    TopK,
+    pareto_front,
+    pareto_front_2d,
+    rank_offers,
+)
+
+
+def brute_force_front(points):
+    points = np.asarray(points, dtype=float)
+    return np.array(
+        [
+            i
+            for i, p in enumerate(points)
+            if not any((q <= p).all() and (q < p).any() for q in points)
+        ],
+        dtype=np.int64,
+    )
+
+
+def test_pareto_front_2d_simple():
+    x = [1, 2, 3, 2, 1]
+    y = [5, 3, 1, 4, 5]
+    # (1, 5) aparece dos veces: los duplicados no se dominan entre sí
+    assert pareto_front_2d(x, y).tolist() == [0, 1, 2, 4]
+
+
+@pytest.mark.parametrize("dims", [2, 3, 4])
+def test_pareto_front_matches_brute_force(dims, monkeypatch):
+    monkeypatch.setattr(ranking, "BLOCK_SIZE", 16)
+    rng = np.random.default_rng(dims)
+    # Valores enteros para forzar empates
+    points = rng.integers(0, 8, size=(300, dims))
+
+    np.testing.assert_array_equal(pareto_front(points), brute_force_front(points))
+
+
+def test_pareto_front_empty():
+    assert pareto_front(np.zeros((0, 3))).size == 0
+    assert pareto_front_2d([], []).size == 0
+
+
+def test_top_k_keeps_largest_and_first_on_ties():
+    top = TopK(3, key=lambda item: item[1])
+    top.extend([("a", 1), ("b", 5), ("c", 3), ("d", 5), ("e", 0), ("f", 3)])
+
+    assert [name for name, _ in top.items()] == ["b", "d", "c"]
+    assert top.threshold == 3
+
+
+def test_top_k_rejects_invalid_k():
+    with pytest.raises(ValueError):
+        TopK(0, key=float)
+
+
+def scenario(name, rate, payroll_bonus=0.0, cost=0.0, upfront=0.0):
+    data = MortgageData(
+        capital=200000.0,
+        interest_rate=rate,
+        years=25,
+        payroll_bonus=payroll_bonus,
+        life_insurance_cost_monthly=cost,
+    )
+    return {"nombre": name, "data": data, "gastos_iniciales": upfront}
+
+
+def test_rank_offers_frontier_and_top():
+    scenarios = [
+        scenario("barata", 2.5, upfront=3000.0),
+        scenario("sin gastos", 3.0),
+        scenario("dominada", 3.2, upfront=500.0),
+        scenario("bonificada", 3.2, payroll_bonus=0.5, cost=10.0),
+        scenario("cara", 4.0, payroll_bonus=1.0, cost=200.0),
+    ]
+
+    shortlist = rank_offers(scenarios, top_k=2, chunk_size=2)
+
+    assert shortlist.processed == 5
+    assert [offer.name for offer in shortlist.frontier] == ["barata", "bonificada"]
+    assert [offer.name for offer in shortlist.top] == ["bonificada", "barata"]
+
+    expected = MortgageCalculator(scenarios[3]["data"]).calculate()
+    best = shortlist.top[0]
+    assert best.real_savings == pytest.approx(expected.real_savings)
+    assert best.monthly_payment == pytest.approx(expected.monthly_payment_with_bonus)
+    assert best.results.effective_rate_with_bonus == pytest.approx(
+        expected.effective_rate_with_bonus, abs=1e-6
+    )
+
+
+def test_rank_offers_chunking_does_not_change_result():
+    rng = np.random.default_rng(0)
+    scenarios = [
+        scenario(
+            f"oferta {i}",
+            round(rng.uniform(2.0, 4.5), 2),
+            payroll_bonus=round(rng.uniform(0, 1), 2),
+            cost=round(rng.uniform(0, 40), 2),
+            upfront=round(rng.uniform(0, 3000), -2),
+        )
+        for i in range(200)
+    ]
+
+    whole = rank_offers(scenarios, top_k=5, chunk_size=1000)
+    chunked = rank_offers(iter(scenarios), top_k=5, chunk_size=7)
+
+    assert [o.name for o in chunked.frontier] == [o.name for o in whole.frontier]
+    assert [o.name for o in chunked.top] == [o.name for o in whole.top]
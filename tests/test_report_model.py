@@ -0,0 +1,95 @@
+"""
+Tests para el modelo de reporte y sus escritores.
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.report_model import (
+    CsvReportWriter,
+    JsonReportWriter,
+    ParquetReportWriter,
+    ReportBuilder,
+    table_name,
+)
+from mortgage_calculator.reports import generate_reports
+
+DATA = MortgageData(
+    capital=200000.0,
+    interest_rate=3.5,
+    years=25,
+    payroll_bonus=0.3,
+    life_insurance_bonus=0.2,
+    life_insurance_cost_monthly=20.0,
+    card_annual_fee=30.0,
+)
+
+
+@pytest.fixture(scope="module")
+def model():
+    return ReportBuilder(DATA).build()
+
+
+def test_table_name():
+    assert table_name("Amortización SIN Bonif.") == "amortizacion_sin_bonif"
+    assert table_name("Análisis Individual Seguros") == "analisis_individual_seguros"
+
+
+def test_tables_fill_formula_cells(model):
+    """Test que la hoja Resumen lleva los valores que Excel calcula con fórmulas."""
+    results = MortgageCalculator(DATA).calculate()
+    summary = model.tables()["Resumen"].set_index("Concepto")["Fórmula/Valor"]
+
+    assert model.sheets["Resumen"]["Fórmula/Valor"].eq("").all()
+    assert summary["Meses totales"] == 300
+    assert summary["Bonificación total (%)"] == pytest.approx(0.5)
+    assert summary["Cuota mensual CON bonificaciones (€)"] == pytest.approx(
+        results.monthly_payment_with_bonus
+    )
+    assert summary["Ahorro real (€)"] == pytest.approx(results.real_savings)
+    assert summary["¿Vale la pena?"] == ("SÍ ✓" if results.is_worth_it else "NO ✗")
+
+
+def test_csv_writer(model, tmp_path):
+    path = CsvReportWriter().write(model, str(tmp_path / "reporte"))
+
+    assert sorted(os.listdir(path)) == sorted(f"{table_name(name)}.csv" for name in model.sheets)
+    schedule = pd.read_csv(os.path.join(path, "amortizacion_con_bonif.csv"))
+    pd.testing.assert_frame_equal(schedule, model.sheets["Amortización CON Bonif."])
+
+
+def test_json_writer(model, tmp_path):
+    path = JsonReportWriter().write(model, str(tmp_path / "reporte.json"))
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+
+    schedule = document["amortizacion_sin_bonif"]
+    assert schedule["sheet"] == "Amortización SIN Bonif."
+    assert schedule["columns"][0] == "Mes"
+    assert len(schedule["data"]) == 300
+    assert schedule["data"][0][0] == 1
+    assert document["resumen"]["data"][1] == ["Meses totales", 300]
+
+
+def test_parquet_writer(model, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = ParquetReportWriter().write(model, str(tmp_path / "reporte"))
+
+    schedule = pd.read_parquet(os.path.join(path, "amortizacion_con_bonif.parquet"))
+    pd.testing.assert_frame_equal(schedule, model.sheets["Amortización CON Bonif."])
+
+
+def test_generate_reports_in_other_formats(tmp_path):
+    scenarios = [{"nombre": "cliente", "data": DATA}]
+    outcomes = generate_reports(scenarios, str(tmp_path), workers=1, report_format="json")
+
+    assert outcomes[0].ok
+    assert outcomes[0].path.endswith("cliente.json")
+
+    with pytest.raises(ValueError):
+        generate_reports(scenarios, str(tmp_path), workers=1, report_format="xml")
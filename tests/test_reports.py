@@ -0,0 +1,115 @@
+"""
+Tests para la generación de reportes en paralelo.
+"""
+
+import multiprocessing
+import os
+
+import pytest
+from openpyxl import load_workbook
+
+from mortgage_calculator import reports
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.reports import ReportPool, generate_reports
+
+
+def make_scenarios(n):
+    for i in range(n):
+        yield {
+            "nombre": f"cliente_{i}",
+            "data": MortgageData(
+                capital=150000.0 + 10000 * i,
+                interest_rate=3.0,
+                years=20 + i,
+                payroll_bonus=0.3,
+                life_insurance_cost_monthly=15.0,
+            ),
+        }
+
+
+def test_generate_reports_in_pool(tmp_path):
+    """Test que se generan todos los reportes, en orden y con sus datos."""
+    outcomes = generate_reports(make_scenarios(5), str(tmp_path), workers=2)
+
+    assert [outcome.name for outcome in outcomes] == [f"cliente_{i}" for i in range(5)]
+    assert all(outcome.ok and outcome.seconds > 0 for outcome in outcomes)
+
+    ws = load_workbook(outcomes[3].path)["Datos de Entrada"]
+    assert ws["B3"].value == 1800.0  # Capital convertido a porcentaje
+    assert ws["B5"].value == 23
+
+
+def test_failures_do_not_abort_batch(tmp_path):
+    """Test que un reporte que falla queda registrado y el resto se genera."""
+    scenarios = list(make_scenarios(3))
+    scenarios[1] = {
+        "nombre": "plazo_cero",
+        "data": MortgageData(capital=100000.0, interest_rate=3.0, years=0),
+    }
+
+    outcomes = generate_reports(scenarios, str(tmp_path / "salida"), workers=1)
+
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    assert outcomes[1].error.startswith("ZeroDivisionError")
+    assert os.path.exists(outcomes[2].path)
+
+
+def test_pool_is_reused_between_calls(tmp_path):
+    """Test que el mismo pool sirve para varias tandas con el motor elegido."""
+    with ReportPool(workers=2, backend="write_only") as pool:
+        first = pool.generate(make_scenarios(2), str(tmp_path / "a"))
+        executor = pool._executor
+        second = pool.generate(make_scenarios(3), str(tmp_path / "b"))
+
+        assert pool._executor is executor
+    assert all(outcome.ok for outcome in first + second)
+    assert len(os.listdir(tmp_path / "b")) == 3
+
+
+def test_invalid_scenarios_do_not_abort_batch(tmp_path):
+    """Test que un escenario que no se puede preparar queda como fallo sin parar la tanda."""
+    scenarios = list(make_scenarios(3))
+    scenarios[0] = {"nombre": "sin_capital", "data": MortgageData(None, 3.0, 20)}
+    scenarios[2] = {"data": scenarios[2]["data"]}
+
+    for workers in (1, 2):
+        outcomes = generate_reports(scenarios, str(tmp_path / str(workers)), workers=workers)
+
+        assert [outcome.ok for outcome in outcomes] == [False, True, False]
+        assert outcomes[0].name == "sin_capital"
+        assert outcomes[0].error.startswith("error")  # struct.error
+        assert outcomes[2].error.startswith("KeyError")
+        assert os.path.exists(outcomes[1].path)
+
+
+class CrashingBuilder(reports.ReportBuilder):
+    """Termina el proceso sin excepción al construir el reporte de 200000 €."""
+
+    def build(self):
+        if self.data.capital == 200000.0:
+            os._exit(1)
+        return super().build()
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="el sustituto de ReportBuilder solo llega a los procesos con fork",
+)
+def test_dead_worker_does_not_abort_batch(tmp_path, monkeypatch):
+    """Test que si muere un proceso del pool el resto de reportes se genera."""
+    monkeypatch.setattr(reports, "ReportBuilder", CrashingBuilder)
+    scenarios = list(make_scenarios(12))  # El escenario 5 tiene 200000 €
+
+    with ReportPool(workers=2, report_format="json") as pool:
+        outcomes = pool.generate(scenarios, str(tmp_path / "a"))
+
+        assert [outcome.name for outcome in outcomes] == [f"cliente_{i}" for i in range(12)]
+        assert outcomes[5].error.startswith("BrokenProcessPool")
+        assert outcomes[0].ok and outcomes[-1].ok
+        # Solo fallan los reportes que estaban pendientes en el pool roto
+        failed = [outcome for outcome in outcomes if not outcome.ok]
+        assert all(outcome.error.startswith("BrokenProcessPool") for outcome in failed)
+
+        # El pool roto se ha sustituido: la siguiente tanda funciona entera
+        again = pool.generate(scenarios[:5] + scenarios[6:], str(tmp_path / "b"))
+        assert all(outcome.ok for outcome in again)
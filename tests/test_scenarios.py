@@ -0,0 +1,108 @@
+"""
+Tests para la comparación de escenarios por bloques.
+"""
+
+from concurrent.futures import Future
+
+import pandas as pd
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.scenarios import COMPARISON_COLUMNS, stream_comparison, submit_bounded
+
+
+def make_scenarios(n):
+    """Genera escenarios variados, la mitad sin bonificaciones."""
+    for i in range(n):
+        yield {
+            "nombre": f"Banco {i}",
+            "data": MortgageData(
+                capital=150000.0 + 1000 * i,
+                interest_rate=2.0 + (i % 7) * 0.25,
+                years=20 + i % 3 * 5,
+                payroll_bonus=0.3 if i % 2 else 0.0,
+                life_insurance_cost_monthly=20.0 if i % 2 else 0.0,
+            ),
+        }
+
+
+def test_rows_match_calculator(tmp_path):
+    """Test que cada fila coincide con el cálculo escenario a escenario."""
+    output = tmp_path / "comparacion.csv"
+    summary = stream_comparison(make_scenarios(25), str(output), chunk_size=10)
+
+    df = pd.read_csv(output, keep_default_na=False)
+    assert summary.processed == 25
+    assert list(df.columns) == list(COMPARISON_COLUMNS)
+
+    for scenario, (_, row) in zip(make_scenarios(25), df.iterrows()):
+        data = scenario["data"]
+        results = MortgageCalculator(data).calculate()
+        if data.payroll_bonus:
+            assert row["Cuota Mensual (€)"] == pytest.approx(results.monthly_payment_with_bonus)
+            assert row["Ahorro Real (€)"] == pytest.approx(results.real_savings)
+            assert row["¿Vale la pena?"] == ("SÍ" if results.is_worth_it else "NO")
+        else:
+            assert row["Cuota Mensual (€)"] == pytest.approx(results.monthly_payment_without_bonus)
+            assert row["Ahorro Real (€)"] == 0
+            assert row["¿Vale la pena?"] == "N/A"
+
+
+def test_worker_pool_keeps_order_and_reports_progress(tmp_path):
+    """Test que el pool da las mismas filas en el mismo orden e informa del avance."""
+    serial = tmp_path / "serie.csv"
+    parallel = tmp_path / "paralelo.csv"
+    updates = []
+
+    stream_comparison(make_scenarios(50), str(serial), chunk_size=8)
+    stream_comparison(
+        make_scenarios(50), str(parallel), chunk_size=8, workers=2, progress=updates.append
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(serial), pd.read_csv(parallel))
+    assert [update.processed for update in updates] == [8, 16, 24, 32, 40, 48, 50]
+    assert updates[-1].throughput > 0
+
+
+def test_xlsx_output(tmp_path):
+    """Test que la salida Excel en modo solo escritura tiene cabecera y filas."""
+    output = tmp_path / "comparacion.xlsx"
+    stream_comparison(make_scenarios(5), str(output))
+
+    df = pd.read_excel(output)
+    assert list(df.columns) == list(COMPARISON_COLUMNS)
+    assert len(df) == 5
+
+
+def test_parquet_output(tmp_path):
+    """Test de la salida Parquet (si pyarrow está disponible)."""
+    pytest.importorskip("pyarrow")
+    output = tmp_path / "comparacion.parquet"
+    stream_comparison(make_scenarios(30), str(output), chunk_size=7)
+
+    assert len(pd.read_parquet(output)) == 30
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    """Test que se rechaza una extensión no soportada."""
+    with pytest.raises(ValueError):
+        stream_comparison(make_scenarios(1), str(tmp_path / "comparacion.txt"))
+
+
+def test_submit_bounded_limits_pending_tasks():
+    """Test que no se envían más tareas de las permitidas antes de entregar resultados."""
+    submitted = []
+
+    def submit(task):
+        submitted.append(task)
+        future = Future()
+        future.set_result(task * 10)
+        return future
+
+    delivered = []
+    for task, future in submit_bounded(submit, range(7), max_pending=3):
+        assert len(submitted) - len(delivered) <= 3
+        delivered.append((task, future.result()))
+
+    assert delivered == [(i, i * 10) for i in range(7)]
@@ -0,0 +1,96 @@
+"""
+Tests para la tabla de amortización por columnas.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.schedule import AmortizationSchedule
+
+
+def legacy_schedule(capital, annual_rate, years, payment):
+    """Reproduce la tabla de amortización original basada en listas."""
+    monthly_rate = annual_rate / 100 / 12
+    n_payments = years * 12
+    remaining_balance = capital
+    schedule = []
+
+    for month in range(1, n_payments + 1):
+        interest = remaining_balance * monthly_rate
+        principal = payment - interest
+        remaining_balance -= principal
+        if month == n_payments:
+            remaining_balance = 0
+        schedule.append((month, payment, interest, principal, max(0, remaining_balance)))
+
+    return schedule
+
+
+@pytest.mark.parametrize("annual_rate", [0.0, 2.75, 6.5])
+def test_schedule_matches_legacy_rows(annual_rate):
+    """Test que la tabla vectorizada coincide con la recurrencia mes a mes."""
+    data = MortgageData(capital=180000.0, interest_rate=annual_rate, years=30)
+    calculator = MortgageCalculator(data)
+
+    schedule = calculator.calculate_amortization_schedule(annual_rate)
+    expected = legacy_schedule(
+        data.capital, annual_rate, data.years, calculator.calculate_monthly_payment(annual_rate)
+    )
+
+    assert len(schedule) == len(expected)
+    np.testing.assert_allclose(np.array(list(schedule)), np.array(expected), atol=1e-6)
+
+
+def test_schedule_tuple_access_and_slicing():
+    """Test que la tabla conserva el acceso por tuplas de la versión anterior."""
+    data = MortgageData(capital=100000.0, interest_rate=3.0, years=2)
+    schedule = MortgageCalculator(data).calculate_amortization_schedule(3.0)
+
+    month, payment, interest, principal, balance = schedule[0]
+    assert month == 1 and isinstance(month, int)
+    assert abs(payment - interest - principal) < 1e-9
+    assert abs(balance - (data.capital - principal)) < 1e-6
+
+    first_year = schedule[:12]
+    assert isinstance(first_year, AmortizationSchedule)
+    assert len(first_year) == 12
+    assert first_year[-1][0] == 12
+
+
+def test_schedule_columns_are_read_only_views():
+    """Test que las columnas se exponen sin copias y no se pueden modificar."""
+    data = MortgageData(capital=100000.0, interest_rate=3.0, years=10)
+    schedule = MortgageCalculator(data).calculate_amortization_schedule(3.0)
+
+    sliced = schedule[12:24]
+    assert np.shares_memory(sliced.interest, schedule.interest)
+    with pytest.raises(ValueError):
+        schedule.balance[0] = 0.0
+
+
+def test_schedule_to_frame_with_labels():
+    """Test que to_frame crea el DataFrame con etiquetas y redondeo."""
+    data = MortgageData(capital=100000.0, interest_rate=3.0, years=10)
+    schedule = MortgageCalculator(data).calculate_amortization_schedule(3.0)
+
+    df = schedule.to_frame(labels={"month": "Mes"}, decimals=2)
+
+    assert list(df.columns) == ["Mes", "payment", "interest", "principal", "balance"]
+    assert len(df) == 120
+    assert df["balance"].iloc[-1] == 0.0
+    assert df["interest"].round(2).equals(df["interest"])
+
+
+def test_schedule_to_frame_is_writable():
+    """Test que el DataFrame se puede editar sin modificar la tabla cacheada."""
+    data = MortgageData(capital=100000.0, interest_rate=3.0, years=10)
+    schedule = MortgageCalculator(data).calculate_amortization_schedule(3.0)
+    interest = float(schedule.interest[0])
+
+    df = schedule.to_frame()
+    df.loc[0, "interest"] = 1.0
+
+    assert df["interest"].iloc[0] == 1.0
+    assert schedule.interest[0] == interest
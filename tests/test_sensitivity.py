@@ -0,0 +1,70 @@
+"""
+Tests para el análisis de sensibilidad multidimensional.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.sensitivity import inclusive_range, sensitivity_cube
+
+BASE = MortgageData(
+    capital=200000.0,
+    interest_rate=3.0,
+    years=25,
+    payroll_bonus=0.3,
+    life_insurance_cost_monthly=25.0,
+)
+
+
+def test_inclusive_range_has_no_accumulated_error():
+    """Test que los valores de la rejilla son exactos e incluyen el extremo."""
+    rates = inclusive_range(2.0, 5.0, 0.1)
+
+    assert len(rates) == 31
+    assert rates[-1] == 5.0
+    assert rates[13] == 3.3
+
+
+def test_cube_cells_match_calculator():
+    """Test que cada celda del cubo coincide con el cálculo individual."""
+    axes = {"interest_rate": [2.0, 3.5], "years": [20, 30], "payroll_bonus": [0.0, 0.5]}
+    cube = sensitivity_cube(BASE, axes)
+
+    assert cube.shape == (2, 2, 2)
+    for i, rate in enumerate(axes["interest_rate"]):
+        for j, years in enumerate(axes["years"]):
+            for k, bonus in enumerate(axes["payroll_bonus"]):
+                data = MortgageData(**{**vars(BASE), "interest_rate": rate, "years": years})
+                data.payroll_bonus = bonus
+                expected = MortgageCalculator(data).calculate()
+                assert cube["real_savings"][i, j, k] == pytest.approx(expected.real_savings)
+                assert cube["effective_rate_with_bonus"][i, j, k] == pytest.approx(
+                    expected.effective_rate_with_bonus
+                )
+
+
+def test_chunking_gives_same_cube_and_long_frame():
+    """Test que el resultado no depende del tamaño de bloque."""
+    axes = {"interest_rate": inclusive_range(1.0, 5.0, 0.5), "capital": [1e5, 2e5, 3e5]}
+
+    whole = sensitivity_cube(BASE, axes, outputs=["monthly_payment_with_bonus"])
+    chunked = sensitivity_cube(BASE, axes, outputs=["monthly_payment_with_bonus"], chunk_size=4)
+    np.testing.assert_array_equal(
+        whole["monthly_payment_with_bonus"], chunked["monthly_payment_with_bonus"]
+    )
+
+    df = chunked.to_frame()
+    assert list(df.columns) == ["interest_rate", "capital", "monthly_payment_with_bonus"]
+    assert len(df) == 27
+    row = df[(df["interest_rate"] == 3.0) & (df["capital"] == 2e5)].iloc[0]
+    assert row["monthly_payment_with_bonus"] == pytest.approx(
+        chunked.sel("monthly_payment_with_bonus", interest_rate=3.0, capital=2e5)
+    )
+
+
+def test_unknown_field_is_rejected():
+    """Test que se rechazan ejes que no son campos de MortgageData."""
+    with pytest.raises(ValueError):
+        sensitivity_cube(BASE, {"tipo": [1.0, 2.0]})
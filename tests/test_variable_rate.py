@@ -0,0 +1,88 @@
+"""
+Tests para la calculadora de hipotecas a tipo variable.
+"""
+
+import numpy as np
+import pytest
+
+from mortgage_calculator.calculator import MortgageCalculator
+from mortgage_calculator.models import MortgageData
+from mortgage_calculator.variable_rate import VariableRateCalculator
+
+
+def simulate_month_by_month(capital, years, period_rates, reset_months):
+    """Recalcula la cuota en cada revisión y recorre el préstamo mes a mes."""
+    n_payments = years * 12
+    balance = capital
+    total_interest = 0.0
+    for month in range(n_payments):
+        if month % reset_months == 0:
+            annual_rate = period_rates[month // reset_months]
+            remaining = n_payments - month
+            monthly_rate = annual_rate / 100 / 12
+            if monthly_rate == 0:
+                payment = balance / remaining
+            else:
+                payment = balance * monthly_rate / (1 - (1 + monthly_rate) ** -remaining)
+        interest = balance * monthly_rate
+        balance -= payment - interest
+        total_interest += interest
+    return total_interest
+
+
+def test_constant_index_matches_fixed_rate():
+    """Test que un índice constante equivale a una hipoteca a tipo fijo."""
+    data = MortgageData(capital=200000.0, interest_rate=3.0, years=25, payroll_bonus=0.3)
+    engine = VariableRateCalculator(data, spread=1.0, reset_months=6)
+
+    results = engine.simulate(np.full(engine.n_resets, 2.0))
+    expected = MortgageCalculator(data).calculate_total_interest(2.7)
+
+    assert results.total_interest[0] == pytest.approx(expected, rel=1e-10)
+    assert np.allclose(results.payments, results.payments[0, 0])
+    assert results.balances[0, -1] == 0.0
+
+
+def test_resets_match_month_by_month_simulation():
+    """Test que el cálculo por periodos coincide con la simulación mensual."""
+    data = MortgageData(capital=150000.0, interest_rate=2.0, years=10, payroll_bonus=0.25)
+    engine = VariableRateCalculator(data, spread=0.9, reset_months=12)
+    index = np.array([3.5, 3.1, 2.6, 2.2, 2.0, 2.4, 2.9, 3.3, 3.0, 2.8])
+
+    results = engine.simulate(index)
+    expected = simulate_month_by_month(data.capital, data.years, index + 0.9 - 0.25, 12)
+
+    assert results.total_interest[0] == pytest.approx(expected, rel=1e-10)
+
+
+def test_fixed_initial_period_and_many_paths():
+    """Test del periodo inicial fijo y de trayectorias en lote."""
+    data = MortgageData(
+        capital=180000.0,
+        interest_rate=2.5,
+        years=30,
+        payroll_bonus=0.5,
+        life_insurance_cost_monthly=20.0,
+    )
+    engine = VariableRateCalculator(data, spread=0.8, reset_months=6, fixed_months=12)
+    assert engine.n_resets == 58
+
+    paths = np.random.default_rng(1).normal(3.0, 1.0, (1000, engine.n_resets))
+    results = engine.simulate(paths)
+
+    assert results.rates.shape == (1000, 59)
+    assert np.all(results.rates[:, 0] == 2.0)
+    assert np.all(results.rates >= 0)
+    assert np.allclose(results.interest.sum(axis=1), results.total_interest)
+
+    savings = engine.bonus_savings(paths)
+    assert savings.shape == (1000,)
+    assert np.all(savings > -data.life_insurance_cost_monthly * 360)
+
+
+def test_short_index_path_is_rejected():
+    """Test que se rechazan trayectorias sin suficientes revisiones."""
+    engine = VariableRateCalculator(MortgageData(capital=1e5, interest_rate=3, years=5), 1.0)
+
+    with pytest.raises(ValueError):
+        engine.simulate(np.ones(4))
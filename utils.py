@@ -2,23 +2,42 @@
 Utilidades adicionales para análisis avanzados.
 """
 
-from typing import Dict, List
+import csv
+import datetime
+import warnings
+from typing import Callable, Dict, Iterable, Optional, Union
 
+import numpy as np
 import pandas as pd
 
+from mortgage_calculator.bonus_optimizer import BonusCatalog, optimize_bonuses
+from mortgage_calculator.breakeven import break_even_cost
 from mortgage_calculator.calculator import MortgageCalculator
-from mortgage_calculator.models import MortgageData
+from mortgage_calculator.models import FrozenMortgageData, MortgageData
+from mortgage_calculator.payment_calendar import build_payment_calendar
+from mortgage_calculator.scenarios import ComparisonProgress, stream_comparison
+from mortgage_calculator.sensitivity import inclusive_range, sensitivity_cube
 
 
 def compare_scenarios(
-    scenarios: List[Dict[str, any]], output_file: str = "comparacion_escenarios.xlsx"
+    scenarios: Iterable[Dict[str, any]],
+    output_file: str = "comparacion_escenarios.xlsx",
+    chunk_size: int = 10_000,
+    workers: Optional[int] = 1,
+    progress: Optional[Callable[[ComparisonProgress], None]] = None,
 ) -> str:
     """
-    Compara múltiples escenarios de hipoteca en un solo archivo Excel.
+    Compara múltiples escenarios de hipoteca en un solo archivo.
+
+    Los escenarios se calculan por bloques y se escriben según se procesan, así
+    que admite generadores con cientos de miles de ofertas.
 
     Args:
-        scenarios: Lista de diccionarios con 'nombre' y 'data' (MortgageData)
-        output_file: Nombre del archivo de salida
+        scenarios: Iterable de diccionarios con 'nombre' y 'data' (MortgageData)
+        output_file: Nombre del archivo de salida (.xlsx, .csv o .parquet)
+        chunk_size: Escenarios por bloque
+        workers: Número de procesos (1 para no usar el pool; None para todos los núcleos)
+        progress: Función que recibe un ComparisonProgress tras cada bloque
 
     Returns:
         Ruta del archivo generado
@@ -36,57 +55,7 @@ def compare_scenarios(
         ]
         compare_scenarios(scenarios)
     """
-    results_list = []
-
-    for scenario in scenarios:
-        calculator = MortgageCalculator(scenario["data"])
-        results = calculator.calculate()
-
-        results_list.append(
-            {
-                "Escenario": scenario["nombre"],
-                "Capital (€)": scenario["data"].capital,
-                "Tipo Base (%)": scenario["data"].interest_rate,
-                "Plazo (años)": scenario["data"].years,
-                "Bonificaciones (%)": calculator.calculate_total_bonus(),
-                "Tipo Final (%)": max(
-                    0, scenario["data"].interest_rate - calculator.calculate_total_bonus()
-                ),
-                "Cuota Mensual (€)": (
-                    results.monthly_payment_with_bonus
-                    if calculator.calculate_total_bonus() > 0
-                    else results.monthly_payment_without_bonus
-                ),
-                "Total Intereses (€)": (
-                    results.total_interest_with_bonus
-                    if calculator.calculate_total_bonus() > 0
-                    else results.total_interest_without_bonus
-                ),
-                "Total a Pagar (€)": (
-                    results.total_paid_with_bonus
-                    if calculator.calculate_total_bonus() > 0
-                    else results.total_paid_without_bonus
-                ),
-                "Costes Bonificaciones (€)": results.total_bonus_costs,
-                "Coste Real Total (€)": (
-                    results.total_paid_with_bonus
-                    if calculator.calculate_total_bonus() > 0
-                    else results.total_paid_without_bonus
-                )
-                + results.total_bonus_costs,
-                "Ahorro Real (€)": (
-                    results.real_savings if calculator.calculate_total_bonus() > 0 else 0
-                ),
-                "¿Vale la pena?": (
-                    "SÍ"
-                    if results.is_worth_it
-                    else "NO" if calculator.calculate_total_bonus() > 0 else "N/A"
-                ),
-            }
-        )
-
-    df = pd.DataFrame(results_list)
-    df.to_excel(output_file, index=False)
+    stream_comparison(scenarios, output_file, chunk_size, workers, progress)
 
     return output_file
 
@@ -109,98 +78,80 @@ def sensitivity_analysis(
     Returns:
         Ruta del archivo generado
     """
-    results_list = []
-
-    rate = rate_range[0]
-    while rate <= rate_range[1]:
-        data = MortgageData(
-            capital=base_data.capital,
-            interest_rate=rate,
-            years=base_data.years,
-            payroll_bonus=base_data.payroll_bonus,
-            life_insurance_bonus=base_data.life_insurance_bonus,
-            home_insurance_bonus=base_data.home_insurance_bonus,
-            card_bonus=base_data.card_bonus,
-            other_bonus=base_data.other_bonus,
-            life_insurance_cost_monthly=base_data.life_insurance_cost_monthly,
-            home_insurance_cost_monthly=base_data.home_insurance_cost_monthly,
-            card_annual_fee=base_data.card_annual_fee,
-            other_costs_monthly=base_data.other_costs_monthly,
-        )
-
-        calculator = MortgageCalculator(data)
-        results = calculator.calculate()
-
-        results_list.append(
-            {
-                "Tipo de Interés (%)": rate,
-                "Cuota sin Bonif. (€)": results.monthly_payment_without_bonus,
-                "Cuota con Bonif. (€)": results.monthly_payment_with_bonus,
-                "Diferencia Cuota (€)": results.monthly_payment_without_bonus
-                - results.monthly_payment_with_bonus,
-                "Total sin Bonif. (€)": results.total_paid_without_bonus,
-                "Total con Bonif. (€)": results.total_paid_with_bonus + results.total_bonus_costs,
-                "Ahorro Real (€)": results.real_savings,
-                "Ahorro (%)": results.savings_percentage,
-                "¿Vale la pena?": "SÍ" if results.is_worth_it else "NO",
-            }
-        )
-
-        rate += rate_step
+    rates = inclusive_range(rate_range[0], rate_range[1], rate_step)
+    cube = sensitivity_cube(
+        base_data,
+        {"interest_rate": rates},
+        outputs=(
+            "monthly_payment_without_bonus",
+            "monthly_payment_with_bonus",
+            "total_paid_without_bonus",
+            "total_paid_with_bonus",
+            "total_bonus_costs",
+            "real_savings",
+            "savings_percentage",
+            "is_worth_it",
+        ),
+    )
 
-    df = pd.DataFrame(results_list)
+    df = pd.DataFrame(
+        {
+            "Tipo de Interés (%)": rates,
+            "Cuota sin Bonif. (€)": cube["monthly_payment_without_bonus"],
+            "Cuota con Bonif. (€)": cube["monthly_payment_with_bonus"],
+            "Diferencia Cuota (€)": cube["monthly_payment_without_bonus"]
+            - cube["monthly_payment_with_bonus"],
+            "Total sin Bonif. (€)": cube["total_paid_without_bonus"],
+            "Total con Bonif. (€)": cube["total_paid_with_bonus"] + cube["total_bonus_costs"],
+            "Ahorro Real (€)": cube["real_savings"],
+            "Ahorro (%)": cube["savings_percentage"],
+            "¿Vale la pena?": np.where(cube["is_worth_it"], "SÍ", "NO"),
+        }
+    )
     df.to_excel(output_file, index=False)
 
     return output_file
 
 
 def calculate_break_even_cost(
-    mortgage_data: MortgageData, max_cost: float = 200.0, step: float = 5.0
+    mortgage_data: MortgageData, max_cost: Optional[float] = None, step: Optional[float] = None
 ) -> Dict[str, float]:
     """
     Calcula el coste máximo de bonificaciones para que valga la pena.
 
+    El coste mensual máximo se obtiene de forma exacta (al céntimo): es el
+    mayor importe con el que el ahorro real sigue siendo positivo.
+
     Args:
-        mortgage_data: Datos de la hipoteca (sin costes)
-        max_cost: Coste máximo a probar
-        step: Incremento del coste en cada iteración
+        mortgage_data: Datos de la hipoteca (se ignoran sus costes)
+        max_cost: Límite opcional del coste mensual devuelto
+        step: Obsoleto y sin efecto (el cálculo ya es exacto); pasarlo emite un
+            DeprecationWarning y se eliminará en una versión futura
 
     Returns:
         Diccionario con el análisis del punto de equilibrio
     """
-    cost = 0.0
-    break_even_cost = 0.0
-
-    while cost <= max_cost:
-        data = MortgageData(
-            capital=mortgage_data.capital,
-            interest_rate=mortgage_data.interest_rate,
-            years=mortgage_data.years,
-            payroll_bonus=mortgage_data.payroll_bonus,
-            life_insurance_bonus=mortgage_data.life_insurance_bonus,
-            home_insurance_bonus=mortgage_data.home_insurance_bonus,
-            card_bonus=mortgage_data.card_bonus,
-            other_bonus=mortgage_data.other_bonus,
-            life_insurance_cost_monthly=cost / 2,  # Divide cost between both insurances
-            home_insurance_cost_monthly=cost / 2,
-            card_annual_fee=0.0,
-            other_costs_monthly=0.0,
+    if step is not None:
+        warnings.warn(
+            "calculate_break_even_cost: el parámetro step no tiene efecto y se eliminará",
+            DeprecationWarning,
+            stacklevel=2,
         )
 
-        calculator = MortgageCalculator(data)
-        results = calculator.calculate()
-
-        if results.is_worth_it:
-            break_even_cost = cost
-        else:
-            break
-
-        cost += step
+    data = FrozenMortgageData.from_mortgage_data(mortgage_data).replace(
+        life_insurance_cost_monthly=0.0,
+        home_insurance_cost_monthly=0.0,
+        card_annual_fee=0.0,
+        other_costs_monthly=0.0,
+    )
+    monthly_cost = break_even_cost(data).max_monthly_cost
+    if max_cost is not None:
+        monthly_cost = min(monthly_cost, max_cost)
 
     return {
-        "coste_maximo_mensual": break_even_cost,
-        "coste_maximo_anual": break_even_cost * 12,
-        "coste_total_vida_prestamo": break_even_cost * 12 * mortgage_data.years,
+        "coste_maximo_mensual": monthly_cost,
+        "coste_maximo_anual": monthly_cost * 12,
+        "coste_total_vida_prestamo": monthly_cost * 12 * mortgage_data.years,
     }
 
 
@@ -213,7 +164,8 @@ def recommend_best_bonus_combination(
     Args:
         mortgage_data: Datos base de la hipoteca
         bonuses: Diccionario con bonificaciones disponibles y sus costes
-                 Formato: {"nombre": {"bonus": 0.30, "cost_monthly": 40.0}}
+                 Formato: {"nombre": {"bonus": 0.30, "cost_monthly": 40.0}}; admite
+                 además "cost_annual", "group", "excludes" y "requires" (ver BonusProduct)
 
     Returns:
         Diccionario con la recomendación
@@ -226,106 +178,93 @@ def recommend_best_bonus_combination(
         }
         recommend_best_bonus_combination(mortgage_data, bonuses)
     """
-    best_savings = float("-inf")
-    best_combination = None
-    best_results = None
-
-    # Probar todas las combinaciones posibles
-    bonus_names = list(bonuses.keys())
-    n = len(bonus_names)
-
-    for i in range(1, 2**n):
-        # Generar combinación binaria
-        combination = []
-        total_bonus = 0.0
-        total_cost = 0.0
-
-        for j in range(n):
-            if i & (1 << j):
-                name = bonus_names[j]
-                combination.append(name)
-                total_bonus += bonuses[name]["bonus"]
-                total_cost += bonuses[name].get("cost_monthly", 0.0)
-
-        # Crear datos con esta combinación
-        data = MortgageData(
-            capital=mortgage_data.capital,
-            interest_rate=mortgage_data.interest_rate,
-            years=mortgage_data.years,
-            payroll_bonus=(
-                total_bonus if "nomina" in combination or "payroll" in combination else 0.0
-            ),
-            life_insurance_bonus=(
-                total_bonus / 2 if "seguros" in combination or "insurance" in combination else 0.0
-            ),
-            home_insurance_bonus=(
-                total_bonus / 2 if "seguros" in combination or "insurance" in combination else 0.0
-            ),
-            card_bonus=total_bonus if "tarjeta" in combination or "card" in combination else 0.0,
-            life_insurance_cost_monthly=total_cost / 2,
-            home_insurance_cost_monthly=total_cost / 2,
-            card_annual_fee=0.0,
-            other_costs_monthly=0.0,
-        )
-
-        calculator = MortgageCalculator(data)
-        results = calculator.calculate()
-
-        if results.real_savings > best_savings:
-            best_savings = results.real_savings
-            best_combination = combination
-            best_results = results
+    catalog = BonusCatalog.from_dict(bonuses)
+    combinations = optimize_bonuses(mortgage_data, catalog, top_k=1)
+    if not combinations:
+        return {
+            "mejor_combinacion": None,
+            "ahorro_real": float("-inf"),
+            "vale_la_pena": False,
+            "resultados": None,
+        }
+    best = combinations[0]
+
+    # Resultados completos de la combinación elegida
+    products = {product.name: product for product in catalog.products}
+    data = FrozenMortgageData(
+        capital=mortgage_data.capital,
+        interest_rate=mortgage_data.interest_rate,
+        years=mortgage_data.years,
+        other_bonus=best.total_bonus,
+        other_costs_monthly=sum(products[name].cost_monthly for name in best.products),
+        card_annual_fee=sum(products[name].cost_annual for name in best.products),
+    )
 
     return {
-        "mejor_combinacion": best_combination,
-        "ahorro_real": best_savings,
-        "vale_la_pena": best_savings > 0,
-        "resultados": best_results,
+        "mejor_combinacion": list(best.products),
+        "ahorro_real": best.real_savings,
+        "vale_la_pena": best.real_savings > 0,
+        "resultados": MortgageCalculator(data).calculate(),
     }
 
 
-def generate_payment_calendar(mortgage_data: MortgageData, with_bonus: bool = True) -> pd.DataFrame:
+def generate_payment_calendar(
+    mortgage_data: MortgageData,
+    with_bonus: bool = True,
+    frequency: Union[str, int] = "year",
+    start_date: Optional[datetime.date] = None,
+    fiscal_year_start: int = 1,
+) -> pd.DataFrame:
     """
-    Genera un calendario de pagos detallado por años.
+    Genera un calendario de pagos detallado por periodos.
 
     Args:
         mortgage_data: Datos de la hipoteca
         with_bonus: Si usar bonificaciones o no
+        frequency: "year", "half", "quarter", "month" o número de meses por periodo
+        start_date: Fecha de la primera cuota (añade fechas reales)
+        fiscal_year_start: Mes en que empieza el año fiscal (con start_date)
 
     Returns:
-        DataFrame con el calendario anual
+        DataFrame con el calendario por periodos
     """
+    calculator = MortgageCalculator(mortgage_data)
     rate = mortgage_data.interest_rate
     if with_bonus:
-        calculator = MortgageCalculator(mortgage_data)
         rate = max(0, rate - calculator.calculate_total_bonus())
 
-    calculator = MortgageCalculator(mortgage_data)
     schedule = calculator.calculate_amortization_schedule(rate)
 
-    # Agrupar por años
-    yearly_data = []
-    for year in range(1, mortgage_data.years + 1):
-        start_month = (year - 1) * 12
-        end_month = year * 12
-        year_payments = schedule[start_month:end_month]
+    return build_payment_calendar(schedule, frequency, start_date, fiscal_year_start)
 
-        total_payment = sum(p[1] for p in year_payments)
-        total_interest = sum(p[2] for p in year_payments)
-        total_principal = sum(p[3] for p in year_payments)
-        final_balance = year_payments[-1][4]
 
-        yearly_data.append(
-            {
-                "Año": year,
-                "Pagos Totales (€)": total_payment,
-                "Intereses (€)": total_interest,
-                "Amortización Capital (€)": total_principal,
-                "Pendiente (€)": final_balance,
-            }
-        )
+def export_amortization_csv(
+    mortgage_data: MortgageData,
+    output_file: str = "tabla_amortizacion.csv",
+    with_bonus: bool = True,
+) -> str:
+    """
+    Escribe la tabla de amortización en CSV fila a fila, sin materializarla.
 
-    return pd.DataFrame(yearly_data)
+    Args:
+        mortgage_data: Datos de la hipoteca
+        output_file: Nombre del archivo de salida
+        with_bonus: Si usar bonificaciones o no
+
+    Returns:
+        Ruta del archivo generado
+    """
+    calculator = MortgageCalculator(mortgage_data)
+    rate = mortgage_data.interest_rate
+    if with_bonus:
+        rate = max(0, rate - calculator.calculate_total_bonus())
+
+    with open(output_file, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Mes", "Cuota (€)", "Intereses (€)", "Amortización (€)", "Pendiente (€)"])
+        writer.writerows(calculator.iter_amortization(rate))
+
+    return output_file
 
 
 if __name__ == "__main__":